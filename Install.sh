@@ -1,11 +1,50 @@
 #!/bin/bash
 
 mkdir -p ~/.local/bin/tagesgans
+mkdir -p ~/.local/bin/tagesgans/duckday
 mkdir -p ~/.local/share/icons/Goose
 
 wget -O ~/.local/bin/tagesgans/reader.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/reader.py
 wget -O ~/.local/bin/tagesgans/tagesgans.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/tagesgans.py
+wget -O ~/.local/bin/tagesgans/mainwindow.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/mainwindow.py
 wget -O ~/.local/bin/tagesgans/editor.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/editor.py
+wget -O ~/.local/bin/tagesgans/Info.txt https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/Info.txt
+wget -O ~/.local/bin/tagesgans/Install.sh https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/Install.sh
+wget -O ~/.local/bin/tagesgans/charts.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/charts.py
+wget -O ~/.local/bin/tagesgans/diarywatcher.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/diarywatcher.py
+wget -O ~/.local/bin/tagesgans/heatmap.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/heatmap.py
+wget -O ~/.local/bin/tagesgans/highlighter.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/highlighter.py
+wget -O ~/.local/bin/tagesgans/preview.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/preview.py
+wget -O ~/.local/bin/tagesgans/palette.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/palette.py
+wget -O ~/.local/bin/tagesgans/packviewer.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/packviewer.py
+wget -O ~/.local/bin/tagesgans/qtutil.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/qtutil.py
+wget -O ~/.local/bin/tagesgans/renderer.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/renderer.py
+wget -O ~/.local/bin/tagesgans/traceoverlay.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/traceoverlay.py
+wget -O ~/.local/bin/tagesgans/yearbook.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/yearbook.py
+wget -O ~/.local/bin/tagesgans/duckday/__init__.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/__init__.py
+wget -O ~/.local/bin/tagesgans/duckday/fsck.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/fsck.py
+wget -O ~/.local/bin/tagesgans/duckday/markup.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/markup.py
+wget -O ~/.local/bin/tagesgans/duckday/pack.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/pack.py
+wget -O ~/.local/bin/tagesgans/duckday/quickindex.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/quickindex.py
+wget -O ~/.local/bin/tagesgans/duckday/settings.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/settings.py
+wget -O ~/.local/bin/tagesgans/duckday/analytics.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/analytics.py
+wget -O ~/.local/bin/tagesgans/duckday/archive.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/archive.py
+wget -O ~/.local/bin/tagesgans/duckday/cli.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/cli.py
+wget -O ~/.local/bin/tagesgans/duckday/cleanup.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/cleanup.py
+wget -O ~/.local/bin/tagesgans/duckday/compression.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/compression.py
+wget -O ~/.local/bin/tagesgans/duckday/dates.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/dates.py
+wget -O ~/.local/bin/tagesgans/duckday/dateindex.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/dateindex.py
+wget -O ~/.local/bin/tagesgans/duckday/migrate.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/migrate.py
+wget -O ~/.local/bin/tagesgans/duckday/diaries.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/diaries.py
+wget -O ~/.local/bin/tagesgans/duckday/startup.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/startup.py
+wget -O ~/.local/bin/tagesgans/duckday/stats.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/stats.py
+wget -O ~/.local/bin/tagesgans/duckday/storage.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/storage.py
+wget -O ~/.local/bin/tagesgans/duckday/templates.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/templates.py
+wget -O ~/.local/bin/tagesgans/duckday/timeline.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/timeline.py
+wget -O ~/.local/bin/tagesgans/duckday/trace.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/trace.py
+wget -O ~/.local/bin/tagesgans/duckday/website.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/website.py
+wget -O ~/.local/bin/tagesgans/duckday/sync.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/sync.py
+wget -O ~/.local/bin/tagesgans/duckday/backup.py https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/duckday/backup.py
 wget -O ~/.local/share/icons/Goose/tagesgans.png https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/icon.png
 wget -O ~/.local/share/icons/Goose/time.png https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/Time.png
 wget -O ~/.local/share/icons/Goose/label.png https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/main/Label.png
@@ -14,8 +53,10 @@ wget -O ~/.local/share/applications/tagesgans.desktop https://raw.githubusercont
 chmod +x ~/.local/bin/tagesgans/reader.py
 chmod +x ~/.local/bin/tagesgans/editor.py
 chmod +x ~/.local/bin/tagesgans/tagesgans.py
+# Kommandozeile (tagesgans-cli list|show|search|stats|export|check)
+ln -sf ~/.local/bin/tagesgans/tagesgans.py ~/.local/bin/tagesgans-cli
 chmod +x ~/.local/share/applications/tagesgans.desktop
 
 sudo apt update
-sudo apt install python3 python3-pyqt5 python3-pyqt5.qtmultimedia qgis gnome-contacts gnome-calendar xdg-utils gstreamer1.0-plugins-base gstreamer1.0-plugins-good gstreamer1.0-plugins-bad gstreamer1.0-plugins-ugly gstreamer1.0-libav -y
+sudo apt install python3 python3-pyqt5 python3-numpy qgis gnome-contacts gnome-calendar xdg-utils gstreamer1.0-plugins-base gstreamer1.0-plugins-good gstreamer1.0-plugins-bad gstreamer1.0-plugins-ugly gstreamer1.0-libav -y
 sudo update-desktop-database
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Generator für synthetische Tagebücher
+Erzeugt realistische .duckday Bäume für Benchmarks
+
+Beispiel:
+    python3 benchmarks/generate_diary.py /tmp/bench --years 5 --markup-density 0.1
+"""
+
+import argparse
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+WORDS = (
+    "heute war ein schöner Tag mit viel Sonne und wir sind am Morgen in die Stadt "
+    "gefahren dort haben wir Kaffee getrunken und über die Arbeit geredet danach "
+    "ging es zurück nach Hause wo ich noch lange gelesen habe der Abend war ruhig"
+).split()
+
+PEOPLE = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannes"]
+PLACES = ["Berlin", "Hamburg", "Leipzig", "Ostsee", "Harz", "Bodensee"]
+LABELS = ["Arbeit", "Familie", "Urlaub", "Sport", "Lesen", "Garten", "Musik"]
+COLORS = ["Schwarz", "Rot", "Grün", "Blau", "Orange", "Lila"]
+
+# Kleinste gültige PNG-Datei (1x1 Pixel)
+TINY_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d4944415478da63f8cfc0f01f0005000201a7d9e5c6"
+    "0000000049454e44ae426082"
+)
+MEDIA_EXTENSIONS = [".png", ".jpg", ".mp3", ".ogg", ".mp4"]
+
+
+class DiaryGenerator:
+    """Baut einen Jahr/Monat/Tag/Day.txt Baum wie der Editor ihn speichert"""
+
+    def __init__(self, years=3, start_year=2020, entries_per_day=0.7,
+                 lines_per_entry=20, line_length=80, markup_density=0.05,
+                 media_per_entry=1, seed=1):
+        self.years = years
+        self.start_year = start_year
+        # Anteil der Tage mit Eintrag (ein Day.txt pro Tag)
+        self.entries_per_day = entries_per_day
+        self.lines_per_entry = lines_per_entry
+        self.line_length = line_length
+        # Wahrscheinlichkeit, dass ein Wort durch ein Markup-Token ersetzt wird
+        self.markup_density = markup_density
+        self.media_per_entry = media_per_entry
+        self.rng = random.Random(seed)
+
+    def params(self):
+        """Parameter für die Ergebnisdatei"""
+        return {
+            "years": self.years,
+            "start_year": self.start_year,
+            "entries_per_day": self.entries_per_day,
+            "lines_per_entry": self.lines_per_entry,
+            "line_length": self.line_length,
+            "markup_density": self.markup_density,
+            "media_per_entry": self.media_per_entry,
+        }
+
+    def generate(self, root, name="Benchmark"):
+        """Erzeugt <root>/<name>.duckday und gibt den Pfad zurück"""
+        diary = Path(root) / f"{name}.duckday"
+        diary.mkdir(parents=True, exist_ok=True)
+        (diary / "Info.txt").write_text("This is a Tagesgans diary.\n", encoding="utf-8")
+
+        day = date(self.start_year, 1, 1)
+        end = date(self.start_year + self.years, 1, 1)
+        count = 0
+        while day < end:
+            if self.rng.random() < self.entries_per_day:
+                self.write_day(diary, day)
+                count += 1
+            day += timedelta(days=1)
+        return diary, count
+
+    def write_day(self, diary, day):
+        """Schreibt einen Tag inklusive Medien, vCards und KMLs"""
+        # Gleiche Ordnernamen wie DiaryEditor.save_entry
+        day_dir = diary / str(day.year) / day.strftime("%B") / f"{day.day:02d}"
+        day_dir.mkdir(parents=True, exist_ok=True)
+
+        media = []
+        for i in range(self.media_per_entry):
+            ext = self.rng.choice(MEDIA_EXTENSIONS)
+            filename = f"media_{i}{ext}"
+            data = TINY_PNG if ext == ".png" else self.rng.randbytes(256)
+            (day_dir / filename).write_bytes(data)
+            media.append(filename)
+
+        people = set()
+        places = set()
+        lines = ["{20|fkud|Schwarz}"]
+        for _ in range(self.lines_per_entry):
+            line = self.make_line(day, media, people, places)
+            # Ab und zu ein neues Format am Zeilenanfang
+            if self.rng.random() < self.markup_density:
+                style = "".join(self.rng.choice(pair) for pair in ("Ff", "Kk", "Uu", "Dd"))
+                line = f"{{{self.rng.randint(10, 30)}|{style}|{self.rng.choice(COLORS)}}}" + line
+            lines.append(line)
+            if self.rng.random() < 0.1:
+                lines.append("")
+
+        for filename in media:
+            lines.append(f"<{filename}>")
+
+        with open(day_dir / "Day.txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        for person in people:
+            (day_dir / f"{person}.vcard").write_text(
+                f"BEGIN:VCARD\nVERSION:3.0\nFN:{person}\nEND:VCARD\n", encoding="utf-8")
+        for place in places:
+            (day_dir / f"{place}.kml").write_text(
+                f"<?xml version=\"1.0\"?><kml><Placemark><name>{place}</name></Placemark></kml>\n",
+                encoding="utf-8")
+
+    def make_line(self, day, media, people, places):
+        """Erzeugt eine Textzeile mit eingestreutem Markup"""
+        parts = []
+        length = 0
+        while length < self.line_length:
+            if self.rng.random() < self.markup_density:
+                token = self.make_token(day, media, people, places)
+            else:
+                token = self.rng.choice(WORDS)
+            parts.append(token)
+            length += len(token) + 1
+        return " ".join(parts)
+
+    def make_token(self, day, media, people, places):
+        """Ein zufälliges Markup-Token (@, %, §, =, ', <media>)"""
+        kind = self.rng.choice("@%§='<")
+        if kind == "@":
+            person = self.rng.choice(PEOPLE)
+            people.add(person)
+            return f"@{person}"
+        if kind == "%":
+            place = self.rng.choice(PLACES)
+            places.add(place)
+            return f"%{place}"
+        if kind == "§":
+            return f"§{day.year}.{day.month:02d}.{day.day:02d}.{self.rng.randint(0, 23):02d}.{self.rng.randint(0, 59):02d}"
+        if kind == "=":
+            return f"={self.rng.choice(LABELS)}"
+        if kind == "'":
+            return f"'{self.rng.choice(WORDS)} {self.rng.choice(WORDS)}'"
+        if media:
+            return f"<{self.rng.choice(media)}>"
+        return self.rng.choice(WORDS)
+
+
+def add_arguments(parser):
+    """Gemeinsame Generator-Optionen (auch für run_benchmarks.py)"""
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--start-year", type=int, default=2020)
+    parser.add_argument("--entries-per-day", type=float, default=0.7,
+                        help="Anteil der Tage mit Eintrag (0..1)")
+    parser.add_argument("--lines-per-entry", type=int, default=20)
+    parser.add_argument("--line-length", type=int, default=80)
+    parser.add_argument("--markup-density", type=float, default=0.05,
+                        help="Anteil der Wörter, die Markup sind (0..1)")
+    parser.add_argument("--media-per-entry", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+
+
+def generator_from_args(args):
+    """Erstellt einen DiaryGenerator aus argparse-Optionen"""
+    return DiaryGenerator(
+        years=args.years, start_year=args.start_year,
+        entries_per_day=args.entries_per_day, lines_per_entry=args.lines_per_entry,
+        line_length=args.line_length, markup_density=args.markup_density,
+        media_per_entry=args.media_per_entry, seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Erzeugt ein synthetisches .duckday Tagebuch")
+    parser.add_argument("root", help="Zielordner")
+    parser.add_argument("--name", default="Benchmark")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    diary, count = generator_from_args(args).generate(args.root, args.name)
+    print(f"{diary}: {count} Einträge")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Benchmark-Suite
+Misst Reader und Editor headless (QT_QPA_PLATFORM=offscreen) auf einem
+synthetischen oder vorhandenen Tagebuch und schreibt die Ergebnisse als JSON.
+
+Beispiele:
+    python3 benchmarks/run_benchmarks.py --years 5
+    python3 benchmarks/run_benchmarks.py --diary ~/Privat.duckday --repeat 3
+    python3 benchmarks/run_benchmarks.py --compare benchmarks/results/alt.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Vor dem ersten Qt-Import setzen
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from generate_diary import add_arguments, generator_from_args  # noqa: E402
+
+RESULTS_DIR = BENCH_DIR / "results"
+
+
+class DiaryBenchmarks:
+    """Alle bench_* Methoden werden in Definitionsreihenfolge ausgeführt"""
+
+    def __init__(self, diary, workdir, repeat=5, sample=50):
+        from PyQt5.QtWidgets import QApplication
+
+        self.app = QApplication.instance() or QApplication([])
+        self.diary = Path(diary)
+        self.workdir = Path(workdir)
+        self.repeat = repeat
+        self.sample = sample
+        self.config_file = self.workdir / "tagesgans.txt"
+        self.results = {}
+
+        from duckday import DiaryCache, load_settings
+        self.settings = load_settings(self.config_file)
+        self.cache = DiaryCache(root=self.diary.parent)
+
+    def measure(self, name, func, setup=None, repeat=None, per=1):
+        """Führt func mehrmals aus; setup läuft vorher und wird nicht gemessen"""
+        times = []
+        for _ in range(repeat or self.repeat):
+            if setup:
+                setup()
+            begin = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - begin) / per)
+            # Zurückgestellte Qt-Löschungen nicht in die nächste Messung ziehen
+            self.app.processEvents()
+        self.results[name] = {
+            "runs": len(times),
+            "min_ms": min(times) * 1000,
+            "median_ms": statistics.median(times) * 1000,
+            "mean_ms": statistics.fmean(times) * 1000,
+            "max_ms": max(times) * 1000,
+        }
+        print(f"  {name:<40} {self.results[name]['median_ms']:10.2f} ms")
+
+    def sample_files(self):
+        """Gleichmäßig verteilte Auswahl von Day.txt Dateien"""
+        entries = self.cache.entries(self.diary)
+        step = max(1, len(entries) // self.sample)
+        return [entry.day_file for entry in entries[::step]][:self.sample]
+
+    def run(self):
+        if not self.cache.entries(self.diary):
+            print("Tagebuch enthält keine Einträge")
+            return self.results
+        methods = [getattr(self, name) for name in type(self).__dict__ if name.startswith("bench_")]
+        for method in methods:
+            method()
+        return self.results
+
+    # --- Reader ---
+
+    def bench_scan_diaries(self):
+        from reader import DiaryReader
+        reader = DiaryReader(self.config_file, self.settings, self.cache)
+        self.measure("reader.scan_diaries", reader.scan_diaries,
+                     setup=lambda: self.cache.invalidate())
+        reader.deleteLater()
+
+    def bench_load_entries(self):
+        from reader import DiaryReader
+        reader = DiaryReader(self.config_file, self.settings, self.cache)
+        reader.current_diary = self.diary
+        self.measure("reader.load_entries (kalt)", reader.load_entries,
+                     setup=lambda: self.cache.invalidate(self.diary))
+        self.measure("reader.load_entries (Cache)", reader.load_entries)
+        reader.deleteLater()
+
+    def bench_read_day_files(self):
+        files = self.sample_files()
+
+        def read_all():
+            for day_file in files:
+                with open(day_file, 'r', encoding='utf-8') as f:
+                    f.read()
+        self.measure("Day.txt lesen (pro Eintrag)", read_all, per=len(files))
+
+    def bench_display_content(self):
+        from reader import EntryViewerWindow
+        files = self.sample_files()
+        contents = [(day_file.read_text(encoding='utf-8'), day_file.parent) for day_file in files]
+        viewer = EntryViewerWindow(files[0], self.settings)
+
+        def display_all():
+            for content, media_dir in contents:
+                viewer.labels = []
+                viewer.timestamps = []
+                viewer.display_content(content, media_dir)
+        self.measure("display_content (pro Eintrag)", display_all, per=len(contents))
+        viewer.deleteLater()
+
+    def bench_insert_formatted_line(self):
+        from reader import EntryViewerWindow
+        files = self.sample_files()
+        viewer = EntryViewerWindow(files[0], self.settings)
+        # Längste Zeile aus der Stichprobe
+        line = max((line for day_file in files
+                    for line in day_file.read_text(encoding='utf-8').split('\n')), key=len)
+        format_info = (20, "fkud", "Schwarz")
+
+        def insert():
+            viewer.text_browser.clear()
+            cursor = viewer.text_browser.textCursor()
+            for _ in range(100):
+                viewer.insert_formatted_line(cursor, line, format_info, files[0].parent)
+        self.measure(f"insert_formatted_line ({len(line)} Zeichen)", insert, per=100)
+        viewer.deleteLater()
+
+    # --- Editor ---
+
+    def bench_save_entry(self):
+        import editor as editor_module
+        from editor import DiaryEditor
+
+        # Bestätigungsdialoge würden headless blockieren
+        editor_module.QMessageBox.information = staticmethod(lambda *args, **kwargs: None)
+        editor_module.QMessageBox.warning = staticmethod(lambda *args, **kwargs: None)
+
+        editor = DiaryEditor(self.config_file, "edit", self.settings, self.cache)
+        editor.current_diary = self.diary
+        content = self.sample_files()[0].read_text(encoding='utf-8')
+        days = iter(date(1990, 1, 1) + timedelta(days=i) for i in range(100000))
+
+        def setup():
+            editor.current_entry = None
+            editor.current_date = datetime.combine(next(days), datetime.min.time())
+            editor.text_edit.setPlainText(content)
+        self.measure("editor.save_entry (inkl. Neuladen)", editor.save_entry, setup=setup)
+        editor.deleteLater()
+
+    def bench_highlighter(self):
+        from PyQt5.QtGui import QTextCursor
+        from PyQt5.QtWidgets import QPlainTextEdit
+        from highlighter import MarkupHighlighter
+
+        # Alle Stichproben hintereinander: ein sehr langer Eintrag
+        content = "\n".join(day_file.read_text(encoding='utf-8') for day_file in self.sample_files())
+        text_edit = QPlainTextEdit()
+        highlighter = MarkupHighlighter(text_edit.document(), lambda name: True)
+        lines = content.count("\n") + 1
+        self.measure(f"Hervorheben: Laden ({lines} Zeilen)", lambda: text_edit.setPlainText(content))
+
+        typed = "Heute mit @Anna in %Berlin §2026.02.14.10.30"
+
+        def type_line():
+            cursor = text_edit.textCursor()
+            cursor.movePosition(QTextCursor.Start)
+            cursor.movePosition(QTextCursor.Down, n=lines // 2)
+            for char in typed:
+                cursor.insertText(char)
+        self.measure("Hervorheben: Tippen (pro Zeichen)", type_line, per=len(typed))
+        highlighter.setDocument(None)
+        text_edit.deleteLater()
+
+    # --- Indizes ---
+
+    def bench_diary_cache(self):
+        self.measure("DiaryCache.entries (Index prüfen)", lambda: self.cache.entries(self.diary),
+                     setup=lambda: self.cache.invalidate(self.diary))
+
+    def bench_date_index(self):
+        from duckday.dateindex import INDEX_DIR, DateIndex
+        import shutil
+
+        self.measure("DateIndex.open (ohne gespeicherten Index)", lambda: DateIndex.open(self.diary),
+                     setup=lambda: shutil.rmtree(self.diary / INDEX_DIR, ignore_errors=True))
+        self.measure("DateIndex.open (gespeichert)", lambda: DateIndex.open(self.diary))
+
+        index = DateIndex.open(self.diary)
+        days = [entry.date for entry in index.entries()]
+
+        def lookup_all():
+            for day in days:
+                index.lookup(day)
+        self.measure("DateIndex.lookup (pro Datum)", lookup_all, per=len(days))
+
+    def bench_stats(self):
+        from duckday.dateindex import INDEX_DIR, DateIndex
+        from duckday.stats import StatsTable
+
+        index = DateIndex.open(self.diary)
+        stats_file = self.diary / INDEX_DIR / StatsTable.FILE_NAME
+        self.measure("StatsTable.open (ohne gespeicherte Statistik)",
+                     lambda: StatsTable.open(self.diary, index),
+                     setup=lambda: stats_file.unlink() if stats_file.exists() else None)
+        self.measure("StatsTable.open (gespeichert)", lambda: StatsTable.open(self.diary, index))
+
+        table = StatsTable.open(self.diary, index)
+        years = table.years()
+
+        def all_years():
+            table._years.clear()
+            for year in years:
+                table.year(year)
+        self.measure("StatsTable.year (pro Jahr, ungecacht)", all_years, per=max(len(years), 1))
+
+    def bench_timeline(self):
+        from duckday.timeline import Timeline
+
+        # Dasselbe Tagebuch fünfmal entspricht fünf gleich großen Tagebüchern
+        diaries = [self.diary] * 5
+        self.measure("Zeitleiste öffnen (5 Tagebücher, 100 Einträge)",
+                     lambda: Timeline(self.cache, diaries).fetch(100))
+
+        def merge_all():
+            timeline = Timeline(self.cache, diaries)
+            while timeline.fetch(1000):
+                pass
+        self.measure("Zeitleiste komplett mischen (5 Tagebücher)", merge_all)
+
+    def bench_quick_open(self):
+        from duckday.quickindex import QuickIndex
+
+        self.cache.stats(self.diary)
+        self.measure("Schnellsuche aufbauen", lambda: QuickIndex(self.cache, [self.diary]))
+        index = QuickIndex(self.cache, [self.diary])
+        queries = ["u", "ur", "urlaub", "#urlaub", "@an", "14.3", "2021-05", "sonne see", "xyzq"]
+
+        def type_all():
+            for query in queries:
+                index.search(query)
+        self.measure("Schnellsuche (pro Eingabe)", type_all, per=len(queries))
+
+    def bench_fsck(self):
+        from duckday.fsck import check_diary
+
+        self.measure("Tagebuch prüfen (Prozesse)", lambda: check_diary(self.diary), repeat=1)
+        self.measure("Tagebuch prüfen (Threads)", lambda: check_diary(self.diary, processes=False),
+                     repeat=1)
+
+    def bench_cleanup(self):
+        from duckday.cleanup import usage_report
+
+        self.measure("Belegung + verwaiste Anhänge", lambda: usage_report(self.diary), repeat=1)
+
+    def bench_pack(self):
+        from duckday.pack import PackedDiary, pack_diary
+
+        target = self.workdir / "bench.duckpack"
+        self.measure("Tagebuch packen", lambda: pack_diary(self.diary, target), repeat=1)
+        with PackedDiary(target) as pack:
+            entries = pack.entries()
+            sample = entries[::max(1, len(entries) // self.sample)][:self.sample]
+            self.measure("Paket öffnen", lambda: PackedDiary(target).close())
+
+            def read_all():
+                for entry in sample:
+                    pack.parsed(entry.day_file)
+            self.measure("Paket: Eintrag lesen + parsen", read_all, per=len(sample))
+
+    def bench_storage(self):
+        from duckday.storage import FolderStorage, SQLiteStorage, copy_entries
+
+        folder = FolderStorage(self.diary)
+        target = self.workdir / "bench.duckdb"
+        self.measure("SQLite: Tagebuch übernehmen",
+                     lambda: copy_entries(folder, SQLiteStorage(target, create=True)), repeat=1)
+        database = SQLiteStorage(target)
+        days = [entry.date for entry in database.entries()]
+        self.measure("SQLite: Einträge auflisten", database.entries)
+
+        def lookup_all():
+            for day in days:
+                database.lookup(day)
+        self.measure("SQLite: Datum nachschlagen (pro Datum)", lookup_all, per=len(days))
+        self.measure("SQLite: Volltextsuche", lambda: database.search("berlin urlaub"))
+        self.measure("Ordner: Volltextsuche", lambda: folder.search("berlin urlaub"), repeat=1)
+        database.close()
+
+    def bench_website(self):
+        from duckday.website import export_site
+
+        target = self.workdir / "bench-site"
+        self.measure("HTML-Export (alles)", lambda: export_site(self.diary, target, full=True), repeat=1)
+        self.measure("HTML-Export (unverändert)", lambda: export_site(self.diary, target))
+
+    def bench_analytics(self):
+        try:
+            from duckday.analytics import AnalyticsTable
+        except ImportError:
+            print("  NumPy fehlt, Auswertungen übersprungen")
+            return
+
+        stats = self.cache.stats(self.diary)
+        self.measure("AnalyticsTable bauen", lambda: AnalyticsTable.from_stats(stats))
+        table = AnalyticsTable.from_stats(stats)
+        self.measure("Wörter pro Woche", lambda: table.words_per("week"))
+        self.measure("Label pro Monat", lambda: table.mentions_per("labels", "month"))
+        self.measure("Meistbesuchte Orte", lambda: table.top("places"))
+
+
+def git_commit():
+    """Aktueller Commit, falls im Git-Repository"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(results, old_file):
+    """Vergleicht die Mediane mit einem früheren Lauf"""
+    with open(old_file, 'r', encoding='utf-8') as f:
+        old = json.load(f)["results"]
+    print(f"\nVergleich mit {old_file}:")
+    for name, result in results.items():
+        if name not in old:
+            continue
+        before = old[name]["median_ms"]
+        after = result["median_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"  {name:<40} {before:10.2f} → {after:10.2f} ms ({change:+.1f} %)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tagesgans Benchmarks")
+    parser.add_argument("--diary", help="vorhandenes .duckday Tagebuch statt Generator")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sample", type=int, default=50, help="Einträge für Render-Messungen")
+    parser.add_argument("--output", help="JSON-Datei (Standard: benchmarks/results/<Zeit>.json)")
+    parser.add_argument("--compare", help="früheres Ergebnis zum Vergleich")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tagesgans-bench-") as workdir:
+        if args.diary:
+            # Auf einer Kopie messen: save_entry schreibt neue Tage
+            import shutil
+            diary = Path(workdir) / Path(args.diary).name
+            shutil.copytree(Path(args.diary).expanduser(), diary)
+            params = {"diary": str(args.diary)}
+        else:
+            generator = generator_from_args(args)
+            print("Erzeuge Tagebuch ...")
+            diary, count = generator.generate(workdir)
+            params = generator.params()
+            params["entries"] = count
+
+        print("Benchmarks:")
+        bench = DiaryBenchmarks(diary, workdir, args.repeat, args.sample)
+        results = bench.run()
+
+    from PyQt5.QtCore import QT_VERSION_STR
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "qt_platform": os.environ.get("QT_QPA_PLATFORM"),
+        "params": params,
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4, ensure_ascii=False)
+    print(f"\nErgebnisse gespeichert in: {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Diagramme der Auswertungen (duckday.analytics, benötigt NumPy)
+"""
+
+from PyQt5.QtWidgets import (QWidget, QDialog, QVBoxLayout, QHBoxLayout, QComboBox, QLabel,
+                             QToolTip)
+from PyQt5.QtCore import Qt, QRectF, QSize
+from PyQt5.QtGui import QPainter, QColor
+
+from duckday.analytics import AnalyticsTable
+from duckday.dates import month_label
+from duckday.trace import span
+
+BAR_COLOR = "#40c463"
+
+# (Schlüssel, Deutsch, Englisch)
+VIEWS = [
+    ("words_week", "Wörter pro Woche", "Words per week"),
+    ("words_month", "Wörter pro Monat", "Words per month"),
+    ("entries_month", "Einträge pro Monat", "Entries per month"),
+    ("labels_month", "Label pro Monat", "Labels per month"),
+    ("people_month", "Personen pro Monat", "People per month"),
+    ("top_places", "Meistbesuchte Orte", "Most visited places"),
+    ("top_people", "Häufigste Personen", "Most mentioned people"),
+    ("top_labels", "Häufigste Label", "Most used labels"),
+]
+
+
+class BarChart(QWidget):
+    """Einfaches Balkendiagramm; horizontal für Ranglisten"""
+
+    MARGIN = 30
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.values = []
+        self.horizontal = False
+        self.bars = []   # (QRectF, Name, Wert)
+        self.setMouseTracking(True)
+        self.setMinimumSize(600, 300)
+
+    def sizeHint(self):
+        return QSize(800, 400)
+
+    def set_data(self, names, values, horizontal=False):
+        self.names = list(names)
+        self.values = [int(value) for value in values]
+        self.horizontal = horizontal
+        self.layout_bars()
+        self.update()
+
+    def resizeEvent(self, event):
+        self.layout_bars()
+        super().resizeEvent(event)
+
+    def layout_bars(self):
+        """Berechnet die Balken einmal pro Daten-/Größenänderung"""
+        self.bars = []
+        if not self.values:
+            return
+        peak = max(max(self.values), 1)
+        width = self.width() - 2 * self.MARGIN
+        height = self.height() - 2 * self.MARGIN
+        count = len(self.values)
+
+        if self.horizontal:
+            # Platz links für die Namen
+            left = self.MARGIN + 150
+            step = height / count
+            for i, (name, value) in enumerate(zip(self.names, self.values)):
+                length = (width - 150) * value / peak
+                self.bars.append((QRectF(left, self.MARGIN + i * step, length, step * 0.8), name, value))
+        else:
+            step = width / count
+            for i, (name, value) in enumerate(zip(self.names, self.values)):
+                bar_height = height * value / peak
+                rect = QRectF(self.MARGIN + i * step, self.MARGIN + height - bar_height,
+                              max(step * 0.8, 1), bar_height)
+                self.bars.append((rect, name, value))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        text_color = self.palette().text().color()
+        color = QColor(BAR_COLOR)
+        for rect, _, _ in self.bars:
+            painter.fillRect(rect, color)
+
+        painter.setPen(text_color)
+        if self.horizontal:
+            for rect, name, value in self.bars:
+                painter.drawText(QRectF(self.MARGIN, rect.y(), 145, rect.height()),
+                                 Qt.AlignRight | Qt.AlignVCenter, name)
+                painter.drawText(QRectF(rect.right() + 5, rect.y(), 80, rect.height()),
+                                 Qt.AlignLeft | Qt.AlignVCenter, str(value))
+        elif self.bars:
+            # Achsenbeschriftung: höchstens ~10 Namen
+            every = max(1, len(self.bars) // 10)
+            for rect, name, _ in self.bars[::every]:
+                painter.drawText(int(rect.x()), self.height() - 8, name)
+            painter.drawText(4, self.MARGIN - 8, str(max(self.values)))
+
+    def mouseMoveEvent(self, event):
+        for rect, name, value in self.bars:
+            if rect.left() <= event.x() <= rect.right() + 1 and (
+                    not self.horizontal or rect.top() <= event.y() <= rect.bottom()):
+                QToolTip.showText(event.globalPos(), f"{name}: {value}", self)
+                return
+        QToolTip.hideText()
+
+
+class AnalyticsDialog(QDialog):
+    """Trends eines Tagebuchs als Diagramme"""
+
+    def __init__(self, stats, parent=None, language="Deutsch"):
+        super().__init__(parent)
+        self.language = language
+        self.table = AnalyticsTable.from_stats(stats)
+        self.setWindowTitle("Auswertungen" if language == "Deutsch" else "Analytics")
+        self.init_ui()
+        self.show_view()
+
+    def init_ui(self):
+        lang = self.language
+        layout = QVBoxLayout()
+
+        controls = QHBoxLayout()
+        self.view_combo = QComboBox()
+        for key, de, en in VIEWS:
+            self.view_combo.addItem(de if lang == "Deutsch" else en, key)
+        self.view_combo.currentIndexChanged.connect(self.on_view_changed)
+        controls.addWidget(self.view_combo)
+
+        # Einschränkung auf ein Label bzw. eine Person
+        self.name_combo = QComboBox()
+        self.name_combo.currentIndexChanged.connect(self.show_view)
+        self.name_combo.setVisible(False)
+        controls.addWidget(self.name_combo)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.chart = BarChart(self)
+        layout.addWidget(self.chart)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+        self.setLayout(layout)
+
+    def on_view_changed(self):
+        key = self.view_combo.currentData()
+        kind = key.split("_")[0]
+        self.name_combo.blockSignals(True)
+        self.name_combo.clear()
+        if kind in ("labels", "people"):
+            self.name_combo.addItem("Alle" if self.language == "Deutsch" else "All", None)
+            for name in self.table.column(kind).names:
+                self.name_combo.addItem(name, name)
+        self.name_combo.blockSignals(False)
+        self.name_combo.setVisible(kind in ("labels", "people"))
+        self.show_view()
+
+    def period_names(self, period, starts):
+        if period == "week":
+            return [start.strftime("%d.%m.%y") for start in starts]
+        return [f"{month_label(start.month, self.language)[:3]} {start.year}" for start in starts]
+
+    def show_view(self):
+        key = self.view_combo.currentData()
+        first, second = key.split("_")
+        with span("Auswertung", view=key, entries=len(self.table)):
+            if first == "top":
+                rows = self.table.top(second, 15)
+                self.chart.set_data([name for name, _ in rows], [count for _, count in rows],
+                                    horizontal=True)
+            else:
+                if first == "words":
+                    starts, values = self.table.words_per(second)
+                elif first == "entries":
+                    starts, values = self.table.entries_per(second)
+                else:
+                    starts, values = self.table.mentions_per(first, second,
+                                                             self.name_combo.currentData())
+                self.chart.set_data(self.period_names(second, starts), values)
+
+        if self.language == "Deutsch":
+            self.summary.setText(f"{len(self.table)} Einträge, {int(self.table.words.sum())} Wörter")
+        else:
+            self.summary.setText(f"{len(self.table)} entries, {int(self.table.words.sum())} words")
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - beobachtet das geöffnete Tagebuch und meldet neue, entfernte
+und verschobene Einträge
+
+Beobachtet werden der Tagebuch-Ordner sowie alle Jahres- und
+Monatsordner. Änderungen werden gesammelt (DEBOUNCE_MS) und dann einmal
+mit dem Datumsindex abgeglichen, der nur geänderte Monate neu liest.
+"""
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from duckday.trace import span
+
+
+class DiaryWatcher(QObject):
+    """Meldet Änderungen an den Einträgen eines Tagebuchs"""
+
+    # (Tagebuch, hinzugefügte Entry, entfernte Entry, verschobene Entry)
+    entries_changed = pyqtSignal(object, object, object, object)
+
+    DEBOUNCE_MS = 300
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.diary = None
+        self.known = {}   # date → Entry, Stand der letzten Meldung
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.schedule)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check)
+
+    def watch(self, diary, entries):
+        """Beobachtet ein Tagebuch; entries ist der angezeigte Stand"""
+        self.stop()
+        self.diary = diary
+        self.known = {entry.date: entry for entry in entries}
+        self.update_paths()
+
+    def stop(self):
+        self.timer.stop()
+        paths = self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.diary = None
+        self.known = {}
+
+    def update_paths(self):
+        """Tagebuch-, Jahres- und Monatsordner beobachten (neue kommen hinzu)"""
+        wanted = {str(self.diary)}
+        for year_dir in self.diary.iterdir():
+            if year_dir.is_dir() and year_dir.name.isdigit():
+                wanted.add(str(year_dir))
+                wanted.update(str(p) for p in year_dir.iterdir() if p.is_dir())
+        current = set(self.watcher.directories())
+        if current - wanted:
+            self.watcher.removePaths(list(current - wanted))
+        if wanted - current:
+            self.watcher.addPaths(sorted(wanted - current))
+
+    def schedule(self, _path=None):
+        # Speichern legt Ordner und Datei kurz nacheinander an: sammeln
+        self.timer.start(self.DEBOUNCE_MS)
+
+    def check(self):
+        """Gleicht den Index ab und meldet die Unterschiede"""
+        if self.diary is None:
+            return
+        diary = self.diary
+        with span("Tagebuch abgleichen", diary=diary.name):
+            if not diary.exists():
+                removed = list(self.known.values())
+                self.stop()
+                self.entries_changed.emit(diary, [], removed, [])
+                return
+
+            entries = {entry.date: entry for entry in self.cache.entries(diary, refresh=True)}
+            added = [entry for day, entry in entries.items() if day not in self.known]
+            removed = [entry for day, entry in self.known.items() if day not in entries]
+            moved = [entry for day, entry in entries.items()
+                     if day in self.known and self.known[day].day_file != entry.day_file]
+            self.known = entries
+            self.update_paths()
+
+        if added or removed or moved:
+            self.cache.apply_changes(diary, added + moved, removed)
+            self.entries_changed.emit(diary, added, removed, moved)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans Core - gemeinsame Logik ohne Qt
+Wird von tagesgans.py, reader.py und editor.py geteilt
+Version: 0.0.2
+"""
+
+from .settings import CONFIG_FILE, DEFAULT_SETTINGS, load_settings, save_settings
+from .dateindex import DateIndex, Entry
+from .diaries import DiaryCache
+from .stats import DayStats, StatsTable
+
+__version__ = "0.0.2"
+
+__all__ = [
+    "CONFIG_FILE",
+    "DEFAULT_SETTINGS",
+    "load_settings",
+    "save_settings",
+    "DateIndex",
+    "DayStats",
+    "DiaryCache",
+    "Entry",
+    "StatsTable",
+]
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Auswertungen über alle Einträge eines Tagebuchs (benötigt NumPy)
+
+Grundlage ist die Statistik-Tabelle aus duckday.stats, also dieselbe
+Zerlegung, die der Reader anzeigt; hier wird keine Day.txt gelesen.
+Die Werte liegen spaltenweise in NumPy-Arrays, Label, Personen und Orte
+als ids mit Offsets (CSR), damit jede Auswertung ein paar
+Array-Operationen statt einer Python-Schleife über alle Einträge ist.
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from .trace import span
+
+PERIODS = ("week", "month", "year")
+KINDS = ("labels", "people", "places")
+
+_EPOCH = date(1970, 1, 1)
+
+
+class IdColumn:
+    """Namen pro Eintrag als ids: Eintrag i hat ids[offsets[i]:offsets[i+1]]"""
+
+    def __init__(self, names_per_entry):
+        vocabulary = {}
+        ids = []
+        offsets = [0]
+        for names in names_per_entry:
+            for name in names:
+                ids.append(vocabulary.setdefault(name, len(vocabulary)))
+            offsets.append(len(ids))
+        self.names = list(vocabulary)
+        self.vocabulary = vocabulary
+        self.ids = np.array(ids, dtype=np.int32)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        # Eintragsnummer jedes Vorkommens, für Gruppierungen nach Zeitraum
+        self.rows = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(self.offsets))
+
+    def id_of(self, name):
+        return self.vocabulary.get(name)
+
+
+class AnalyticsTable:
+    """Spaltenweise Kennzahlen aller Einträge, nach Datum sortiert"""
+
+    def __init__(self, days):
+        days = sorted(days.items())
+        with span("Analysetabelle bauen", entries=len(days)):
+            # Tage seit 1970-01-01
+            self.days = np.array([(day - _EPOCH).days for day, _ in days], dtype=np.int64)
+            self.words = np.array([stats.words for _, stats in days], dtype=np.int64)
+            self.media = np.array([stats.media for _, stats in days], dtype=np.int64)
+            self.timestamps = np.array([stats.timestamps for _, stats in days], dtype=np.int64)
+            self.labels = IdColumn(stats.labels for _, stats in days)
+            self.people = IdColumn(stats.people for _, stats in days)
+            self.places = IdColumn(stats.places for _, stats in days)
+
+    @classmethod
+    def from_stats(cls, table):
+        """Baut die Tabelle aus einer duckday.stats.StatsTable"""
+        return cls(table.days)
+
+    def __len__(self):
+        return len(self.days)
+
+    def column(self, kind):
+        if kind not in KINDS:
+            raise ValueError(f"Unbekannte Spalte: {kind}")
+        return getattr(self, kind)
+
+    def buckets(self, period):
+        """Zeitraum-Nummer jedes Eintrags (Woche ab Montag, Monat, Jahr)"""
+        if period == "week":
+            # 1970-01-01 war ein Donnerstag
+            return (self.days + 3) // 7
+        dates = self.days.astype("datetime64[D]")
+        if period == "month":
+            return dates.astype("datetime64[M]").astype(np.int64)
+        if period == "year":
+            return dates.astype("datetime64[Y]").astype(np.int64)
+        raise ValueError(f"Unbekannter Zeitraum: {period}")
+
+    def bucket_start(self, period, bucket):
+        """Erster Tag eines Zeitraums als date"""
+        if period == "week":
+            return _EPOCH + timedelta(days=int(bucket) * 7 - 3)
+        if period == "month":
+            return date(1970 + int(bucket) // 12, int(bucket) % 12 + 1, 1)
+        return date(1970 + int(bucket), 1, 1)
+
+    def _grouped(self, period, values, rows=None):
+        """Summiert values pro Zeitraum; lückenlos vom ersten bis letzten"""
+        if not len(self.days):
+            return [], np.zeros(0, dtype=np.int64)
+        buckets = self.buckets(period)
+        first = buckets[0]
+        index = (buckets if rows is None else buckets[rows]) - first
+        sums = np.bincount(index, weights=values, minlength=buckets[-1] - first + 1)
+        starts = [self.bucket_start(period, first + i) for i in range(len(sums))]
+        return starts, sums.astype(np.int64)
+
+    def words_per(self, period="week"):
+        """(Startdaten, Wörter) pro Zeitraum"""
+        return self._grouped(period, self.words)
+
+    def entries_per(self, period="month"):
+        """(Startdaten, Anzahl Einträge) pro Zeitraum"""
+        return self._grouped(period, None)
+
+    def mentions_per(self, kind, period="month", name=None):
+        """(Startdaten, Anzahl Nennungen) pro Zeitraum
+
+        Ohne name zählen alle Label/Personen/Orte, sonst nur dieser eine.
+        """
+        column = self.column(kind)
+        rows = column.rows
+        if name is not None:
+            name_id = column.id_of(name)
+            rows = rows[column.ids == name_id] if name_id is not None else rows[:0]
+        return self._grouped(period, None, rows)
+
+    def top(self, kind, count=10):
+        """Häufigste Label/Personen/Orte als [(Name, Anzahl Tage)]"""
+        column = self.column(kind)
+        if not len(column.ids):
+            return []
+        totals = np.bincount(column.ids, minlength=len(column.names))
+        order = np.argsort(-totals, kind="stable")[:count]
+        return [(column.names[i], int(totals[i])) for i in order]
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Archivmodus von der Kommandozeile (siehe duckday.compression)
+
+    python3 -m duckday.archive ~/Privat.duckday --codec gzip --older-than 60
+    python3 -m duckday.archive ~/Privat.duckday --decompress
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from .compression import SUFFIXES, compress_diary, decompress_diary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Komprimiert ältere Einträge eines Tagebuchs")
+    parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    parser.add_argument("--codec", choices=list(SUFFIXES), default="gzip")
+    parser.add_argument("--older-than", type=int, default=60, metavar="TAGE",
+                        help="nur Einträge, die älter sind (Standard: 60)")
+    parser.add_argument("--decompress", action="store_true", help="alles wieder entpacken")
+    parser.add_argument("--jobs", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    diary = Path(args.diary).expanduser()
+    if not diary.is_dir():
+        print(f"Kein Tagebuch gefunden: {diary}")
+        return 2
+
+    if args.decompress:
+        print(f"{decompress_diary(diary, args.jobs)} Datei(en) entpackt.")
+        return 0
+    try:
+        count, saved = compress_diary(diary, args.codec, args.older_than, args.jobs)
+    except ValueError as e:
+        print(e)
+        return 2
+    print(f"{count} Datei(en) komprimiert, {saved / 1024 / 1024:.1f} MB gespart.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+Datierte Schnappschüsse eines Tagebuchs
+
+    python3 -m duckday.backup ~/Privat.duckday /mnt/nas/Backups [--keep-daily 7 --keep-weekly 4 --keep-monthly 12]
+    python3 -m duckday.backup ~/Privat.duckday /mnt/nas/Backups --list
+    python3 -m duckday.backup ~/Privat.duckday /mnt/nas/Backups --restore 2026-10-18 --day 2024-03-14
+    python3 -m duckday.backup ~/Privat.duckday /mnt/nas/Backups --restore --to ~/Privat-alt.duckday
+
+Jeder Schnappschuss liegt in <Ziel>/<Tagebuch>/<Zeitpunkt>/ und ist eine
+vollständige Kopie des Tagebuchs (ohne .tagesgans). Dateien, deren Größe
+und mtime zum letzten Schnappschuss passen, werden dorthin hart verlinkt
+statt kopiert; ein nächtlicher Lauf kopiert also nur, was sich geändert
+hat, und braucht kaum zusätzlichen Platz. Kann das Ziel keine Hardlinks
+(FAT, manche Freigaben), wird kopiert. Ein Schnappschuss entsteht unter
+<Zeitpunkt>.tmp und wird erst fertig umbenannt. Solange ein Lauf
+Schnappschüsse anlegt oder löscht, hält er <Ziel>/<Tagebuch>/.lock; ein
+zweiter Lauf bricht dann ab, statt den halben Schnappschuss des ersten
+als Rest zu löschen. Da sich verlinkte
+Schnappschüsse dieselben Dateien teilen, dürfen sie nicht bearbeitet
+werden; Wiederherstellen kopiert deshalb immer.
+
+Aufbewahrung: der neueste Schnappschuss bleibt immer, dazu je der
+neueste der letzten N Tage, Wochen und Monate.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from . import compression
+from .dates import folder_date, parse_iso
+from .sync import scan_files
+from .trace import span
+
+STAMP = "%Y-%m-%d_%H%M%S"
+MANIFEST = ".tagesgans-backup.json"
+VERSION = 1
+LOCK = ".lock"
+# Sperren fremder Rechner (NAS) gelten danach als verwaist
+STALE_LOCK_SECONDS = 24 * 60 * 60
+
+# Zeitraum einer Aufbewahrungsregel
+PERIODS = {
+    "daily": lambda stamp: stamp.date(),
+    "weekly": lambda stamp: stamp.isocalendar()[:2],
+    "monthly": lambda stamp: (stamp.year, stamp.month),
+}
+
+
+def backup_folder(diary, target):
+    """Ordner mit den Schnappschüssen eines Tagebuchs"""
+    return Path(target) / Path(diary).name
+
+
+def parse_stamp(name):
+    try:
+        return datetime.strptime(name, STAMP)
+    except ValueError:
+        return None
+
+
+def snapshots(folder):
+    """Namen der fertigen Schnappschüsse, älteste zuerst"""
+    try:
+        names = [entry.name for entry in os.scandir(folder) if entry.is_dir() and parse_stamp(entry.name)]
+    except FileNotFoundError:
+        return []
+    return sorted(names)
+
+
+def pick_snapshot(folder, name=None):
+    """Neuester Schnappschuss, dessen Name mit name beginnt (ohne name: der neueste)"""
+    candidates = [s for s in snapshots(folder) if s.startswith(name or "")]
+    if not candidates:
+        raise ValueError(f"Kein Schnappschuss {name} in {folder}" if name else f"Keine Schnappschüsse in {folder}")
+    return Path(folder) / candidates[-1]
+
+
+def _lock_is_stale(path):
+    """Verwaiste Sperre: Prozess auf diesem Rechner beendet oder Sperre sehr alt"""
+    try:
+        age = time.time() - path.stat().st_mtime
+        host, pid = path.read_text(encoding='utf-8').split()
+    except FileNotFoundError:
+        return True
+    except (OSError, ValueError):
+        # Unlesbar oder gerade erst angelegt: nur nach Alter entscheiden
+        host = pid = None
+    if age > STALE_LOCK_SECONDS:
+        return True
+    if host != socket.gethostname():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except (OSError, ValueError):
+        pass
+    return False
+
+
+@contextmanager
+def locked(folder):
+    """Sperrt den Schnappschuss-Ordner für diesen Lauf"""
+    path = Path(folder) / LOCK
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            break
+        except FileExistsError:
+            if not _lock_is_stale(path):
+                raise ValueError(f"Ein anderer Lauf sichert gerade nach {folder} ({path} löschen, falls nicht)")
+            print(f"Verwaiste Sperre entfernt: {path}")
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+    else:
+        raise ValueError(f"Sperre {path} nicht erhalten")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(f"{socket.gethostname()} {os.getpid()}\n")
+        yield
+    finally:
+        path.unlink()
+
+
+def load_manifest(snapshot):
+    """Pfad → (Größe, mtime) eines Schnappschusses; ohne Manifest aus dem Ordner"""
+    try:
+        with open(Path(snapshot) / MANIFEST, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") == VERSION:
+            return {path: tuple(values) for path, values in data["files"].items()}
+    except (OSError, ValueError):
+        pass
+    return scan_files(snapshot)
+
+
+def backup(diary, target):
+    """Legt einen Schnappschuss an; gibt (Name, kopiert, verlinkt, kopierte Bytes) zurück"""
+    diary, target = Path(diary), Path(target)
+    folder = backup_folder(diary, target)
+    # Auch Ziel = Ordner über dem Tagebuch: <Ziel>/<Tagebuch> wäre das Tagebuch selbst
+    resolved, home = folder.resolve(), diary.resolve()
+    if resolved == home or home in resolved.parents or resolved in home.parents:
+        raise ValueError("Die Schnappschüsse dürfen nicht im Tagebuch liegen")
+    folder.mkdir(parents=True, exist_ok=True)
+    with locked(folder):
+        return _backup(diary, folder)
+
+
+def _backup(diary, folder):
+    name = datetime.now().strftime(STAMP)
+    if (folder / name).exists():
+        raise ValueError(f"Schnappschuss {name} existiert schon")
+    # Reste abgebrochener Läufe; unter der Sperre läuft sonst keiner
+    for entry in os.scandir(folder):
+        if entry.name.endswith(".tmp") and entry.is_dir():
+            shutil.rmtree(entry.path)
+
+    existing = snapshots(folder)
+    previous = folder / existing[-1] if existing else None
+    known = load_manifest(previous) if previous else {}
+    work = folder / (name + ".tmp")
+    work.mkdir()
+
+    files = {}
+    copied = linked = copied_bytes = 0
+    with span("Schnappschuss", diary=diary, snapshot=name, previous=previous):
+        for path, stat in sorted(scan_files(diary).items()):
+            destination = work / path
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            if known.get(path) == stat:
+                try:
+                    os.link(previous / path, destination)
+                    files[path] = stat
+                    linked += 1
+                    continue
+                except OSError:
+                    # Keine Hardlinks am Ziel oder Datei im alten Schnappschuss fehlt
+                    pass
+            shutil.copy2(diary / path, destination)
+            # Stand der Kopie merken: ändert sich die Datei gerade, wird sie nächstes Mal neu kopiert
+            result = destination.stat()
+            files[path] = (result.st_size, result.st_mtime_ns)
+            copied += 1
+            copied_bytes += result.st_size
+
+        with open(work / MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump({"version": VERSION, "created": name, "copied": copied, "bytes": copied_bytes,
+                       "files": {path: list(stat) for path, stat in files.items()}}, f)
+        os.rename(work, folder / name)
+    return name, copied, linked, copied_bytes
+
+
+def keep_snapshots(names, daily=0, weekly=0, monthly=0):
+    """Namen, die die Aufbewahrung behält: der neueste und je der neueste pro Zeitraum"""
+    names = sorted(names, reverse=True)
+    kept = set(names[:1])
+    for period, count in (("daily", daily), ("weekly", weekly), ("monthly", monthly)):
+        seen = set()
+        for name in names:
+            if len(seen) >= count:
+                break
+            key = PERIODS[period](parse_stamp(name))
+            if key not in seen:
+                seen.add(key)
+                kept.add(name)
+    return kept
+
+
+def prune(folder, daily=0, weekly=0, monthly=0, dry_run=False):
+    """Löscht Schnappschüsse außerhalb der Aufbewahrung; gibt ihre Namen zurück"""
+    names = snapshots(folder)
+    kept = keep_snapshots(names, daily, weekly, monthly)
+    removed = [name for name in names if name not in kept]
+    if not dry_run:
+        with locked(folder):
+            for name in removed:
+                shutil.rmtree(Path(folder) / name)
+    return removed
+
+
+def find_day(root, day):
+    """Tagesordner eines Datums in einem Tagebuch oder Schnappschuss (beliebige Monatsnamen)"""
+    root = Path(root)
+    if not root.is_dir():
+        return None
+    for year_dir in root.iterdir():
+        if not year_dir.is_dir() or not year_dir.name.isdigit() or int(year_dir.name) != day.year:
+            continue
+        for month_dir in year_dir.iterdir():
+            if not month_dir.is_dir():
+                continue
+            for day_dir in month_dir.iterdir():
+                if day_dir.is_dir() and folder_date(year_dir.name, month_dir.name, day_dir.name) == day:
+                    return day_dir
+    return None
+
+
+def restore_day(snapshot, diary, day):
+    """Legt die Dateien eines Tages aus dem Schnappschuss zurück; gibt ihre Namen zurück
+
+    Gleichnamige Dateien werden überschrieben, andere bleiben liegen.
+    """
+    source = find_day(snapshot, day)
+    if source is None:
+        raise ValueError(f"Kein Eintrag am {day:%d.%m.%Y} in {Path(snapshot).name}")
+    target = find_day(diary, day) or Path(diary) / source.relative_to(snapshot)
+    target.mkdir(parents=True, exist_ok=True)
+    names = []
+    for entry in sorted(os.scandir(source), key=lambda entry: entry.name):
+        if entry.is_file():
+            shutil.copy2(entry.path, target / entry.name)
+            _remove_other_versions(target, entry.name)
+            names.append(entry.name)
+    return names
+
+
+def _remove_other_versions(folder, name):
+    """Entfernt andere (un)komprimierte Fassungen, sonst liest find() weiter die alte"""
+    plain, suffix = os.path.splitext(name)
+    if suffix in compression.CODECS and compression.is_compressible(plain):
+        for other in [plain] + [plain + other for other in compression.CODECS if other != suffix]:
+            try:
+                (folder / other).unlink()
+            except FileNotFoundError:
+                pass
+    elif compression.is_compressible(name):
+        compression.remove_compressed(folder / name)
+
+
+def restore_snapshot(snapshot, target):
+    """Kopiert einen ganzen Schnappschuss in einen neuen Ordner"""
+    target = Path(target)
+    if target.exists() and any(target.iterdir()):
+        raise ValueError(f"Ziel ist nicht leer: {target}")
+    shutil.copytree(snapshot, target, ignore=shutil.ignore_patterns(MANIFEST), dirs_exist_ok=True)
+
+
+def snapshot_info(snapshot):
+    """(Dateien, kopierte Bytes) aus dem Manifest; None wenn unbekannt"""
+    try:
+        with open(Path(snapshot) / MANIFEST, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return len(data["files"]), data["bytes"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def format_size(size):
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Datierte Schnappschüsse eines Tagebuchs")
+    parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    parser.add_argument("target", help="Ordner für die Schnappschüsse, z.B. auf dem NAS")
+    for period, label in (("daily", "Tage"), ("weekly", "Wochen"), ("monthly", "Monate")):
+        parser.add_argument(f"--keep-{period}", type=int, default=0, metavar="N",
+                            help=f"je einen Schnappschuss der letzten N {label} behalten")
+    parser.add_argument("--list", action="store_true", help="Schnappschüsse anzeigen")
+    parser.add_argument("--restore", nargs="?", const="", default=None, metavar="ZEITPUNKT",
+                        help="wiederherstellen (Standard: neuester; auch nur Datum, z.B. 2026-10-18)")
+    parser.add_argument("--day", help="mit --restore: nur diesen Tag (2024-03-14) ins Tagebuch")
+    parser.add_argument("--to", help="mit --restore: ganzen Schnappschuss in diesen neuen Ordner")
+    args = parser.parse_args(argv)
+    return run(args, Path(args.diary).expanduser(), Path(args.target).expanduser())
+
+
+def run(args, diary, target):
+    """Gemeinsam für main und tagesgans.py backup/restore"""
+    folder = backup_folder(diary, target)
+    try:
+        if args.restore is not None:
+            return _restore(args, diary, pick_snapshot(folder, args.restore))
+        if args.list:
+            for name in snapshots(folder):
+                info = snapshot_info(folder / name)
+                print(f"{name}  {info[0]} Dateien, {format_size(info[1])} neu" if info else name)
+            return 0
+
+        if not diary.is_dir():
+            print(f"Kein Tagebuch gefunden: {diary}")
+            return 2
+        name, copied, linked, copied_bytes = backup(diary, target)
+        print(f"Schnappschuss {name}: {copied} Datei(en) kopiert ({format_size(copied_bytes)}), {linked} verlinkt.")
+        if args.keep_daily or args.keep_weekly or args.keep_monthly:
+            removed = prune(folder, args.keep_daily, args.keep_weekly, args.keep_monthly)
+            if removed:
+                print(f"{len(removed)} alte(r) Schnappschüsse gelöscht: {', '.join(removed)}")
+    except (OSError, ValueError) as e:
+        print(e)
+        return 2
+    return 0
+
+
+def _restore(args, diary, snapshot):
+    if args.day:
+        day = parse_iso(args.day)
+        if day is None:
+            raise ValueError(f"Kein gültiges Datum: {args.day} (2024-03-14 oder 14.03.2024)")
+        target = Path(args.to).expanduser() if args.to else diary
+        names = restore_day(snapshot, target, day)
+        print(f"{day:%d.%m.%Y} aus {snapshot.name} wiederhergestellt: {', '.join(names)}")
+        return 0
+    if not args.to:
+        raise ValueError("Ganzen Schnappschuss nur in einen neuen Ordner (--to) wiederherstellen")
+    restore_snapshot(snapshot, Path(args.to).expanduser())
+    print(f"{snapshot.name} nach {args.to} wiederhergestellt.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
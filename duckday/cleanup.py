@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Speicherbelegung und verwaiste Anhänge eines Tagebuchs
+
+    python3 -m duckday.cleanup ~/Privat.duckday            Bericht + Probelauf
+    python3 -m duckday.cleanup ~/Privat.duckday --reclaim  Verwaiste in den Papierkorb
+    python3 -m duckday.cleanup ~/Privat.duckday --undo     Letztes Aufräumen rückgängig
+
+Verwaist ist eine Datei im Tagesordner, auf die Day.txt nicht mehr
+verweist (<Datei>, @Person → Person.vcard, %Ort → Ort.kml). Verweise
+werden in allen Zeilen gesucht, auch ohne Format, damit im Zweifel
+nichts entfernt wird. Konflikt-Kopien aus duckday.sync gelten nie als
+verwaist. Tage, deren Day.txt fehlt oder kein UTF-8 ist,
+werden nicht angefasst.
+
+Aufgeräumte Dateien landen in <Tagebuch>/.tagesgans/trash/<Zeitpunkt>/
+samt Liste (moved.txt); --undo legt sie zurück.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from . import compression
+from .dateindex import INDEX_DIR
+from .dates import folder_date
+from .fsck import BATCH_SIZE, check_structure
+from .markup import tokenize
+from .sync import is_conflict_copy
+from .trace import span
+
+TRASH_DIR = "trash"
+MANIFEST = "moved.txt"
+
+# Endung → Art für den Bericht
+FILE_TYPES = {
+    ".png": "Bilder", ".jpg": "Bilder", ".jpeg": "Bilder", ".svg": "Bilder",
+    ".mp3": "Audio", ".ogg": "Audio", ".opus": "Audio",
+    ".mp4": "Video",
+    ".vcard": "vCard", ".kml": "KML", ".txt": "Text",
+}
+
+# Ein Tagesordner: Datum, Dateien [(Name, Größe)], verwaiste Namen
+DayUsage = namedtuple("DayUsage", "day files orphans")
+
+
+def file_type(name):
+    return FILE_TYPES.get(os.path.splitext(name)[1].lower(), "Andere")
+
+
+def referenced_files(content):
+    """Dateinamen, auf die ein Day.txt-Inhalt verweist"""
+    names = {"Day.txt"}
+    for line in content.split("\n"):
+        for kind, value in tokenize(line):
+            if kind == "media":
+                names.add(value)
+            elif kind == "person":
+                names.add(f"{value}.vcard")
+            elif kind == "place":
+                names.add(f"{value}.kml")
+    return names
+
+
+def scan_day(day_dir):
+    """Dateien und verwaiste Anhänge eines Tagesordners"""
+    day_dir = Path(day_dir)
+    day = folder_date(*day_dir.parts[-3:])
+    files = []
+    with os.scandir(day_dir) as it:
+        for entry in it:
+            if entry.is_file(follow_symlinks=False):
+                files.append((entry.name, entry.stat(follow_symlinks=False).st_size))
+
+    try:
+        referenced = referenced_files(compression.read_text(day_dir / "Day.txt"))
+    except (OSError, UnicodeDecodeError):
+        # Unklarer Zustand: nichts als verwaist melden
+        return DayUsage(day, files, [])
+
+    orphans = [name for name, _ in files
+               if _plain_name(name) not in referenced and not name.startswith(".") and not is_conflict_copy(name)]
+    return DayUsage(day, files, orphans)
+
+
+def _plain_name(name):
+    """Name ohne Kompressions-Endung (duckday.compression)"""
+    base, suffix = os.path.splitext(name)
+    return base if suffix in compression.CODECS and compression.is_compressible(base) else name
+
+
+def scan_days(day_dirs):
+    """Ein Auftrag im Pool: mehrere Tagesordner"""
+    return [(str(day_dir), scan_day(day_dir)) for day_dir in day_dirs]
+
+
+class UsageReport:
+    """Belegung pro Jahr, Monat und Dateiart sowie verwaiste Dateien"""
+
+    def __init__(self, diary):
+        self.diary = Path(diary)
+        self.years = {}      # Jahr → Bytes
+        self.months = {}     # (Jahr, Monat) → Bytes
+        self.types = {}      # Art → [Anzahl, Bytes]
+        self.orphans = []    # (Pfad, Bytes)
+        self.total = 0
+
+    def add(self, day_dir, usage):
+        for name, size in usage.files:
+            self.total += size
+            if usage.day is not None:
+                self.years[usage.day.year] = self.years.get(usage.day.year, 0) + size
+                key = (usage.day.year, usage.day.month)
+                self.months[key] = self.months.get(key, 0) + size
+            counts = self.types.setdefault(file_type(name), [0, 0])
+            counts[0] += 1
+            counts[1] += size
+        sizes = dict(usage.files)
+        for name in usage.orphans:
+            self.orphans.append((Path(day_dir) / name, sizes[name]))
+
+    @property
+    def orphan_bytes(self):
+        return sum(size for _, size in self.orphans)
+
+
+def usage_report(diary, jobs=None, processes=True):
+    """Durchsucht alle Tagesordner parallel und fasst die Belegung zusammen"""
+    diary = Path(diary)
+    report = UsageReport(diary)
+    with span("Belegung ermitteln", diary=diary.name):
+        day_dirs, _ = check_structure(diary)
+        batches = [day_dirs[i:i + BATCH_SIZE] for i in range(0, len(day_dirs), BATCH_SIZE)]
+        pool = ProcessPoolExecutor if processes and len(batches) > 1 else ThreadPoolExecutor
+        with pool(max_workers=jobs or os.cpu_count() or 2) as executor:
+            for results in executor.map(scan_days, batches):
+                for day_dir, usage in results:
+                    report.add(day_dir, usage)
+    report.orphans.sort()
+    return report
+
+
+def reclaim(diary, orphans):
+    """Verschiebt verwaiste Dateien in den Papierkorb; gibt dessen Ordner zurück"""
+    diary = Path(diary)
+    trash = diary / INDEX_DIR / TRASH_DIR / datetime.now().strftime("%Y%m%d-%H%M%S")
+    trash.mkdir(parents=True, exist_ok=False)
+    with open(trash / MANIFEST, 'w', encoding='utf-8') as manifest:
+        for path, _ in orphans:
+            rel = Path(path).relative_to(diary)
+            target = trash / rel
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Gleiches Dateisystem: nur umbenennen, nichts kopieren
+            shutil.move(str(path), str(target))
+            manifest.write(rel.as_posix() + "\n")
+            manifest.flush()
+    return trash
+
+
+def trash_runs(diary):
+    """Alle Aufräum-Durchgänge im Papierkorb, neueste zuletzt"""
+    trash = Path(diary) / INDEX_DIR / TRASH_DIR
+    if not trash.is_dir():
+        return []
+    return sorted(p for p in trash.iterdir() if (p / MANIFEST).exists())
+
+
+def undo(diary, run=None, out=None):
+    """Legt die Dateien eines Durchgangs (Standard: letzter) zurück"""
+    out = out or sys.stdout
+    diary = Path(diary)
+    runs = trash_runs(diary)
+    if run is not None:
+        runs = [p for p in runs if p.name == run]
+    if not runs:
+        print("Nichts rückgängig zu machen.", file=out)
+        return 0
+    trash = runs[-1]
+
+    restored = 0
+    kept = False
+    with open(trash / MANIFEST, 'r', encoding='utf-8') as manifest:
+        for rel in manifest.read().splitlines():
+            source = trash / rel
+            target = diary / rel
+            if not source.exists():
+                continue
+            if target.exists():
+                print(f"Übersprungen, existiert wieder: {rel}", file=out)
+                kept = True
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(source), str(target))
+            restored += 1
+    if not kept:
+        shutil.rmtree(trash)
+    print(f"{restored} Datei(en) wiederhergestellt.", file=out)
+    return restored
+
+
+def human_size(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def print_report(report, out=None):
+    out = out or sys.stdout
+    print(f"Gesamt: {human_size(report.total)}", file=out)
+    print("\nPro Jahr:", file=out)
+    for year, size in sorted(report.years.items()):
+        print(f"  {year}  {human_size(size):>10}", file=out)
+        for (y, month), month_size in sorted(report.months.items()):
+            if y == year:
+                print(f"    {month:02d}  {human_size(month_size):>10}", file=out)
+    print("\nPro Dateiart:", file=out)
+    for kind, (count, size) in sorted(report.types.items(), key=lambda item: -item[1][1]):
+        print(f"  {kind:<8} {count:>7} Dateien  {human_size(size):>10}", file=out)
+    print(f"\nVerwaist: {len(report.orphans)} Datei(en), {human_size(report.orphan_bytes)}", file=out)
+    for path, size in report.orphans:
+        print(f"  {path.relative_to(report.diary)}  ({human_size(size)})", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Speicherbelegung und verwaiste Anhänge")
+    parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    parser.add_argument("--reclaim", action="store_true",
+                        help="verwaiste Dateien in den Papierkorb verschieben")
+    parser.add_argument("--undo", nargs="?", const="", metavar="DURCHGANG",
+                        help="Aufräumen rückgängig machen (Standard: letzter Durchgang)")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl paralleler Prüfer")
+    args = parser.parse_args(argv)
+
+    diary = Path(args.diary).expanduser()
+    if not diary.is_dir():
+        print(f"Kein Tagebuch gefunden: {diary}")
+        return 2
+
+    if args.undo is not None:
+        undo(diary, args.undo or None)
+        return 0
+
+    report = usage_report(diary, args.jobs)
+    print_report(report)
+    if not report.orphans:
+        return 0
+    if args.reclaim:
+        trash = reclaim(diary, report.orphans)
+        print(f"\nVerschoben nach {trash.relative_to(diary)} (rückgängig: --undo {trash.name})")
+    else:
+        print("\nProbelauf: nichts verändert. Mit --reclaim aufräumen.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans ohne GUI
+
+    tagesgans.py list Privat --year 2024
+    tagesgans.py show Privat 2024-03-14 [--raw]
+    tagesgans.py search "urlaub berlin" Privat Arbeit.duckdb --jobs 4
+    tagesgans.py stats Privat
+    tagesgans.py export Privat ~/Privat.duckdb
+    tagesgans.py export Privat ~/Privat-Seiten --html
+    tagesgans.py check Privat
+    tagesgans.py sync Privat /mnt/nas/Privat.duckday [--dry-run]
+    tagesgans.py backup Privat /mnt/nas/Backups --keep-daily 7 --keep-monthly 12
+    tagesgans.py restore Privat /mnt/nas/Backups --day 2024-03-14
+
+Ein Tagebuch ist ein Pfad (.duckday Ordner, .duckdb, .duckpack) oder der
+Name eines .duckday Ordners unter ~ (bzw. --root). Ohne Angabe nehmen
+search, stats und check alle Tagebücher unter root. Mehrere Tagebücher
+werden mit --jobs auf Prozesse verteilt. Qt wird nie geladen, Module
+nur für den jeweiligen Befehl; der Start dauert damit nur Millisekunden.
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+COMMANDS = ("list", "show", "search", "stats", "export", "check", "sync", "backup", "restore")
+
+# Endungen, die direkt als Ablage geöffnet werden
+STORAGE_SUFFIXES = (".duckday", ".duckdb", ".duckpack")
+
+
+class CliError(Exception):
+    """Fehler mit Meldung für die Kommandozeile"""
+
+
+def resolve_diary(name, root=None):
+    """Pfad eines Tagebuchs aus Pfad oder Name"""
+    path = Path(name).expanduser()
+    if path.exists():
+        return path
+    if os.sep not in name and not name.endswith(STORAGE_SUFFIXES):
+        for diary in find_diaries(root):
+            if diary.stem == name:
+                return diary
+    raise CliError(f"Kein Tagebuch gefunden: {name}")
+
+
+def find_diaries(root=None):
+    """Alle .duckday Ordner unter root (Standard: ~)"""
+    from .diaries import DiaryCache
+    return DiaryCache(root).diaries()
+
+
+def diary_paths(names, root=None):
+    """Pfade zu den angegebenen Tagebüchern, ohne Angabe alle"""
+    if names:
+        return [resolve_diary(name, root) for name in names]
+    diaries = find_diaries(root)
+    if not diaries:
+        raise CliError(f"Keine Tagebücher unter {root or Path.home()}")
+    return diaries
+
+
+def open_diary(path):
+    from .storage import open_storage
+    return open_storage(path)
+
+
+def day_stats(storage):
+    """{date: DayStats}; bei Ordnern aus der Statistik-Tabelle (nur Geändertes wird gelesen)"""
+    from .stats import DayStats, StatsTable, snippet
+    from .storage import FolderStorage
+
+    if isinstance(storage, FolderStorage):
+        return StatsTable.open(storage.diary, storage.index).days
+    days = {}
+    for entry in storage.entries():
+        parsed = storage.parsed(entry.day_file)
+        days[entry.date] = DayStats(parsed.words, len(parsed.media), tuple(parsed.labels),
+                                    tuple(parsed.people), tuple(parsed.places),
+                                    len(parsed.timestamps), snippet(parsed))
+    return days
+
+
+def plain_text(parsed):
+    """Eintrag als reiner Text: ohne Formate und Markup-Zeichen, Medien als [Datei]"""
+    lines = []
+    for line in parsed.lines:
+        lines.append("".join(f"[{token.value}]" if token.kind == "media" else token.value
+                             for token in line.tokens))
+    return "\n".join(lines)
+
+
+def run_jobs(func, items, jobs):
+    """func für jedes Tagebuch, bei mehreren auf Prozesse verteilt; Ergebnisse in Reihenfolge"""
+    if len(items) < 2 or jobs == 1:
+        return [func(item) for item in items]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(jobs or os.cpu_count() or 2, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+# Aufträge für den Pool: nur Pfade hinein, nur einfache Werte heraus
+
+def _search_job(args):
+    path, text, limit = args
+    storage = open_diary(path)
+    try:
+        found = []
+        for entry in storage.search(text, limit):
+            found.append((entry.date, storage.folder(entry.day_file)))
+        return found
+    finally:
+        storage.close()
+
+
+def _stats_job(path):
+    storage = open_diary(path)
+    try:
+        days = day_stats(storage)
+    finally:
+        storage.close()
+    labels = Counter(label for stats in days.values() for label in stats.labels)
+    people = Counter(person for stats in days.values() for person in stats.people)
+    places = Counter(place for stats in days.values() for place in stats.places)
+    return {
+        "entries": len(days),
+        "first": min(days) if days else None,
+        "last": max(days) if days else None,
+        "words": sum(stats.words for stats in days.values()),
+        "media": sum(stats.media for stats in days.values()),
+        "timestamps": sum(stats.timestamps for stats in days.values()),
+        "labels": labels.most_common(5),
+        "people": people.most_common(5),
+        "places": places.most_common(5),
+    }
+
+
+# Befehle
+
+def cmd_list(args):
+    storage = open_diary(resolve_diary(args.diary, args.root))
+    try:
+        days = day_stats(storage) if args.text else {}
+        for entry in storage.entries():
+            if args.year and entry.date.year != args.year:
+                continue
+            if args.month and entry.date.month != args.month:
+                continue
+            if args.text:
+                stats = days.get(entry.date)
+                print(f"{entry.date:%Y-%m-%d}  {stats.words if stats else 0:5d}  {stats.snippet if stats else ''}")
+            else:
+                print(f"{entry.date:%Y-%m-%d}  {storage.folder(entry.day_file)}")
+    finally:
+        storage.close()
+    return 0
+
+
+def cmd_show(args):
+    from .dates import parse_iso
+
+    day = parse_iso(args.date)
+    if day is None:
+        raise CliError(f"Kein gültiges Datum: {args.date} (2024-03-14 oder 14.03.2024)")
+    storage = open_diary(resolve_diary(args.diary, args.root))
+    try:
+        day_file = storage.lookup(day)
+        if day_file is None:
+            raise CliError(f"Kein Eintrag am {day:%d.%m.%Y}")
+        if args.raw:
+            print(storage.read_text(day_file), end="")
+        else:
+            print(plain_text(storage.parsed(day_file)))
+        attachments = storage.attachments(day_file)
+        if attachments and not args.raw:
+            print()
+            print("Anhänge: " + ", ".join(attachments))
+    finally:
+        storage.close()
+    return 0
+
+
+def cmd_search(args):
+    paths = diary_paths(args.diaries, args.root)
+    results = run_jobs(_search_job, [(path, args.text, args.limit) for path in paths], args.jobs)
+    count = 0
+    for path, found in zip(paths, results):
+        for day, folder in found:
+            prefix = f"{path.stem}  " if len(paths) > 1 else ""
+            print(f"{prefix}{day:%Y-%m-%d}  {folder}")
+            count += 1
+    return 0 if count else 1
+
+
+def cmd_stats(args):
+    paths = diary_paths(args.diaries, args.root)
+    for path, summary in zip(paths, run_jobs(_stats_job, paths, args.jobs)):
+        print(f"{path.stem} ({path})")
+        if not summary["entries"]:
+            print("  keine Einträge")
+            continue
+        print(f"  Einträge:     {summary['entries']} ({summary['first']:%d.%m.%Y} – {summary['last']:%d.%m.%Y})")
+        print(f"  Wörter:       {summary['words']} (⌀ {summary['words'] // summary['entries']} pro Tag)")
+        print(f"  Medien:       {summary['media']}")
+        print(f"  Zeitstempel:  {summary['timestamps']}")
+        for key, title in (("labels", "Label"), ("people", "Personen"), ("places", "Orte")):
+            if summary[key]:
+                names = ", ".join(f"{name} ({count})" for name, count in summary[key])
+                print(f"  {title + ':':<13} {names}")
+    return 0
+
+
+def cmd_export(args):
+    from .pack import SUFFIX as PACK_SUFFIX, pack_diary
+    from .storage import FolderStorage, copy_entries, open_storage
+    from .website import MANIFEST, export_site
+
+    source = open_diary(resolve_diary(args.diary, args.root))
+    target_path = Path(args.target).expanduser()
+    try:
+        if args.html:
+            # Vorhandene Seiten werden nur aktualisiert
+            if not isinstance(source, FolderStorage):
+                raise CliError("HTML-Seiten entstehen nur aus einem .duckday Ordner")
+            if (target_path.exists() and any(target_path.iterdir())
+                    and not (target_path / MANIFEST).exists()):
+                raise CliError(f"Ziel ist nicht leer und enthält keine Tagesgans-Seiten: {target_path}")
+            built, total = export_site(source.diary, target_path, args.jobs, args.full)
+            print(f"{built} von {total} Tagen neu gebaut: {target_path / 'index.html'}")
+            return 0
+        if target_path.exists() and (not target_path.is_dir() or any(target_path.iterdir())):
+            raise CliError(f"Ziel ist nicht leer: {target_path}")
+        if target_path.suffix == PACK_SUFFIX:
+            if not isinstance(source, FolderStorage):
+                raise CliError("Pakete entstehen nur aus einem .duckday Ordner")
+            _, count = pack_diary(source.diary, target_path)
+            print(f"{count} Dateien nach {target_path} gepackt.")
+            return 0
+        target = open_storage(target_path, create=True)
+        try:
+            count = copy_entries(source, target)
+        finally:
+            target.close()
+        print(f"{count} Einträge nach {target_path} geschrieben.")
+    finally:
+        source.close()
+    return 0
+
+
+def cmd_check(args):
+    from .fsck import check_diary, format_problem
+
+    total = 0
+    for path in diary_paths(args.diaries, args.root):
+        if not path.is_dir():
+            raise CliError(f"Nur .duckday Ordner können geprüft werden: {path}")
+        problems = check_diary(path, args.jobs)
+        for problem in problems:
+            print(f"{path.stem}: {format_problem(problem, path)}")
+        total += len(problems)
+    print(f"{total} Problem(e) gefunden." if total else "Keine Probleme gefunden.")
+    return 1 if total else 0
+
+
+def cmd_sync(args):
+    from .sync import format_action, sync
+
+    paths = [resolve_diary(name, args.root) for name in (args.a, args.b)]
+    for path in paths:
+        if not path.is_dir():
+            raise CliError(f"Nur .duckday Ordner können abgeglichen werden: {path}")
+    try:
+        actions = sync(*paths, dry_run=args.dry_run)
+    except ValueError as e:
+        raise CliError(str(e))
+    for action in actions:
+        print(format_action(action, [str(path) for path in paths]))
+    conflicts = sum(action.op == "konflikt" for action in actions)
+    print(f"{len(actions)} Änderung(en){', davon ' + str(conflicts) + ' Konflikt(e)' if conflicts else ''}"
+          f"{' (Probelauf)' if args.dry_run else ''}.")
+    return 0
+
+
+def cmd_backup(args):
+    from .backup import run
+
+    diary = resolve_diary(args.diary, args.root)
+    if not diary.is_dir():
+        raise CliError(f"Nur .duckday Ordner können gesichert werden: {diary}")
+    return run(args, diary, Path(args.target).expanduser())
+
+
+def cmd_restore(args):
+    from .backup import run
+
+    try:
+        diary = resolve_diary(args.diary, args.root)
+    except CliError:
+        # Tagebuch nicht mehr da: der Name reicht, um die Schnappschüsse zu finden
+        diary = Path(args.diary).expanduser()
+        if diary.suffix != ".duckday":
+            diary = diary.with_name(diary.name + ".duckday")
+    return run(args, diary, Path(args.target).expanduser())
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tagesgans", description="Tagesgans ohne GUI")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--root", default=None, help="hier nach Tagebüchern suchen (Standard: ~)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", parents=[common], help="Einträge auflisten")
+    list_parser.add_argument("diary", help="Name oder Pfad")
+    list_parser.add_argument("--year", type=int)
+    list_parser.add_argument("--month", type=int)
+    list_parser.add_argument("--text", action="store_true", help="Wörter und Textanfang zeigen")
+    list_parser.set_defaults(func=cmd_list)
+
+    show_parser = commands.add_parser("show", parents=[common], help="einen Tag ausgeben")
+    show_parser.add_argument("diary", help="Name oder Pfad")
+    show_parser.add_argument("date", help="2024-03-14 oder 14.03.2024")
+    show_parser.add_argument("--raw", action="store_true", help="Day.txt unverändert")
+    show_parser.set_defaults(func=cmd_show)
+
+    search_parser = commands.add_parser("search", parents=[common], help="Volltextsuche")
+    search_parser.add_argument("text")
+    search_parser.add_argument("diaries", nargs="*", help="Namen oder Pfade (Standard: alle)")
+    search_parser.add_argument("--limit", type=int, default=50, help="Treffer pro Tagebuch")
+    search_parser.add_argument("--jobs", type=int, default=None)
+    search_parser.set_defaults(func=cmd_search)
+
+    stats_parser = commands.add_parser("stats", parents=[common], help="Statistik")
+    stats_parser.add_argument("diaries", nargs="*", help="Namen oder Pfade (Standard: alle)")
+    stats_parser.add_argument("--jobs", type=int, default=None)
+    stats_parser.set_defaults(func=cmd_stats)
+
+    export_parser = commands.add_parser("export", parents=[common], help="in Ordner, .duckdb oder .duckpack übertragen")
+    export_parser.add_argument("diary", help="Name oder Pfad")
+    export_parser.add_argument("target", help="neuer .duckday Ordner, .duckdb, .duckpack oder mit --html ein Ordner für Webseiten")
+    export_parser.add_argument("--html", action="store_true", help="statische HTML-Seiten (inkrementell, siehe duckday.website)")
+    export_parser.add_argument("--full", action="store_true", help="mit --html: alle Tage neu bauen")
+    export_parser.add_argument("--jobs", type=int, default=None)
+    export_parser.set_defaults(func=cmd_export)
+
+    check_parser = commands.add_parser("check", parents=[common], help="auf Fehler prüfen (siehe duckday.fsck)")
+    check_parser.add_argument("diaries", nargs="*", help="Namen oder Pfade (Standard: alle)")
+    check_parser.add_argument("--jobs", type=int, default=None)
+    check_parser.set_defaults(func=cmd_check)
+
+    sync_parser = commands.add_parser("sync", parents=[common], help="zwei Kopien abgleichen (siehe duckday.sync)")
+    sync_parser.add_argument("a", help="Name oder Pfad")
+    sync_parser.add_argument("b", help="zweite Kopie, z.B. auf dem NAS")
+    sync_parser.add_argument("--dry-run", action="store_true", help="nur anzeigen, was passieren würde")
+    sync_parser.set_defaults(func=cmd_sync)
+
+    backup_parser = commands.add_parser("backup", parents=[common], help="Schnappschuss anlegen (siehe duckday.backup)")
+    backup_parser.add_argument("diary", help="Name oder Pfad")
+    backup_parser.add_argument("target", help="Ordner für die Schnappschüsse")
+    for period, label in (("daily", "Tage"), ("weekly", "Wochen"), ("monthly", "Monate")):
+        backup_parser.add_argument(f"--keep-{period}", type=int, default=0, metavar="N",
+                                   help=f"je einen Schnappschuss der letzten N {label} behalten")
+    backup_parser.add_argument("--list", action="store_true", help="Schnappschüsse anzeigen")
+    backup_parser.set_defaults(func=cmd_backup, restore=None, day=None, to=None)
+
+    restore_parser = commands.add_parser("restore", parents=[common], help="aus einem Schnappschuss wiederherstellen")
+    restore_parser.add_argument("diary", help="Name oder Pfad")
+    restore_parser.add_argument("target", help="Ordner mit den Schnappschüssen")
+    restore_parser.add_argument("--snapshot", dest="restore", default="", metavar="ZEITPUNKT",
+                                help="Standard: neuester; auch nur Datum, z.B. 2026-10-18")
+    restore_parser.add_argument("--day", help="nur diesen Tag (2024-03-14) ins Tagebuch")
+    restore_parser.add_argument("--to", help="ganzen Schnappschuss in diesen neuen Ordner")
+    restore_parser.set_defaults(func=cmd_restore, list=False, keep_daily=0, keep_weekly=0, keep_monthly=0)
+    return parser
+
+
+def main(argv=None):
+    import sqlite3
+    from .pack import PackError
+
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Ausgabe abgeschnitten (z.B. | head): ohne Meldung beenden
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (CliError, OSError, ValueError, PackError, sqlite3.Error) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
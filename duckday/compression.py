@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+Komprimierte Ablage älterer Einträge (Archivmodus)
+
+    python3 -m duckday.archive ~/Privat.duckday --codec gzip --older-than 60
+    python3 -m duckday.archive ~/Privat.duckday --decompress
+
+Day.txt, .vcard und .kml älterer Tage werden zu Day.txt.gz (gzip),
+.xz (lzma) oder .zst (zstd, benötigt das Paket zstandard). Alle Leser
+fragen hier nach (find, exists, stat, read_text), Pfade bleiben also
+überall die unkomprimierten Namen. Gespeichert wird immer unkomprimiert;
+der Eintrag gilt dann wieder als "warm". Medien (Bilder, Audio, Video)
+sind bereits komprimiert und bleiben unverändert.
+"""
+
+import gzip
+import hashlib
+import lzma
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+from .trace import span
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SUFFIXES = {"gzip": ".gz", "lzma": ".xz", "zstd": ".zst"}
+CODECS = {suffix: codec for codec, suffix in SUFFIXES.items()}
+
+# Nur diese Dateien werden komprimiert
+COMPRESSIBLE_NAMES = ("Day.txt",)
+COMPRESSIBLE_SUFFIXES = (".vcard", ".kml")
+
+# Entpackte Kopien für externe Programme (Kontakte, QGIS)
+PLAIN_CACHE = Path.home() / ".cache" / "tagesgans" / "plain"
+
+
+def available_codecs():
+    """Verfahren, die hier benutzt werden können"""
+    return [codec for codec in SUFFIXES if codec != "zstd" or zstandard is not None]
+
+
+def is_compressible(name):
+    return name in COMPRESSIBLE_NAMES or name.endswith(COMPRESSIBLE_SUFFIXES)
+
+
+def find(path):
+    """Tatsächliche Datei zu einem (unkomprimierten) Namen oder None"""
+    path = Path(path)
+    if path.exists():
+        return path
+    for suffix in CODECS:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def exists(path):
+    return find(path) is not None
+
+
+def stat(path):
+    """os.stat der tatsächlichen Datei (mtime bleibt beim Komprimieren erhalten)"""
+    actual = find(path)
+    if actual is None:
+        raise FileNotFoundError(f"Datei nicht gefunden: {path}")
+    return os.stat(actual)
+
+
+def _decompress(data, suffix):
+    if suffix == ".gz":
+        return gzip.decompress(data)
+    if suffix == ".xz":
+        return lzma.decompress(data)
+    if suffix == ".zst":
+        if zstandard is None:
+            raise OSError("zstd-komprimierte Datei, aber das Paket zstandard fehlt")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return data
+
+
+def _compress(data, codec):
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if codec == "lzma":
+        return lzma.compress(data, preset=6)
+    if codec == "zstd":
+        if zstandard is None:
+            raise OSError("zstd benötigt das Paket zstandard")
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    raise ValueError(f"Unbekanntes Verfahren: {codec}")
+
+
+def read_bytes(path):
+    """Inhalt einer Datei, egal ob komprimiert oder nicht"""
+    actual = find(path)
+    if actual is None:
+        raise FileNotFoundError(f"Datei nicht gefunden: {path}")
+    with open(actual, 'rb') as f:
+        data = f.read()
+    return _decompress(data, actual.suffix if actual != Path(path) else "")
+
+
+def read_text(path, encoding='utf-8'):
+    return read_bytes(path).decode(encoding)
+
+
+def remove_compressed(path):
+    """Entfernt komprimierte Fassungen, z.B. nachdem unkomprimiert gespeichert wurde"""
+    path = Path(path)
+    for suffix in CODECS:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            candidate.unlink()
+
+
+def plain_copy(path):
+    """Unkomprimierter Pfad für externe Programme (entpackt bei Bedarf in den Cache)"""
+    path = Path(path)
+    actual = find(path)
+    if actual is None or actual == path:
+        return actual
+    folder = PLAIN_CACHE / hashlib.sha1(str(path.parent).encode("utf-8")).hexdigest()[:16]
+    target = folder / path.name
+    mtime = os.stat(actual).st_mtime_ns
+    if not target.exists() or os.stat(target).st_mtime_ns != mtime:
+        folder.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(read_bytes(path))
+        os.utime(target, ns=(mtime, mtime))
+    return target
+
+
+def compress_file(path, codec):
+    """Komprimiert eine Datei; gibt die eingesparten Bytes zurück"""
+    path = Path(path)
+    st = os.stat(path)
+    data = path.read_bytes()
+    packed = _compress(data, codec)
+    if len(packed) >= len(data):
+        # Lohnt sich nicht (sehr kleine Dateien)
+        return 0
+    target = path.with_name(path.name + SUFFIXES[codec])
+    tmp = target.with_name(target.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(packed)
+    # mtime behalten: Caches und Statistik sehen keine Änderung
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    if _changed(path, st):
+        # Inzwischen gespeichert (z.B. im Editor): die neue Fassung gewinnt
+        tmp.unlink()
+        return 0
+    os.replace(tmp, target)
+    if _changed(path, st):
+        target.unlink()
+        return 0
+    path.unlink()
+    return len(data) - len(packed)
+
+
+def _changed(path, st):
+    """Datei seit st ersetzt, gelöscht oder geändert?"""
+    try:
+        now = os.stat(path)
+    except FileNotFoundError:
+        return True
+    return (now.st_ino, now.st_size, now.st_mtime_ns) != (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def decompress_file(actual):
+    """Entpackt eine komprimierte Datei neben sich; gibt den neuen Pfad zurück"""
+    actual = Path(actual)
+    st = os.stat(actual)
+    plain = actual.with_suffix("")
+    try:
+        plain_st = os.stat(plain)
+    except FileNotFoundError:
+        plain_st = None
+    # Beide Fassungen da (z.B. nach einem Sync): die neuere gewinnt, bei Gleichstand die unkomprimierte
+    if plain_st is not None and plain_st.st_mtime_ns >= st.st_mtime_ns:
+        actual.unlink()
+        return plain
+    tmp = plain.with_name(plain.name + ".tmp")
+    with open(tmp, 'wb') as f:
+        f.write(_decompress(actual.read_bytes(), actual.suffix))
+    os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+    if plain_st is None and plain.exists() or plain_st is not None and _changed(plain, plain_st):
+        # Inzwischen gespeichert: die neue Fassung gewinnt
+        tmp.unlink()
+    else:
+        os.replace(tmp, plain)
+    actual.unlink()
+    return plain
+
+
+def _compress_batch(args):
+    """Ein Auftrag im Pool: (Dateien, Verfahren) → (Anzahl, eingespart)"""
+    paths, codec = args
+    count = saved = 0
+    for path in paths:
+        try:
+            gained = compress_file(path, codec)
+        except OSError as e:
+            print(f"Nicht komprimiert: {path}: {e}")
+            continue
+        if gained:
+            count += 1
+            saved += gained
+    return count, saved
+
+
+def _decompress_batch(paths):
+    count = 0
+    for path in paths:
+        try:
+            decompress_file(path)
+            count += 1
+        except OSError as e:
+            print(f"Nicht entpackt: {path}: {e}")
+    return count
+
+
+def cold_files(diary, older_than_days, skip=None):
+    """Unkomprimierte Dateien aller Tage, die älter als older_than_days sind
+
+    skip(Tagesordner) → True: Tag auslassen (z.B. gerade im Editor offen).
+    """
+    from .dateindex import DateIndex
+
+    cutoff = date.today() - timedelta(days=older_than_days)
+    files = []
+    for entry in DateIndex.open(diary).iter_entries():
+        if entry.date >= cutoff:
+            break
+        day_dir = entry.day_file.parent
+        if skip is not None and skip(day_dir):
+            continue
+        try:
+            names = os.listdir(day_dir)
+        except OSError:
+            continue
+        files.extend(day_dir / name for name in names if is_compressible(name))
+    return files
+
+
+def compressed_files(diary):
+    """Alle Dateien eines Tagebuchs, die der Archivmodus komprimiert hat
+
+    Andere komprimierte Anhänge (z.B. notes.tar.gz) gehören dem Benutzer
+    und bleiben unberührt.
+    """
+    return [path for suffix in CODECS for path in Path(diary).glob(f"*/*/*/*{suffix}")
+            if is_compressible(path.name[:-len(suffix)])]
+
+
+def _run(batches, func, jobs, processes):
+    # Erst hier: jeder Leser importiert dieses Modul, Pools braucht nur der Archivmodus
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    pool = ProcessPoolExecutor if processes and len(batches) > 1 else ThreadPoolExecutor
+    with pool(max_workers=jobs or os.cpu_count() or 2) as executor:
+        return list(executor.map(func, batches))
+
+
+def compress_diary(diary, codec="gzip", older_than_days=60, jobs=None, processes=True, skip=None):
+    """Komprimiert kalte Einträge parallel; gibt (Dateien, eingesparte Bytes) zurück"""
+    if codec not in available_codecs():
+        raise ValueError(f"Verfahren nicht verfügbar: {codec}")
+    with span("Komprimieren", diary=Path(diary).name, codec=codec):
+        files = cold_files(diary, older_than_days, skip)
+        batches = [(files[i:i + 256], codec) for i in range(0, len(files), 256)]
+        results = _run(batches, _compress_batch, jobs, processes)
+    return sum(count for count, _ in results), sum(saved for _, saved in results)
+
+
+def decompress_diary(diary, jobs=None, processes=True):
+    """Entpackt alle komprimierten Dateien; gibt die Anzahl zurück"""
+    with span("Entpacken", diary=Path(diary).name):
+        files = compressed_files(diary)
+        batches = [files[i:i + 256] for i in range(0, len(files), 256)]
+        return sum(_run(batches, _decompress_batch, jobs, processes))
+
+
+def compress_in_background(diaries, settings, skip=None):
+    """Archivmodus aus den Einstellungen: läuft in einem Hintergrund-Thread
+
+    Threads statt Prozesse, weil der Aufruf aus der Qt-Anwendung kommt.
+    skip wie bei cold_files: im Editor offene Tage bleiben unkomprimiert.
+    """
+    import threading
+
+    codec = settings.get("compression")
+    if not codec or codec not in available_codecs():
+        return None
+    older_than = int(settings.get("compress_after_days", 60))
+
+    def run():
+        for diary in diaries:
+            try:
+                count, saved = compress_diary(diary, codec, older_than, processes=False, skip=skip)
+                if count:
+                    print(f"{diary.name}: {count} Dateien komprimiert, {saved // 1024} KB gespart")
+            except Exception as e:
+                print(f"Fehler beim Komprimieren von {diary}: {e}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
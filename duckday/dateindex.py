@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Datumsindex eines Tagebuchs (ISO-Datum → Tagesordner)
+
+Der Index liegt in <Tagebuch>/.tagesgans/dates.json. Beim Öffnen werden
+die Jahres-, Monats- und Tagesordner per stat() geprüft; Tage werden nur
+in Monaten neu eingelesen, deren Ordner sich geändert hat. Die Tagesordner
+gehören dazu, weil ein Day.txt, das in einen schon vorhandenen Tagesordner
+kommt (Sync, Wiederherstellen, Nextcloud) oder dort gelöscht wird, nur
+dessen mtime ändert, nicht die des Monats. Damit ist "öffne 2019-03-14"
+ein Dictionary-Zugriff statt eines Verzeichnislaufs.
+"""
+
+import json
+import os
+from collections import namedtuple
+from datetime import date
+from pathlib import Path
+
+from . import compression
+from .dates import folder_date
+from .trace import span
+
+INDEX_DIR = ".tagesgans"
+
+# Ein Eintrag, chronologisch sortierbar über date
+Entry = namedtuple("Entry", "year month day day_file date")
+
+
+class DateIndex:
+    """Bildet Datumsangaben auf Day.txt Dateien eines Tagebuchs ab"""
+
+    FILE_NAME = "dates.json"
+    VERSION = 2
+
+    def __init__(self, diary):
+        self.diary = Path(diary)
+        self.dates = {}      # date → "Jahr/Monat/Tag" (relativ)
+        self.folders = {}    # "Jahr" bzw. "Jahr/Monat" → st_mtime_ns
+        self.days = {}       # "Jahr/Monat" → neueste st_mtime_ns der Tagesordner
+        self.dirty = False
+
+    @property
+    def path(self):
+        return self.diary / INDEX_DIR / self.FILE_NAME
+
+    @classmethod
+    def open(cls, diary):
+        """Lädt den gespeicherten Index und gleicht ihn mit dem Dateisystem ab"""
+        index = cls(diary)
+        index.load()
+        index.refresh()
+        return index
+
+    def load(self):
+        """Liest dates.json; ein fehlender oder kaputter Index ist leer"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            self.folders = dict(data["folders"])
+            self.days = dict(data["days"])
+            self.dates = {date.fromisoformat(iso): rel for iso, rel in data["dates"].items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Datumsindex wird neu aufgebaut ({self.path}): {e}")
+            self.dates = {}
+            self.folders = {}
+            self.days = {}
+
+    def save(self):
+        """Schreibt den Index, falls er sich geändert hat"""
+        if not self.dirty:
+            return
+        data = {
+            "version": self.VERSION,
+            "folders": self.folders,
+            "days": self.days,
+            "dates": {day.isoformat(): rel for day, rel in sorted(self.dates.items())},
+        }
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            tmp = self.path.with_name(self.FILE_NAME + ".tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            # z.B. schreibgeschützte Tagebücher: Index bleibt im Speicher
+            print(f"Datumsindex nicht gespeichert: {e}")
+
+    def refresh(self):
+        """Gleicht den Index mit den Ordnern ab; gibt True bei Änderungen zurück"""
+        with span("Datumsindex prüfen", diary=self.diary.name):
+            changed = self._refresh()
+        if changed:
+            self.dirty = True
+            self.save()
+        return changed
+
+    def _refresh(self):
+        changed = False
+        seen = set()
+
+        for year_entry in _subdirs(self.diary):
+            if not year_entry.name.isdigit():
+                continue
+            year = year_entry.name
+            seen.add(year)
+            year_mtime = year_entry.stat().st_mtime_ns
+            if self.folders.get(year) == year_mtime:
+                # Monatsordner unverändert: bekannte Monate prüfen
+                months = [key.split("/", 1)[1] for key in self.folders if key.startswith(year + "/")]
+            else:
+                months = [entry.name for entry in _subdirs(year_entry)]
+                self.folders[year] = year_mtime
+                changed = True
+
+            for month in months:
+                key = f"{year}/{month}"
+                try:
+                    month_mtime = os.stat(self.diary / key).st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(key)
+                day_mtime = _newest_subdir(self.diary / key)
+                if self.folders.get(key) != month_mtime or self.days.get(key) != day_mtime:
+                    self._scan_month(year, month)
+                    self.folders[key] = month_mtime
+                    self.days[key] = day_mtime
+                    changed = True
+
+        # Verschwundene Jahre/Monate entfernen
+        for key in [key for key in self.folders if key not in seen]:
+            del self.folders[key]
+            self.days.pop(key, None)
+            self._drop_prefix(key + "/")
+            changed = True
+        return changed
+
+    def _scan_month(self, year, month):
+        """Liest die Tage eines Monatsordners neu ein"""
+        prefix = f"{year}/{month}/"
+        self._drop_prefix(prefix)
+        for day_entry in _subdirs(self.diary / year / month):
+            day = folder_date(year, month, day_entry.name)
+            if day is None or not compression.exists(os.path.join(day_entry.path, "Day.txt")):
+                continue
+            existing = self.dates.get(day)
+            # Während einer Migration kann ein Tag doppelt liegen:
+            # numerische Ordner haben Vorrang
+            if existing and existing.split("/")[1].isdigit() and not month.isdigit():
+                continue
+            self.dates[day] = prefix + day_entry.name
+
+    def _drop_prefix(self, prefix):
+        for day in [day for day, rel in self.dates.items() if rel.startswith(prefix)]:
+            del self.dates[day]
+
+    def lookup(self, day):
+        """Day.txt für ein Datum oder None (O(1))"""
+        rel = self.dates.get(day)
+        if rel is None:
+            return None
+        day_file = self.diary / rel / "Day.txt"
+        if not compression.exists(day_file):
+            del self.dates[day]
+            self.dirty = True
+            return None
+        return day_file
+
+    def add(self, day, day_file):
+        """Trägt einen gespeicherten Tag ein (z.B. nach save_entry)"""
+        rel = Path(day_file).parent.relative_to(self.diary).as_posix()
+        year, month, _ = rel.split("/")
+        self.dates[day] = rel
+        # Ordner sind jetzt bekannt, beim nächsten Abgleich nicht neu lesen
+        for key in (year, f"{year}/{month}"):
+            try:
+                self.folders[key] = os.stat(self.diary / key).st_mtime_ns
+            except OSError:
+                pass
+        self.days[f"{year}/{month}"] = _newest_subdir(self.diary / year / month)
+        self.dirty = True
+        self.save()
+
+    def entries(self):
+        """Alle Einträge chronologisch sortiert"""
+        return list(self.iter_entries())
+
+    def iter_entries(self, newest_first=False):
+        """Einträge nacheinander; Entry-Objekte entstehen erst beim Abholen"""
+        for day in sorted(self.dates, reverse=newest_first):
+            rel = self.dates.get(day)
+            if rel is None:
+                continue
+            year, month, day_name = rel.split("/")
+            yield Entry(year, month, day_name, self.diary / rel / "Day.txt", day)
+
+    def __len__(self):
+        return len(self.dates)
+
+
+def _subdirs(path):
+    """Unterordner (ohne versteckte) als os.DirEntry"""
+    try:
+        with os.scandir(path) as it:
+            return [entry for entry in it if entry.is_dir() and not entry.name.startswith(".")]
+    except OSError:
+        return []
+
+
+def _newest_subdir(path):
+    """Neueste mtime der Unterordner (0 ohne Unterordner)"""
+    newest = 0
+    for entry in _subdirs(path):
+        try:
+            newest = max(newest, entry.stat().st_mtime_ns)
+        except OSError:
+            pass
+    return newest
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Datumsangaben aus Ordnernamen
+
+Ältere Tagebücher benennen Monatsordner mit strftime("%B"), also je nach
+Locale "February" oder "Februar". Neue Einträge landen in numerischen
+Ordnern (Jahr/MM/TT). Beide Varianten werden hier auf ein date abgebildet.
+"""
+
+import calendar
+from datetime import date
+from pathlib import Path
+
+MONTHS_DE = ["Januar", "Februar", "März", "April", "Mai", "Juni", "Juli",
+             "August", "September", "Oktober", "November", "Dezember"]
+MONTHS_EN = ["January", "February", "March", "April", "May", "June", "July",
+             "August", "September", "October", "November", "December"]
+
+_MONTH_NUMBERS = {}
+for _names in (MONTHS_DE, MONTHS_EN):
+    for _number, _name in enumerate(_names, 1):
+        _MONTH_NUMBERS[_name.lower()] = _number
+_MONTH_NUMBERS.update({"jänner": 1, "maerz": 3, "marz": 3})
+
+
+def month_number(name):
+    """Monatsnummer aus einem Ordnernamen ("03", "3", "März", "March")"""
+    if name.isdigit():
+        number = int(name)
+        return number if 1 <= number <= 12 else None
+    key = name.strip().lower()
+    if key in _MONTH_NUMBERS:
+        return _MONTH_NUMBERS[key]
+    # Monatsnamen der aktuellen Locale (z.B. "février")
+    for number in range(1, 13):
+        if calendar.month_name[number].lower() == key:
+            return number
+    return None
+
+
+def folder_date(year_name, month_name, day_name):
+    """date aus Jahr/Monat/Tag Ordnernamen oder None"""
+    month = month_number(month_name)
+    if not (year_name.isdigit() and day_name.isdigit() and month):
+        return None
+    try:
+        return date(int(year_name), month, int(day_name))
+    except ValueError:
+        return None
+
+
+def parse_iso(text):
+    """date aus "2019-03-14" (auch "14.03.2019")"""
+    text = text.strip()
+    try:
+        if "." in text:
+            day, month, year = text.split(".")
+            return date(int(year), int(month), int(day))
+        return date.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+def day_folder(diary, day):
+    """Kanonischer Ordner eines Tages: Jahr/MM/TT"""
+    return Path(diary) / f"{day.year:04d}" / f"{day.month:02d}" / f"{day.day:02d}"
+
+
+def month_label(month, language="Deutsch"):
+    """Anzeigename eines Monats"""
+    names = MONTHS_EN if language == "English" else MONTHS_DE
+    return names[month - 1]
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Suche nach .duckday Tagebüchern und Auflistung ihrer Einträge
+"""
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from . import compression
+from .dateindex import DateIndex
+from .dates import folder_date
+from .markup import parse
+from .quickindex import QuickIndex
+from .stats import StatsTable
+from .trace import span, traced
+
+# Zerlegte Einträge im Speicher (Vorabladen, Blättern, mehrere Fenster)
+PARSED_CACHE_SIZE = 64
+
+
+class DiaryCache:
+    """Gemeinsamer Cache für Tagebücher und Einträge
+
+    Der Scan des Home-Verzeichnisses und das Durchlaufen der
+    Jahr/Monat/Tag Ordner passieren nur einmal pro Prozess. Reader und
+    Editor teilen sich eine Instanz, wenn sie aus tagesgans.py gestartet
+    werden.
+    """
+
+    def __init__(self, root=None):
+        self.root = Path(root) if root else Path.home()
+        self._diaries = None
+        self._entries = {}
+        self._indexes = {}
+        self._stats = {}
+        self._quick = None   # (Tagebücher, Versionen, QuickIndex)
+        self._positions = {}
+        self._open_days = {}  # Editorfenster → Tagesordner, der dort bearbeitet wird
+        # parsed() wird auch aus Worker-Threads aufgerufen
+        self._parsed = OrderedDict()
+        self._parsed_lock = threading.Lock()
+
+    def diaries(self, refresh=False):
+        """Gibt alle .duckday Ordner unter root zurück"""
+        if self._diaries is None or refresh:
+            with span("Tagebücher suchen", root=self.root):
+                self._diaries = sorted(
+                    d for d in self.root.rglob("*.duckday") if d.is_dir()
+                )
+        return list(self._diaries)
+
+    def add_diary(self, diary):
+        """Trägt ein neu erstelltes Tagebuch ein, ohne neu zu scannen"""
+        diary = Path(diary)
+        if self._diaries is not None and diary not in self._diaries:
+            self._diaries.append(diary)
+            self._diaries.sort()
+        self._entries.pop(diary, None)
+
+    def entries(self, diary, refresh=False):
+        """Gibt Entry(Jahr, Monat, Tag, Day.txt, Datum) chronologisch zurück"""
+        diary = Path(diary)
+        if diary not in self._entries or refresh:
+            self._entries[diary] = self._scan_entries(diary)
+            self._positions.pop(diary, None)
+        return list(self._entries[diary])
+
+    def date_index(self, diary):
+        """Datumsindex eines Tagebuchs (einmal geöffnet, danach im Speicher)"""
+        diary = Path(diary)
+        index = self._indexes.get(diary)
+        if index is None:
+            index = self._indexes[diary] = DateIndex.open(diary)
+        return index
+
+    def stats(self, diary):
+        """Statistik pro Tag (für die Jahresübersicht)"""
+        diary = Path(diary)
+        table = self._stats.get(diary)
+        if table is None:
+            table = self._stats[diary] = StatsTable.open(diary, self.date_index(diary))
+        return table
+
+    def quick_index(self, diaries):
+        """Schnellsuche über diese Tagebücher; neu gebaut, wenn sich etwas geändert hat"""
+        diaries = tuple(Path(diary) for diary in diaries)
+        versions = tuple(self.stats(diary).version for diary in diaries)
+        if self._quick is None or self._quick[:2] != (diaries, versions):
+            self._quick = (diaries, versions, QuickIndex(self, diaries))
+        return self._quick[2]
+
+    def lookup(self, diary, day):
+        """Day.txt eines Datums oder None"""
+        return self.date_index(diary).lookup(day)
+
+    def set_open_day(self, owner, day_dir):
+        """Merkt sich den Tag, den ein Editor gerade bearbeitet (None: keiner)"""
+        if day_dir is None:
+            self._open_days.pop(owner, None)
+        else:
+            self._open_days[owner] = Path(day_dir)
+
+    def day_is_open(self, day_dir):
+        """Wird der Tagesordner gerade bearbeitet? (auch aus Hintergrund-Threads)"""
+        return Path(day_dir) in list(self._open_days.values())
+
+    def entry_saved(self, diary, day, day_file):
+        """Trägt einen gespeicherten Tag in Index und Liste ein"""
+        diary = Path(diary)
+        day_file = Path(day_file)
+        if day is not None:
+            self.date_index(diary).add(day, day_file)
+        else:
+            # Bestehender Eintrag: Datum steht im Pfad (Jahr/Monat/Tag)
+            parts = day_file.parent.relative_to(diary).parts
+            day = folder_date(*parts) if len(parts) == 3 else None
+        if day is not None and diary in self._stats:
+            self._stats[diary].update(day, day_file, self.parsed(day_file))
+        self.invalidate(diary)
+
+    def apply_changes(self, diary, changed, removed):
+        """Überträgt von außen geänderte Einträge in die Statistik"""
+        table = self._stats.get(Path(diary))
+        if table is None:
+            return
+        updates = []
+        for entry in changed:
+            try:
+                updates.append((entry.date, entry.day_file, self.parsed(entry.day_file)))
+            except OSError:
+                continue
+        table.apply(updates, [entry.date for entry in removed])
+
+    def neighbours(self, day_file):
+        """Gibt (vorheriger, nächster) Eintrag zu einer Day.txt zurück"""
+        day_file = Path(day_file)
+        # .duckday / Jahr / Monat / Tag / Day.txt
+        if len(day_file.parents) < 4:
+            return None, None
+        diary = day_file.parents[3]
+        entries = self.entries(diary)
+        positions = self._positions.get(diary)
+        if positions is None or len(positions) != len(entries):
+            positions = {entry.day_file: i for i, entry in enumerate(entries)}
+            self._positions[diary] = positions
+
+        index = positions.get(day_file)
+        if index is None:
+            return None, None
+        previous = entries[index - 1].day_file if index > 0 else None
+        following = entries[index + 1].day_file if index + 1 < len(entries) else None
+        return previous, following
+
+    def parsed(self, day_file):
+        """Liest und zerlegt eine Day.txt, zwischengespeichert nach mtime
+
+        Solange sich die Datei nicht ändert, bekommen alle Aufrufer dasselbe
+        ParsedEntry-Objekt.
+        """
+        day_file = Path(day_file)
+        mtime = compression.stat(day_file).st_mtime_ns
+        with self._parsed_lock:
+            cached = self._parsed.get(day_file)
+            if cached and cached[0] == mtime:
+                self._parsed.move_to_end(day_file)
+                return cached[1]
+
+        with span("Datei lesen", file=day_file):
+            content = compression.read_text(day_file)
+        with span("Parsen"):
+            entry = parse(content)
+
+        with self._parsed_lock:
+            self._parsed[day_file] = (mtime, entry)
+            self._parsed.move_to_end(day_file)
+            while len(self._parsed) > PARSED_CACHE_SIZE:
+                self._parsed.popitem(last=False)
+        return entry
+
+    def invalidate(self, diary=None):
+        """Verwirft den Cache für ein Tagebuch oder komplett"""
+        if diary is None:
+            self._diaries = None
+            self._entries.clear()
+            self._positions.clear()
+        else:
+            self._entries.pop(Path(diary), None)
+            self._positions.pop(Path(diary), None)
+
+    @traced("Einträge auflisten")
+    def _scan_entries(self, diary):
+        """Einträge aus dem Datumsindex (prüft nur geänderte Monatsordner)"""
+        index = self._indexes.get(diary)
+        if index is None:
+            index = self._indexes[diary] = DateIndex.open(diary)
+        else:
+            index.refresh()
+        return index.entries()
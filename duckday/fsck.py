@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Prüft ein Tagebuch auf Fehler
+
+    python3 -m duckday.fsck ~/Privat.duckday [--jobs 8] [--threads]
+
+Gefunden werden fehlende <Medien>, @Personen ohne .vcard, %Orte ohne
+.kml, ungültige §Zeitstempel, Day.txt die kein UTF-8 sind, Ordner die kein Datum ergeben und
+Tage, die doppelt vorkommen, sowie Konflikt-Kopien aus duckday.sync. Die Tagesordner werden in Paketen auf
+mehrere Prozesse (bzw. Threads) verteilt; Medien werden nur per stat()
+geprüft, nie gelesen, daher hängt die Dauer kaum von der Größe der
+Bilder und Videos ab.
+"""
+
+import argparse
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from . import compression
+from .dates import folder_date, month_number
+from .markup import parse_format, timestamp_valid, tokenize
+from .sync import is_conflict_copy
+from .trace import span
+
+# path: betroffene Datei/Ordner, line: Zeilennummer (1-basiert) oder None
+Problem = namedtuple("Problem", "path line kind message")
+
+# Tagesordner pro Auftrag an den Pool
+BATCH_SIZE = 64
+
+# Endungen der Anhänge zu @Person und %Ort
+ATTACHMENTS = {"person": ".vcard", "place": ".kml"}
+
+
+def check_day(day_dir):
+    """Prüft einen Tagesordner; gibt eine Liste von Problem zurück"""
+    day_dir = Path(day_dir)
+    day_file = day_dir / "Day.txt"
+    try:
+        data = compression.read_bytes(day_file)
+    except FileNotFoundError:
+        return [Problem(day_dir, None, "fehlt", "Ordner ohne Day.txt")]
+    except OSError as e:
+        return [Problem(day_file, None, "lesen", f"nicht lesbar: {e}")]
+
+    problems = []
+    try:
+        content = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        line = data.count(b"\n", 0, e.start) + 1
+        problems.append(Problem(day_file, line, "kodierung", f"kein UTF-8 ({e.reason} bei Byte {e.start})"))
+        # Trotzdem die Verweise prüfen
+        content = data.decode("utf-8", errors="replace")
+
+    # Nur einmal pro Ordner auflisten statt pro Verweis zu prüfen
+    try:
+        files = set(os.listdir(day_dir))
+    except OSError:
+        files = set()
+    for name in sorted(files):
+        if is_conflict_copy(name):
+            problems.append(Problem(day_dir / name, None, "konflikt", "ältere Fassung aus einem Abgleich, bitte zusammenführen"))
+    current_format = None
+
+    for number, line in enumerate(content.split("\n"), 1):
+        if not line.strip():
+            continue
+        line_format, end = parse_format(line)
+        if line_format:
+            current_format = line_format
+            line = line[end:]
+        if not current_format:
+            # Ohne Format zeigt der Reader die Zeile als Text: kein Markup
+            continue
+        for kind, value in tokenize(line):
+            if kind == "media":
+                if value not in files and not (day_dir / value).exists():
+                    problems.append(Problem(day_file, number, "medien", f"<{value}> fehlt"))
+            elif kind == "time":
+                if not timestamp_valid(value):
+                    problems.append(Problem(day_file, number, "zeit", f"§{value}: kein gültiger Zeitstempel"))
+            elif kind in ATTACHMENTS:
+                name = value + ATTACHMENTS[kind]
+                if name not in files and not any(name + suffix in files for suffix in compression.CODECS):
+                    symbol = "@" if kind == "person" else "%"
+                    problems.append(Problem(day_file, number, kind, f"{symbol}{value}: {name} fehlt"))
+    return problems
+
+
+def check_days(day_dirs):
+    """Ein Auftrag im Pool: mehrere Tagesordner"""
+    problems = []
+    for day_dir in day_dirs:
+        problems.extend(check_day(day_dir))
+    return problems
+
+
+def check_structure(diary):
+    """Ordnerstruktur: Jahr/Monat/Tag; gibt (Tagesordner, Probleme) zurück"""
+    diary = Path(diary)
+    day_dirs = []
+    problems = []
+    seen = {}
+
+    for year_dir in sorted(diary.iterdir()):
+        if year_dir.name.startswith(".") or not year_dir.is_dir():
+            continue
+        if not year_dir.name.isdigit():
+            problems.append(Problem(year_dir, None, "ordner", "Jahresordner ist keine Zahl"))
+            continue
+        for month_dir in sorted(p for p in year_dir.iterdir() if p.is_dir()):
+            if month_number(month_dir.name) is None:
+                problems.append(Problem(month_dir, None, "ordner", "unbekannter Monat"))
+                continue
+            for day_dir in sorted(p for p in month_dir.iterdir() if p.is_dir()):
+                day = folder_date(year_dir.name, month_dir.name, day_dir.name)
+                if day is None:
+                    problems.append(Problem(day_dir, None, "ordner", "kein gültiges Datum"))
+                    continue
+                if day in seen:
+                    problems.append(Problem(day_dir, None, "doppelt",
+                                            f"{day:%d.%m.%Y} auch in {seen[day]}"))
+                seen[day] = day_dir
+                day_dirs.append(day_dir)
+    return day_dirs, problems
+
+
+def check_diary(diary, jobs=None, processes=True, progress=None):
+    """Prüft ein ganzes Tagebuch parallel; Probleme sortiert nach Pfad/Zeile
+
+    processes=False nimmt Threads (z.B. aus der GUI heraus).
+    progress(erledigt, gesamt) wird nach jedem Paket aufgerufen.
+    """
+    diary = Path(diary)
+    with span("Tagebuch prüfen", diary=diary.name):
+        day_dirs, problems = check_structure(diary)
+        batches = [day_dirs[i:i + BATCH_SIZE] for i in range(0, len(day_dirs), BATCH_SIZE)]
+        jobs = jobs or os.cpu_count() or 2
+        pool = ProcessPoolExecutor if processes and len(batches) > 1 else ThreadPoolExecutor
+        done = 0
+        with pool(max_workers=jobs) as executor:
+            for batch, found in zip(batches, executor.map(check_days, batches)):
+                problems.extend(found)
+                done += len(batch)
+                if progress:
+                    progress(done, len(day_dirs))
+
+    problems.sort(key=lambda p: (str(p.path), p.line or 0))
+    return problems
+
+
+def format_problem(problem, diary=None):
+    """path:Zeile: Meldung (Pfad relativ zum Tagebuch)"""
+    path = problem.path
+    if diary is not None:
+        try:
+            path = path.relative_to(diary)
+        except ValueError:
+            pass
+    location = f"{path}:{problem.line}" if problem.line else f"{path}"
+    return f"{location}: {problem.message}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prüft ein .duckday Tagebuch")
+    parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl paralleler Prüfer")
+    parser.add_argument("--threads", action="store_true", help="Threads statt Prozesse")
+    args = parser.parse_args(argv)
+
+    diary = Path(args.diary).expanduser()
+    if not diary.is_dir():
+        print(f"Kein Tagebuch gefunden: {diary}")
+        return 2
+
+    problems = check_diary(diary, args.jobs, not args.threads)
+    for problem in problems:
+        print(format_problem(problem, diary))
+    print(f"{len(problems)} Problem(e) gefunden." if problems else "Keine Probleme gefunden.")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Parser für das Tagesgans-Markup (ohne Qt)
+
+    {20|FKud|Rot}   Format am Zeilenanfang (Größe|FKUD|Farbe)
+    @Person         vCard im Tagesordner
+    %Ort            KML im Tagesordner
+    'Text'          Easy Copy
+    §2026.02.14.10.30  Zeitstempel
+    =Label          Label
+    <Datei>         Medien im Tagesordner
+    https://...     Links
+
+Der Parser liefert dieselbe Zerlegung, die der Reader beim Anzeigen
+verwendet, und läuft auch in Worker-Threads.
+"""
+
+import re
+from collections import namedtuple
+from datetime import date
+
+from . import compression
+
+FORMAT_RE = re.compile(r'\{(\d+)\|([FfKkUuDd]{4})\|([^}]+)\}')
+
+# Reihenfolge = Priorität, wie bisher in insert_formatted_line
+TOKEN_RE = re.compile(
+    r"@(?P<person>\w+)"
+    r"|%(?P<place>\w+)"
+    r"|'(?P<copy>[^']+)'"
+    r"|§(?P<time>[\d.]+)"
+    r"|=(?P<label>\w+)"
+    r"|<(?P<media>[^>]+)>"
+    r"|(?P<url>https?://[^\s]+)"
+)
+
+TOKEN_KINDS = ("person", "place", "copy", "time", "label", "media", "url")
+
+# Darstellung in Reader und HTML-Export: (Zeichen vor dem Wert, Farbe, Hintergrund)
+TOKEN_DISPLAY = {
+    "person": ("👤 ", "#0066cc", None),
+    "place": ("📍 ", "#28a745", None),
+    "copy": ("📋 ", None, "#ffffcc"),
+    "time": ("🕒 ", "#6f42c1", None),
+    "label": ("🏷️ #", "#fd7e14", None),
+    "url": ("🔗 ", "#0066cc", None),
+}
+
+# Farben aus dem Format-Dialog → Farbnamen für Qt und CSS
+COLOR_NAMES = {
+    "Schwarz": "black", "Rot": "red", "Grün": "green", "Blau": "blue", "Gelb": "gold",
+    "Orange": "orange", "Lila": "purple", "Grau": "gray", "Weiß": "white",
+}
+
+# kind: "text" oder einer aus TOKEN_KINDS; value: Text bzw. Name/Datei/URL
+Token = namedtuple("Token", "kind value")
+
+# Schrift einer formatierten Zeile, unabhängig von Qt und HTML
+Style = namedtuple("Style", "size bold italic underline strike color")
+
+# format: (Größe, Stil, Farbe) oder None (Zeile wird unformatiert übernommen)
+# blank: Leerzeile
+Line = namedtuple("Line", "format tokens blank")
+
+
+class ParsedEntry:
+    """Zerlegter Inhalt einer Day.txt"""
+
+    __slots__ = ("lines", "labels", "timestamps", "people", "places", "media", "words")
+
+    def __init__(self):
+        self.lines = []
+        self.labels = []       # eindeutig, in Reihenfolge des Auftretens
+        self.timestamps = []   # alle Vorkommen
+        self.people = []       # eindeutig
+        self.places = []       # eindeutig
+        self.media = []        # eindeutig
+        self.words = 0
+
+
+def parse_format(text):
+    """Liest ein {Größe|FKUD|Farbe} Format am Anfang von text
+
+    Gibt ((Größe, Stil, Farbe), Länge) oder (None, 0) zurück.
+    """
+    match = FORMAT_RE.match(text)
+    if not match:
+        return None, 0
+    return (int(match.group(1)), match.group(2), match.group(3)), match.end()
+
+
+def color_value(name):
+    """Farbe eines Formats für Qt/CSS ("Rot" → "red"; "#ff0000" bleibt)"""
+    return COLOR_NAMES.get(name, name)
+
+
+def format_style(line_format):
+    """Style zu (Größe, FKUD, Farbe); gemeinsam für Reader und HTML-Export"""
+    size, style, color = line_format
+    return Style(size, 'F' in style, 'K' in style, 'U' in style, 'D' in style, color_value(color))
+
+
+def token_display(kind, value):
+    """(angezeigter Text, Farbe, Hintergrund) eines Markup-Tokens außer text/media"""
+    prefix, color, background = TOKEN_DISPLAY[kind]
+    return prefix + value, color, background
+
+
+def timestamp_valid(value):
+    """§Jahr.Monat.Tag oder §Jahr.Monat.Tag.Stunde.Minute mit gültigen Werten
+
+    Ein Punkt am Ende (Satzende) wird ignoriert.
+    """
+    parts = value.rstrip(".").split(".")
+    if len(parts) not in (3, 5) or not all(part.isdigit() for part in parts):
+        return False
+    numbers = [int(part) for part in parts]
+    try:
+        date(*numbers[:3])
+    except ValueError:
+        return False
+    return len(numbers) == 3 or (numbers[3] < 24 and numbers[4] < 60)
+
+
+def tokenize(line):
+    """Zerlegt eine Zeile in Text- und Markup-Tokens"""
+    tokens = []
+    pos = 0
+    for match in TOKEN_RE.finditer(line):
+        if match.start() > pos:
+            tokens.append(Token("text", line[pos:match.start()]))
+        kind = match.lastgroup
+        tokens.append(Token(kind, match.group(kind)))
+        pos = match.end()
+    if pos < len(line):
+        tokens.append(Token("text", line[pos:]))
+    return tokens
+
+
+def parse(content, current_format=None):
+    """Zerlegt den Inhalt einer Day.txt
+
+    current_format: gültiges Format vor der ersten Zeile, wenn nur ein
+    Ausschnitt zerlegt wird (Vorschau im Editor).
+    """
+    entry = ParsedEntry()
+    seen = {kind: set() for kind in ("label", "person", "place", "media")}
+    targets = {"label": entry.labels, "person": entry.people,
+               "place": entry.places, "media": entry.media}
+
+    for line in content.split('\n'):
+        if not line.strip():
+            entry.lines.append(Line(current_format, [], True))
+            continue
+
+        line_format, end = parse_format(line)
+        if line_format:
+            current_format = line_format
+            line = line[end:]
+
+        entry.words += len(line.split())
+
+        # Ohne Format wird die Zeile unverändert angezeigt
+        if not current_format:
+            entry.lines.append(Line(None, [Token("text", line)], False))
+            continue
+
+        tokens = tokenize(line)
+        for token in tokens:
+            if token.kind == "time":
+                entry.timestamps.append(token.value)
+            elif token.kind in targets and token.value not in seen[token.kind]:
+                seen[token.kind].add(token.value)
+                targets[token.kind].append(token.value)
+        entry.lines.append(Line(current_format, tokens, False))
+
+    return entry
+
+
+def parse_file(day_file):
+    """Liest und zerlegt eine Day.txt"""
+    return parse(compression.read_text(day_file))
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Migration alter Monatsordner ("March", "Februar") nach Jahr/MM/TT
+
+    python3 -m duckday.migrate ~/Privat.duckday --dry-run
+    python3 -m duckday.migrate ~/Privat.duckday
+
+Jeder Schritt ist ein einzelnes os.rename innerhalb des Tagebuchs. Wird
+die Migration unterbrochen, plant ein erneuter Aufruf nur die restlichen
+Schritte. Alle erledigten Umbenennungen stehen in .tagesgans/migration.log.
+Der Reader liest alte und neue Ordner gleichzeitig, eine halb migrierte
+Tagebuch-Struktur ist also jederzeit lesbar.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from .dateindex import INDEX_DIR, DateIndex
+from .dates import month_number
+
+LOG_NAME = "migration.log"
+
+
+class MigrationPlan:
+    """Geplante Umbenennungen und gefundene Probleme"""
+
+    def __init__(self):
+        self.moves = []      # (alt, neu) relativ zum Tagebuch
+        self.cleanup = []    # leere alte Monatsordner
+        self.problems = []   # (Pfad, Meldung)
+
+    def __bool__(self):
+        return bool(self.moves or self.cleanup)
+
+
+def plan_migration(diary):
+    """Ermittelt alle noch nötigen Schritte für ein Tagebuch"""
+    diary = Path(diary)
+    plan = MigrationPlan()
+
+    for year_dir in sorted(p for p in diary.iterdir() if p.is_dir() and p.name.isdigit()):
+        for month_dir in sorted(p for p in year_dir.iterdir() if p.is_dir()):
+            number = month_number(month_dir.name)
+            if number is None:
+                plan.problems.append((month_dir, "unbekannter Monatsname"))
+                continue
+            target_month = year_dir / f"{number:02d}"
+
+            if month_dir != target_month and not target_month.exists():
+                # Ganzer Monat auf einmal, danach Tage auf zwei Stellen
+                plan.moves.append((month_dir, target_month))
+                names = {p.name for p in month_dir.iterdir()}
+                for day_dir in sorted(p for p in month_dir.iterdir() if p.is_dir() and p.name.isdigit()):
+                    padded = f"{int(day_dir.name):02d}"
+                    if padded == day_dir.name:
+                        continue
+                    if padded in names:
+                        plan.problems.append((day_dir, f"Ziel existiert bereits: {target_month / padded}"))
+                        continue
+                    plan.moves.append((target_month / day_dir.name, target_month / padded))
+                continue
+
+            # Zielmonat existiert (teilweise migriert) oder ist schon numerisch:
+            # Tage einzeln verschieben bzw. auf zwei Stellen bringen
+            remaining = False
+            for day_dir in sorted(p for p in month_dir.iterdir() if p.is_dir()):
+                if not day_dir.name.isdigit():
+                    plan.problems.append((day_dir, "Tagesordner ist keine Zahl"))
+                    remaining = True
+                    continue
+                target_day = target_month / f"{int(day_dir.name):02d}"
+                if day_dir == target_day:
+                    continue
+                if target_day.exists():
+                    plan.problems.append((day_dir, f"Ziel existiert bereits: {target_day}"))
+                    remaining = True
+                    continue
+                plan.moves.append((day_dir, target_day))
+
+            has_files = any(p.is_file() for p in month_dir.iterdir())
+            if month_dir != target_month and not remaining and not has_files:
+                plan.cleanup.append(month_dir)
+
+    return plan
+
+
+def migrate_diary(diary, dry_run=False, out=None):
+    """Führt die Migration aus; gibt den Plan zurück"""
+    out = out or sys.stdout
+    diary = Path(diary)
+    plan = plan_migration(diary)
+
+    for src, dst in plan.moves:
+        print(f"{'[Probe] ' if dry_run else ''}{src.relative_to(diary)} → {dst.relative_to(diary)}", file=out)
+    for path, message in plan.problems:
+        print(f"Übersprungen: {path.relative_to(diary)} ({message})", file=out)
+
+    if dry_run or not plan:
+        return plan
+
+    log_path = diary / INDEX_DIR / LOG_NAME
+    log_path.parent.mkdir(exist_ok=True)
+    with open(log_path, 'a', encoding='utf-8') as log:
+        log.write(f"# {datetime.now().isoformat(timespec='seconds')}\n")
+        for src, dst in plan.moves:
+            # Nie überschreiben, auch wenn sich der Ordner seit der Planung geändert hat
+            if dst.exists():
+                print(f"Übersprungen: {dst.relative_to(diary)} existiert inzwischen", file=out)
+                continue
+            if not src.exists():
+                # Monat wurde oben nicht verschoben: seine Tage bleiben für den nächsten Lauf
+                print(f"Übersprungen: {src.relative_to(diary)} fehlt", file=out)
+                continue
+            os.rename(src, dst)
+            log.write(f"{src.relative_to(diary).as_posix()} -> {dst.relative_to(diary).as_posix()}\n")
+            log.flush()
+        for month_dir in plan.cleanup:
+            try:
+                month_dir.rmdir()
+            except OSError:
+                pass
+
+    # Index an die neuen Ordner anpassen
+    DateIndex.open(diary)
+    return plan
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migriert ein Tagebuch nach Jahr/MM/TT")
+    parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    parser.add_argument("--dry-run", action="store_true", help="nur anzeigen, nichts ändern")
+    args = parser.parse_args(argv)
+
+    diary = Path(args.diary).expanduser()
+    if not diary.is_dir():
+        print(f"Kein Tagebuch gefunden: {diary}")
+        return 1
+
+    plan = migrate_diary(diary, args.dry_run)
+    if not plan:
+        print("Nichts zu tun.")
+    return 1 if plan.problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Gepacktes Tagebuch: ein ganzes Tagebuch (oder einzelne Jahre) in einer Datei
+
+    python3 -m duckday.pack pack ~/Privat.duckday [--year 2019] [-o Privat-2019.duckpack]
+    python3 -m duckday.pack unpack Privat-2019.duckpack ~/Privat.duckday
+    python3 -m duckday.pack list Privat-2019.duckpack
+
+Aufbau: Kopf (MAGIC, Version), danach alle Dateien unverändert
+hintereinander, am Ende ein zentrales Verzeichnis (JSON) und ein
+Abschluss mit dessen Lage. Geöffnet wird per mmap; ein Eintrag oder
+Anhang ist damit ein Slice, ohne die Datei zu durchlaufen. Kopieren und
+Synchronisieren betreffen nur noch eine Datei statt zehntausender.
+
+Ein Paket ist nur zum Lesen gedacht; geändert wird im Ordner (unpack).
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path, PurePosixPath
+
+from . import compression
+from .dateindex import INDEX_DIR, DateIndex, Entry
+from .dates import folder_date
+from .markup import parse
+from .trace import span
+
+SUFFIX = ".duckpack"
+MAGIC = b"DUCKPACK"
+VERSION = 1
+
+# Kopf: MAGIC, Version, reserviert
+HEADER = struct.Struct("<8sH6x")
+# Abschluss: Lage und Länge des Verzeichnisses, MAGIC
+TRAILER = struct.Struct("<QQ8s")
+
+# Entpackte Anhänge für die Anzeige und externe Programme
+EXTRACT_CACHE = Path.home() / ".cache" / "tagesgans" / "packs"
+
+
+class PackError(Exception):
+    """Datei ist kein (gültiges) Tagebuch-Paket"""
+
+
+class PackedDiary:
+    """Ein geöffnetes Paket, nur lesend
+
+    files: relativer Pfad ("2019/March/14/Day.txt") → (Lage, Größe, mtime_ns)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.name = self.path.stem
+        self.files = {}
+        self._entries = []
+        self._by_date = {}
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Leere Datei
+            self._file.close()
+            raise PackError(f"Leere Datei: {self.path}")
+        try:
+            self._load_index()
+        except PackError:
+            self.close()
+            raise
+
+    def _load_index(self):
+        data = self._map
+        if len(data) < HEADER.size + TRAILER.size:
+            raise PackError(f"Zu kurz für ein Paket: {self.path}")
+        magic, version = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise PackError(f"Kein Tagebuch-Paket: {self.path}")
+        if version != VERSION:
+            raise PackError(f"Unbekannte Paket-Version {version}: {self.path}")
+        offset, length, magic = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+        if magic != MAGIC or offset + length > len(data) - TRAILER.size:
+            raise PackError(f"Paket unvollständig: {self.path}")
+        try:
+            index = json.loads(bytes(data[offset:offset + length]).decode("utf-8"))
+        except ValueError as e:
+            raise PackError(f"Verzeichnis nicht lesbar: {self.path}: {e}")
+        self.name = index.get("diary", self.name)
+        self.files = {rel: tuple(info) for rel, info in index["files"].items()}
+
+        # Einträge einmal aus dem Verzeichnis: lookup ist dann ein Wörterbuchzugriff
+        entries = []
+        for rel in self.files:
+            parts = rel.split("/")
+            if len(parts) != 4 or parts[3] != "Day.txt":
+                continue
+            day = folder_date(*parts[:3])
+            if day is not None:
+                entries.append((day, parts, rel))
+        entries.sort()
+        self._entries = [Entry(*parts[:3], PurePosixPath(rel), day) for day, parts, rel in entries]
+        for entry in self._entries:
+            self._by_date.setdefault(entry.date, entry.day_file)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, rel):
+        return str(rel) in self.files
+
+    def __len__(self):
+        return len(self.files)
+
+    def read_bytes(self, rel):
+        """Inhalt einer Datei im Paket"""
+        try:
+            offset, size, _ = self.files[str(rel)]
+        except KeyError:
+            raise FileNotFoundError(f"Nicht im Paket: {rel}")
+        return self._map[offset:offset + size]
+
+    def read_text(self, rel, encoding='utf-8'):
+        return self.read_bytes(rel).decode(encoding)
+
+    def entries(self):
+        """Entry(Jahr, Monat, Tag, Day.txt relativ, Datum) chronologisch"""
+        return list(self._entries)
+
+    def lookup(self, day):
+        return self._by_date.get(day)
+
+    def folder(self, day_file):
+        return str(PurePosixPath(day_file).parent)
+
+    def parsed(self, day_file):
+        """Zerlegte Day.txt (relativer Pfad im Paket)"""
+        return parse(self.read_text(day_file))
+
+    def day_files(self, day_file):
+        """Namen aller Dateien im Tagesordner einer Day.txt"""
+        folder = self.folder(day_file) + "/"
+        return [rel[len(folder):] for rel in self.files
+                if rel.startswith(folder) and "/" not in rel[len(folder):]]
+
+    def attachments(self, day_file):
+        return sorted(name for name in self.day_files(day_file) if name != "Day.txt")
+
+    def read_attachment(self, day_file, name):
+        return self.read_bytes(f"{self.folder(day_file)}/{name}")
+
+    def diary_files(self):
+        return sorted(rel for rel in self.files if "/" not in rel)
+
+    def read_diary_file(self, name):
+        return self.read_bytes(name)
+
+    def search(self, text, limit=50):
+        """Einträge, die alle Wörter enthalten, neueste zuerst"""
+        words = text.lower().split()
+        found = []
+        for entry in reversed(self.entries()):
+            content = self.read_bytes(entry.day_file).decode("utf-8", errors="replace").lower()
+            if all(word in content for word in words):
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def extract_day(self, day_file):
+        """Entpackt die Anhänge eines Tages in den Cache; gibt den Ordner zurück
+
+        Bilder, vCards und KMLs brauchen für Qt und externe Programme
+        einen echten Pfad. Bereits entpackte Dateien bleiben liegen.
+        """
+        key = hashlib.sha1(str(self.path.resolve()).encode("utf-8")).hexdigest()[:16]
+        folder = PurePosixPath(day_file).parent
+        # Pfade stammen aus dem Paket (evtl. fremd): nicht aus dem Cache heraus
+        target = safe_join(EXTRACT_CACHE / key, folder)
+        target.mkdir(parents=True, exist_ok=True)
+        for name in self.day_files(day_file):
+            _, size, mtime = self.files[f"{folder}/{name}"]
+            path = safe_join(target, name)
+            try:
+                st = os.stat(path)
+                if st.st_size == size and st.st_mtime_ns == mtime:
+                    continue
+            except FileNotFoundError:
+                pass
+            _write(path, self.read_bytes(f"{folder}/{name}"), mtime)
+        return target
+
+
+def _write(path, data, mtime):
+    with open(path, 'wb') as f:
+        f.write(data)
+    os.utime(path, ns=(mtime, mtime))
+
+
+def diary_files(diary, years=None):
+    """(relativer Pfad, echter Pfad) aller Dateien, die ins Paket gehören
+
+    Ohne years auch die Dateien im Tagebuch selbst (z.B. Icon.png);
+    .tagesgans (Indizes, Papierkorb) wird nie eingepackt.
+    """
+    diary = Path(diary)
+    files = []
+    if years is None:
+        with os.scandir(diary) as it:
+            for item in it:
+                if item.is_file(follow_symlinks=False) and not item.name.startswith("."):
+                    files.append((item.name, Path(item.path)))
+    for entry in DateIndex.open(diary).iter_entries():
+        if years is not None and entry.date.year not in years:
+            continue
+        day_dir = entry.day_file.parent
+        folder = day_dir.relative_to(diary).as_posix()
+        with os.scandir(day_dir) as it:
+            for item in it:
+                if item.is_file(follow_symlinks=False) and not item.name.startswith("."):
+                    files.append((f"{folder}/{item.name}", Path(item.path)))
+    return files
+
+
+def pack_diary(diary, target=None, years=None):
+    """Packt ein Tagebuch in eine Datei; gibt (Paket, Anzahl Dateien) zurück
+
+    Komprimierte Dateien (duckday.compression) werden entpackt
+    gespeichert, damit jede Datei ein direkter Slice bleibt.
+    """
+    diary = Path(diary)
+    if target is None:
+        suffix = "-" + "-".join(str(y) for y in sorted(years)) if years else ""
+        target = diary.with_name(f"{diary.stem}{suffix}{SUFFIX}")
+    target = Path(target)
+    tmp = target.with_name(target.name + ".tmp")
+
+    with span("Packen", diary=diary.name):
+        index = {}
+        with open(tmp, 'wb') as out:
+            out.write(HEADER.pack(MAGIC, VERSION))
+            for rel, path in diary_files(diary, years):
+                plain = path.with_suffix("")
+                if path.suffix in compression.CODECS and compression.is_compressible(plain.name):
+                    if compression.find(plain) != path:
+                        # Day.txt und Day.txt.gz zugleich (z.B. nach einem Sync): nur die gelesene Fassung
+                        continue
+                    rel = rel[:-len(path.suffix)]
+                    data = compression.read_bytes(plain)
+                else:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                mtime = os.stat(path).st_mtime_ns
+                index[rel] = (out.tell(), len(data), mtime)
+                out.write(data)
+            offset = out.tell()
+            directory = json.dumps({"version": VERSION, "diary": diary.stem, "files": index},
+                                   ensure_ascii=False).encode("utf-8")
+            out.write(directory)
+            out.write(TRAILER.pack(offset, len(directory), MAGIC))
+        os.replace(tmp, target)
+    return target, len(index)
+
+
+def safe_join(root, rel):
+    """root/rel für einen Pfad aus einem Paket oder einer Datenbank
+
+    Lehnt "..", absolute Pfade und .tagesgans ab (ValueError), damit ein
+    präpariertes Archiv nichts außerhalb des Tagebuchs schreiben kann.
+    """
+    path = PurePosixPath(str(rel).replace("\\", "/"))
+    parts = path.parts
+    if not parts or path.is_absolute() or ".." in parts or parts[0] == INDEX_DIR:
+        raise ValueError(f"Ungültiger Pfad: {rel}")
+    return Path(root).joinpath(*parts)
+
+
+def unpack(pack_file, diary, overwrite=False):
+    """Legt ein Paket wieder als Ordner ab; gibt die Anzahl Dateien zurück
+
+    Vorhandene Dateien bleiben unangetastet, außer mit overwrite=True.
+    Der Datumsindex merkt die neuen Tage beim nächsten Öffnen selbst.
+    """
+    diary = Path(diary)
+    written = 0
+    with span("Entpacken", pack=Path(pack_file).name), PackedDiary(pack_file) as pack:
+        for rel, (_, _, mtime) in pack.files.items():
+            try:
+                path = safe_join(diary, rel)
+            except ValueError:
+                print(f"Übersprungen (ungültiger Pfad): {rel}")
+                continue
+            if not overwrite and compression.exists(path):
+                print(f"Übersprungen, existiert schon: {rel}")
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write(path, pack.read_bytes(rel), mtime)
+            compression.remove_compressed(path)
+            written += 1
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tagebuch in eine Datei packen und zurück")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="Ordner → Paket")
+    pack_parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    pack_parser.add_argument("--year", type=int, action="append", dest="years",
+                             help="nur dieses Jahr (mehrfach möglich)")
+    pack_parser.add_argument("-o", "--output", help=f"Zieldatei (Standard: <Tagebuch>{SUFFIX})")
+    unpack_parser = commands.add_parser("unpack", help="Paket → Ordner")
+    unpack_parser.add_argument("pack", help=f"{SUFFIX} Datei")
+    unpack_parser.add_argument("diary", help="Ziel (.duckday Ordner)")
+    unpack_parser.add_argument("--overwrite", action="store_true",
+                               help="vorhandene Dateien überschreiben")
+    list_parser = commands.add_parser("list", help="Einträge eines Pakets")
+    list_parser.add_argument("pack", help=f"{SUFFIX} Datei")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "pack":
+            diary = Path(args.diary).expanduser()
+            if not diary.is_dir():
+                print(f"Kein Tagebuch gefunden: {diary}")
+                return 2
+            target, count = pack_diary(diary, args.output, set(args.years) if args.years else None)
+            print(f"{count} Datei(en) gepackt: {target} ({os.path.getsize(target) / 1024 / 1024:.1f} MB)")
+        elif args.command == "unpack":
+            count = unpack(Path(args.pack).expanduser(), Path(args.diary).expanduser(), args.overwrite)
+            print(f"{count} Datei(en) entpackt.")
+        else:
+            with PackedDiary(Path(args.pack).expanduser()) as pack:
+                entries = pack.entries()
+                for entry in entries:
+                    print(f"{entry.date:%d.%m.%Y}  {entry.day_file.parent}")
+                print(f"{len(entries)} Einträge, {len(pack)} Dateien.")
+    except (OSError, PackError) as e:
+        print(e)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
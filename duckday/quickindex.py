@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Schnellsuche (Strg+P) über Daten, #Label, @Personen, %Orte und Textanfänge
+
+Alles kommt aus dem Speicher: die Statistik-Tabelle (duckday.stats)
+wird einmal gelesen. Daten und Textanfänge liegen danach als ein
+verbundener String vor, in dem str.find bzw. ein regulärer Ausdruck
+sucht und nach den ersten Treffern aufhört.
+
+    #urlaub   nur Label       @anna   nur Personen
+    %berlin   nur Orte        14.3.2019 / 2019-03  Datum
+"""
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from .trace import span
+
+# kind: "date", "label", "person", "place" oder "snippet"
+# title: Anzeigetext, detail: Zusatz (z.B. Datum), diary/day: Ziel
+Result = namedtuple("Result", "kind title detail diary day score")
+
+PREFIXES = {"#": "label", "@": "person", "%": "place"}
+SYMBOLS = {"label": "#", "person": "@", "place": "%"}
+NAME_KINDS = ("label", "person", "place")
+
+# Pro Name höchstens so viele Tage, wenn ohne Präfix gesucht wird
+DAYS_PER_NAME = 5
+
+
+def match_score(query, text):
+    """Bewertung für query in text (beides klein geschrieben) oder None
+
+    Zusammenhängende Treffer zählen mehr als verstreute Buchstaben, frühe
+    Treffer mehr als späte.
+    """
+    pos = text.find(query)
+    if pos >= 0:
+        return 1000 - min(pos, 500) + (100 if pos == 0 else 0)
+    start = text.find(query[0])
+    if start < 0:
+        return None
+    i = start
+    for char in query[1:]:
+        i = text.find(char, i + 1)
+        if i < 0:
+            return None
+    return 500 - min(i - start, 400)
+
+
+class QuickIndex:
+    """Suchindex über ein oder mehrere Tagebücher"""
+
+    def __init__(self, cache, diaries):
+        self.multiple = len(diaries) > 1
+        self.dates = []      # (Datum, Tagebuch), neueste zuerst
+        self.snippets = []   # (Textanfang, Datum, Tagebuch), neueste zuerst
+        self.days = {kind: {} for kind in NAME_KINDS}   # Name → [(Datum, Tagebuch)]
+        self.names = {}      # Art → [(name klein, Name)]
+        self.blobs = {}      # "date"/"snippet" → (Suchtexte mit \n verbunden, Zeilenanfänge)
+
+        with span("Schnellsuche aufbauen", diaries=len(diaries)):
+            for diary in diaries:
+                for day, stats in cache.stats(diary).days.items():
+                    self.dates.append((day, diary))
+                    if stats.snippet:
+                        self.snippets.append((stats.snippet, day, diary))
+                    for kind, names in (("label", stats.labels), ("person", stats.people),
+                                        ("place", stats.places)):
+                        for name in names:
+                            self.days[kind].setdefault(name, []).append((day, diary))
+
+            # Neueste zuerst: bei gleicher Güte wird der jüngste Tag gezeigt
+            self.dates.sort(key=lambda item: item[0], reverse=True)
+            self.snippets.sort(key=lambda item: item[1], reverse=True)
+            for kind in NAME_KINDS:
+                for targets in self.days[kind].values():
+                    targets.sort(key=lambda item: item[0], reverse=True)
+                self.names[kind] = [(name.lower(), name) for name in sorted(self.days[kind])]
+
+            # 14.03.2019, 2019-03-14 und 14.3.2019
+            self.blobs["date"] = _blob(f"{day:%d.%m.%Y} {day.isoformat()} {day.day}.{day.month}.{day.year}"
+                                       for day, _ in self.dates)
+            self.blobs["snippet"] = _blob(text.lower() for text, _, _ in self.snippets)
+
+    def __len__(self):
+        return len(self.dates)
+
+    def search(self, query, limit=30):
+        """Treffer für eine Eingabe, beste zuerst"""
+        text = query.strip().lower()
+        kinds = ("label", "person", "place", "date", "snippet")
+        if text[:1] in PREFIXES:
+            kinds = (PREFIXES[text[0]],)
+            text = text[1:].strip()
+        elif not text:
+            # Leere Eingabe: nur die letzten Tage, keine Namen davor
+            kinds = ("date",)
+
+        results = []
+        only_names = len(kinds) == 1
+        for kind in kinds:
+            if kind in NAME_KINDS:
+                found = self._names(kind, text)
+            elif text:
+                found = self._scan(kind, text, limit - len(results))
+            else:
+                # Leere Eingabe: die letzten Tage
+                found = [(0, i) for i in range(min(limit, len(self.dates)))] if kind == "date" else []
+            for score, i in found:
+                days = limit - len(results) if only_names else min(DAYS_PER_NAME, limit - len(results))
+                results.extend(self._expand(kind, i, score, days))
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def _names(self, kind, text):
+        """Label/Personen/Orte: kleine Listen, unscharf bewertet"""
+        if not text:
+            return [(0, i) for i in range(len(self.names[kind]))]
+        found = []
+        for i, (key, _) in enumerate(self.names[kind]):
+            score = match_score(text, key)
+            if score is not None:
+                found.append((score, i))
+        found.sort(key=lambda hit: -hit[0])
+        return found
+
+    def _scan(self, kind, text, limit):
+        """Daten/Textanfänge: Suche im verbundenen Text, endet nach limit Treffern
+
+        Daten: erst zusammenhängend (str.find), dann verstreute Ziffern per
+        regulärem Ausdruck. Textanfänge: alle Wörter der Eingabe müssen
+        vorkommen. Gesucht wird in C, Python arbeitet nur pro Treffer.
+        """
+        blob, starts = self.blobs[kind]
+        words = text.split()
+        # Das längste Wort findet die wenigsten Zeilen, die anderen werden geprüft
+        first = max(words, key=len)
+        others = list(words)
+        others.remove(first)
+        found = []
+        seen = set()
+
+        pos = blob.find(first)
+        while pos >= 0 and len(found) < limit:
+            i = bisect_right(starts, pos) - 1
+            end = _next_line(starts, i, blob)
+            line = blob[starts[i]:end]
+            if all(word in line for word in others):
+                found.append((2, i))
+                seen.add(i)
+            pos = blob.find(first, end)
+
+        if kind == "date" and len(found) < limit and len(text) > 1:
+            # [^\nx]*x nimmt immer das nächste x: kein teures Zurückgehen
+            pattern = re.compile(re.escape(text[0]) + "".join(
+                f"[^\n{re.escape(char)}]*{re.escape(char)}" for char in text[1:]))
+            match = pattern.search(blob)
+            while match and len(found) < limit:
+                i = bisect_right(starts, match.start()) - 1
+                if i not in seen:
+                    found.append((1, i))
+                match = pattern.search(blob, _next_line(starts, i, blob))
+        return found
+
+    def _expand(self, kind, i, score, days):
+        """Result-Objekte zu einem Treffer"""
+        if kind == "date":
+            day, diary = self.dates[i]
+            return [Result(kind, f"{day:%d.%m.%Y}", diary.stem if self.multiple else "",
+                           diary, day, score)]
+        if kind == "snippet":
+            text, day, diary = self.snippets[i]
+            return [Result(kind, text, self._detail(day, diary), diary, day, score)]
+        name = self.names[kind][i][1]
+        targets = self.days[kind][name]
+        return [Result(kind, f"{SYMBOLS[kind]}{name}", self._detail(day, diary), diary, day, score)
+                for day, diary in targets[:days]]
+
+    def _detail(self, day, diary):
+        if self.multiple:
+            return f"{day:%d.%m.%Y} · {diary.stem}"
+        return f"{day:%d.%m.%Y}"
+
+
+def _blob(keys):
+    """Verbindet Suchtexte mit \n und merkt sich, wo jeder beginnt"""
+    starts = []
+    position = 0
+    parts = []
+    for key in keys:
+        key = key.replace("\n", " ")
+        starts.append(position)
+        parts.append(key)
+        position += len(key) + 1
+    return "\n".join(parts), starts
+
+
+def _next_line(starts, i, blob):
+    return starts[i + 1] if i + 1 < len(starts) else len(blob)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Einstellungen von Tagesgans (~/.config/tagesgans.txt)
+"""
+
+import json
+from pathlib import Path
+
+CONFIG_FILE = Path.home() / ".config" / "tagesgans.txt"
+
+DEFAULT_SETTINGS = {
+    "language": "Deutsch",
+    "default_format": "{20|fkud|Schwarz}",
+    "toolbar_position": "Oben",
+    "sidebar_position": "Rechts",
+    # Eintragsfenster im Reader: "Fenster", "Einzelfenster" oder "Tabs"
+    "viewer_mode": "Fenster",
+    # Höchstzahl gleichzeitig offener Eintragsfenster/Tabs
+    "viewer_pool_size": 5,
+    # Vorlagen neuer Tagebücher zusätzlich von GitHub aktualisieren
+    "update_templates": False,
+    # Zeitmessung der heißen Pfade (siehe duckday.trace)
+    "trace": False,
+    # Archivmodus: ältere Einträge komprimieren ("", "gzip", "lzma", "zstd")
+    "compression": "",
+    "compress_after_days": 60
+}
+
+
+def load_settings(config_file=CONFIG_FILE):
+    """Lädt die Einstellungen, fehlende Keys kommen aus den Defaults"""
+    settings = dict(DEFAULT_SETTINGS)
+    config_file = Path(config_file)
+
+    if config_file.exists():
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                settings.update(json.load(f))
+        except Exception as e:
+            print(f"Fehler beim Laden der Config: {e}")
+    return settings
+
+
+def save_settings(settings, config_file=CONFIG_FILE):
+    """Speichert die Einstellungen"""
+    config_file = Path(config_file)
+    try:
+        config_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(config_file, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, indent=4, ensure_ascii=False)
+        print(f"Settings gespeichert in: {config_file}")
+    except Exception as e:
+        print(f"Fehler beim Speichern der Config: {e}")
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Messung der Startzeit (--startup-report)
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+FLAG = "--startup-report"
+
+# Ziel: Hauptfenster deutlich unter einer halben Sekunde sichtbar
+BUDGET_SECONDS = 0.5
+
+
+class StartupReport:
+    """Sammelt Import- und Aufbauzeiten der einzelnen Startphasen"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.phases = []
+        self.reported = False
+
+    @classmethod
+    def from_argv(cls, argv):
+        """Aktiviert die Messung, wenn --startup-report übergeben wurde"""
+        return cls(FLAG in argv)
+
+    @staticmethod
+    def strip_flag(argv):
+        """Gibt argv ohne --startup-report zurück"""
+        return [arg for arg in argv if arg != FLAG]
+
+    @contextmanager
+    def phase(self, name):
+        """Misst einen Block als eigene Phase"""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, begin - self.start, time.perf_counter() - begin))
+
+    def mark(self, name):
+        """Markiert einen Zeitpunkt (Phase ohne Dauer)"""
+        self.phases.append((name, time.perf_counter() - self.start, 0.0))
+
+    def finish(self, name="erstes Zeichnen"):
+        """Markiert das Ende des Starts und gibt den Bericht aus"""
+        if not self.enabled or self.reported:
+            return
+        self.mark(name)
+        self.report()
+
+    def report(self, out=None):
+        """Gibt die gemessenen Phasen aus"""
+        out = out or sys.stderr
+        self.reported = True
+        total = time.perf_counter() - self.start
+
+        print("Startup-Report (ms):", file=out)
+        print(f"  {'Start':>8} {'Dauer':>8}  Phase", file=out)
+        for name, offset, duration in self.phases:
+            duration_str = f"{duration * 1000:8.1f}" if duration else f"{'':>8}"
+            print(f"  {offset * 1000:8.1f} {duration_str}  {name}", file=out)
+        print(f"  Gesamt: {total * 1000:.1f} ms", file=out)
+        if total > BUDGET_SECONDS:
+            print(f"  Warnung: Budget von {BUDGET_SECONDS * 1000:.0f} ms überschritten", file=out)
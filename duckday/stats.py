@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Statistik pro Tag (Wörter, Medien, Label, Personen, Orte, Textanfang)
+für Jahresübersicht, Auswertungen (duckday.analytics) und Schnellsuche
+(duckday.quickindex)
+
+Die Tabelle liegt in <Tagebuch>/.tagesgans/stats.json und wird beim
+Speichern eines Eintrags fortgeschrieben. Beim Öffnen werden nur Tage
+neu gelesen, die fehlen oder deren Day.txt eine andere mtime hat; die
+Heatmap selbst öffnet nie eine Day.txt.
+"""
+
+import json
+import os
+from collections import namedtuple
+from datetime import date
+
+from . import compression
+from .dateindex import INDEX_DIR
+from .markup import parse_file
+from .trace import span
+
+# labels/people/places: Tupel der Namen des Tages; timestamps: Anzahl;
+# snippet: Anfang des Textes ohne Markup
+DayStats = namedtuple("DayStats", "words media labels people places timestamps snippet")
+
+METRICS = ("words", "media", "label")
+
+SNIPPET_LENGTH = 120
+
+
+class StatsTable:
+    """Statistik aller Tage eines Tagebuchs, nach Jahr gruppiert"""
+
+    FILE_NAME = "stats.json"
+    VERSION = 3
+
+    def __init__(self, diary):
+        self.diary = diary
+        self.days = {}       # date → DayStats
+        self.mtimes = {}     # date → st_mtime_ns der Day.txt
+        self._years = {}     # Jahr → {date: DayStats}, wird bei Bedarf gebaut
+        self.dirty = False
+        # Zählt jede Änderung; abgeleitete Indizes erkennen daran, dass sie veraltet sind
+        self.version = 0
+
+    @property
+    def path(self):
+        return self.diary / INDEX_DIR / self.FILE_NAME
+
+    @classmethod
+    def open(cls, diary, index):
+        """Lädt die Tabelle und gleicht sie mit dem Datumsindex ab"""
+        table = cls(diary)
+        table.load()
+        table.sync(index)
+        return table
+
+    def load(self):
+        """Liest stats.json; eine fehlende oder kaputte Tabelle ist leer"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            for iso, (words, media, labels, people, places, timestamps, text, mtime) in data["days"].items():
+                day = date.fromisoformat(iso)
+                self.days[day] = DayStats(words, media, tuple(labels), tuple(people),
+                                          tuple(places), timestamps, text)
+                self.mtimes[day] = mtime
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Statistik wird neu aufgebaut ({self.path}): {e}")
+            self.days = {}
+            self.mtimes = {}
+
+    def save(self):
+        """Schreibt die Tabelle, falls sie sich geändert hat"""
+        if not self.dirty:
+            return
+        data = {
+            "version": self.VERSION,
+            "days": {day.isoformat(): [stats.words, stats.media, list(stats.labels),
+                                       list(stats.people), list(stats.places),
+                                       stats.timestamps, stats.snippet, self.mtimes[day]]
+                     for day, stats in sorted(self.days.items())},
+        }
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            tmp = self.path.with_name(self.FILE_NAME + ".tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Statistik nicht gespeichert: {e}")
+
+    def sync(self, index):
+        """Liest fehlende oder geänderte Tage nach, entfernt gelöschte"""
+        with span("Statistik abgleichen", diary=self.diary.name):
+            known = set()
+            for entry in index.entries():
+                known.add(entry.date)
+                try:
+                    mtime = compression.stat(entry.day_file).st_mtime_ns
+                    if self.mtimes.get(entry.date) != mtime:
+                        self._store(entry.date, parse_file(entry.day_file), mtime)
+                except (OSError, UnicodeDecodeError) as e:
+                    # Ein kaputter Tag darf Heatmap und Export nicht verhindern
+                    print(f"{entry.date:%d.%m.%Y} nicht in der Statistik: {e}")
+
+            for day in [day for day in self.days if day not in known]:
+                del self.days[day]
+                del self.mtimes[day]
+                self._years.pop(day.year, None)
+                self.dirty = True
+                self.version += 1
+        self.save()
+
+    def update(self, day, day_file, parsed):
+        """Schreibt die Werte eines gerade gespeicherten Tages fort"""
+        self._store(day, parsed, compression.stat(day_file).st_mtime_ns)
+        self.save()
+
+    def apply(self, updates, removed):
+        """Mehrere Tage auf einmal: updates (Datum, Day.txt, ParsedEntry), removed Daten"""
+        for day, day_file, parsed in updates:
+            self._store(day, parsed, compression.stat(day_file).st_mtime_ns)
+        for day in removed:
+            if self.days.pop(day, None) is not None:
+                del self.mtimes[day]
+                self._years.pop(day.year, None)
+                self.dirty = True
+                self.version += 1
+        self.save()
+
+    def _store(self, day, parsed, mtime):
+        self.days[day] = DayStats(parsed.words, len(parsed.media), tuple(parsed.labels),
+                                  tuple(parsed.people), tuple(parsed.places),
+                                  len(parsed.timestamps), snippet(parsed))
+        self.mtimes[day] = mtime
+        self._years.pop(day.year, None)
+        self.dirty = True
+        self.version += 1
+
+    def year(self, year):
+        """{date: DayStats} eines Jahres (im Speicher gruppiert)"""
+        days = self._years.get(year)
+        if days is None:
+            days = self._years[year] = {day: stats for day, stats in self.days.items()
+                                        if day.year == year}
+        return days
+
+    def years(self):
+        """Alle Jahre mit Einträgen, aufsteigend"""
+        return sorted({day.year for day in self.days})
+
+    def labels(self):
+        """Alle vorkommenden Label, alphabetisch"""
+        return sorted({label for stats in self.days.values() for label in stats.labels})
+
+
+def snippet(parsed, length=SNIPPET_LENGTH):
+    """Textanfang eines Eintrags ohne Markup, für Suche und Vorschau"""
+    words = []
+    size = 0
+    for line in parsed.lines:
+        for token in line.tokens:
+            if token.kind != "text":
+                continue
+            for word in token.value.split():
+                words.append(word)
+                size += len(word) + 1
+                if size >= length:
+                    return " ".join(words)[:length]
+    return " ".join(words)
+
+
+def day_value(stats, metric, label=None):
+    """Zahlenwert eines Tages für die Heatmap"""
+    if metric == "words":
+        return stats.words
+    if metric == "media":
+        return stats.media
+    # "label": 1, wenn der Tag das Label trägt
+    return 1 if label in stats.labels else 0
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""
+Ablage eines Tagebuchs: Ordner (Jahr/Monat/Tag) oder SQLite-Datenbank
+
+    python3 -m duckday.storage import ~/Privat.duckday Privat.duckdb [--media-refs]
+    python3 -m duckday.storage export Privat.duckdb ~/Privat.duckday
+    python3 -m duckday.storage search Privat.duckdb "urlaub berlin"
+
+Alle Ablagen (auch duckday.pack.PackedDiary) bieten dieselben Methoden:
+entries, lookup, read_text, parsed, attachments, read_attachment,
+extract_day, search und diary_files/read_diary_file (Icon.png, Info.txt); day_file ist dabei nur ein Schlüssel (bei
+Ordnern der echte Pfad, sonst "Jahr/Monat/Tag/Day.txt"). Schreiben
+können Ordner und Datenbank (write_entry, put_attachment, put_diary_file,
+commit).
+
+Die Datenbank (WAL) hält Einträge, Label/Personen/Orte, eine FTS5-
+Volltextsuche und Anhänge als Blob oder als Verweis auf die Datei.
+Auflisten, Datum nachschlagen und Suchen sind je eine Abfrage über
+einen Index.
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+from datetime import date
+from pathlib import Path, PurePosixPath
+
+from . import compression
+from .dateindex import DateIndex, Entry
+from .dates import day_folder
+from .markup import parse
+from .pack import EXTRACT_CACHE, SUFFIX as PACK_SUFFIX, PackedDiary, PackError, safe_join
+from .trace import span
+
+DB_SUFFIX = ".duckdb"
+
+
+def _matches(content, words):
+    """Alle Wörter (klein) kommen im Text vor"""
+    content = content.lower()
+    return all(word in content for word in words)
+
+
+class FolderStorage:
+    """Die bisherige Ablage: <Tagebuch>/Jahr/Monat/Tag/Day.txt + Anhänge"""
+
+    def __init__(self, diary, index=None):
+        self.diary = Path(diary)
+        self.name = self.diary.stem
+        self.index = index if index is not None else DateIndex.open(self.diary)
+
+    def close(self):
+        pass
+
+    def entries(self):
+        return self.index.entries()
+
+    def lookup(self, day):
+        return self.index.lookup(day)
+
+    def folder(self, day_file):
+        """Tagesordner relativ zum Tagebuch ("2019/March/14")"""
+        return Path(day_file).parent.relative_to(self.diary).as_posix()
+
+    def read_text(self, day_file):
+        return compression.read_text(day_file)
+
+    def parsed(self, day_file):
+        return parse(self.read_text(day_file))
+
+    def attachments(self, day_file):
+        """Namen der Anhänge (ohne Day.txt, komprimierte unter ihrem Namen)"""
+        names = []
+        for name in os.listdir(Path(day_file).parent):
+            plain, suffix = os.path.splitext(name)
+            if suffix in compression.CODECS and compression.is_compressible(plain):
+                name = plain
+            if name != "Day.txt" and not name.startswith("."):
+                names.append(name)
+        return sorted(names)
+
+    def read_attachment(self, day_file, name):
+        return compression.read_bytes(Path(day_file).parent / name)
+
+    def extract_day(self, day_file):
+        return Path(day_file).parent
+
+    def diary_files(self):
+        """Dateien im Tagebuch selbst (Icon.png, Info.txt, ...)"""
+        return sorted(entry.name for entry in os.scandir(self.diary)
+                      if entry.is_file() and not entry.name.startswith("."))
+
+    def read_diary_file(self, name):
+        with open(safe_join(self.diary, name), 'rb') as f:
+            return f.read()
+
+    def put_diary_file(self, name, data):
+        with open(safe_join(self.diary, name), 'wb') as f:
+            f.write(data)
+
+    def search(self, text, limit=50):
+        """Einträge, die alle Wörter enthalten, neueste zuerst (liest jede Day.txt)"""
+        words = text.lower().split()
+        found = []
+        for entry in self.index.iter_entries(newest_first=True):
+            try:
+                content = self.read_text(entry.day_file)
+            except (OSError, UnicodeDecodeError):
+                continue
+            if _matches(content, words):
+                found.append(entry)
+                if len(found) >= limit:
+                    break
+        return found
+
+    def write_entry(self, day, content, folder=None):
+        """Schreibt Day.txt (vorhandener Tag, sonst Jahr/MM/TT); gibt sie zurück"""
+        if folder is not None:
+            # Ordnernamen können aus einer fremden Datenbank oder einem Paket stammen
+            day_file = safe_join(self.diary, folder) / "Day.txt"
+        else:
+            existing = self.lookup(day)
+            day_file = existing if existing else day_folder(self.diary, day) / "Day.txt"
+        day_file.parent.mkdir(parents=True, exist_ok=True)
+        with span("Day.txt schreiben", file=day_file):
+            with open(day_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # Gespeichert wird unkomprimiert, alte Fassung weg
+            compression.remove_compressed(day_file)
+        return day_file
+
+    def copy_attachment(self, day_file, name, source):
+        """Kopiert eine Datei (vCard, KML, Medien) in den Tagesordner"""
+        target = safe_join(Path(day_file).parent, name)
+        shutil.copy(source, target)
+        compression.remove_compressed(target)
+
+    def put_attachment(self, day_file, name, data):
+        target = safe_join(Path(day_file).parent, name)
+        with open(target, 'wb') as f:
+            f.write(data)
+        compression.remove_compressed(target)
+
+    def commit(self):
+        pass
+
+
+class SQLiteStorage:
+    """Ein Tagebuch in einer SQLite-Datei (WAL, FTS5 wenn vorhanden)"""
+
+    VERSION = 1
+
+    def __init__(self, path, create=False):
+        self.path = Path(path)
+        if not create and not self.path.exists():
+            raise FileNotFoundError(f"Keine Datenbank: {self.path}")
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("PRAGMA foreign_keys=ON")
+        self.fts = self._create_schema()
+        self.name = self.meta("diary") or self.path.stem
+
+    def _create_schema(self):
+        """Legt fehlende Tabellen an; gibt zurück, ob FTS5 verfügbar ist"""
+        db = self.db
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                day TEXT NOT NULL UNIQUE,          -- ISO-Datum
+                folder TEXT NOT NULL UNIQUE,       -- Jahr/Monat/Tag wie im Ordner
+                content TEXT NOT NULL,
+                words INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS names (
+                entry_id INTEGER NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+                kind TEXT NOT NULL,                -- label, person, place
+                name TEXT NOT NULL,
+                PRIMARY KEY (entry_id, kind, name)
+            );
+            CREATE INDEX IF NOT EXISTS names_by_name ON names(kind, name);
+            CREATE TABLE IF NOT EXISTS attachments (
+                entry_id INTEGER NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+                name TEXT NOT NULL,
+                data BLOB,                         -- Inhalt oder NULL
+                ref TEXT,                          -- sonst Pfad zur Datei
+                PRIMARY KEY (entry_id, name)
+            );
+            CREATE TABLE IF NOT EXISTS diary_files (name TEXT PRIMARY KEY, data BLOB NOT NULL);
+        """)
+        if db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone() is None:
+            db.execute("INSERT INTO meta VALUES ('version', ?)", (str(self.VERSION),))
+        try:
+            db.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts
+                    USING fts5(content, content='entries', content_rowid='id');
+                CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                    INSERT INTO entries_fts(rowid, content) VALUES (new.id, new.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                    INSERT INTO entries_fts(entries_fts, rowid, content)
+                        VALUES ('delete', old.id, old.content);
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE OF content ON entries BEGIN
+                    INSERT INTO entries_fts(entries_fts, rowid, content)
+                        VALUES ('delete', old.id, old.content);
+                    INSERT INTO entries_fts(rowid, content) VALUES (new.id, new.content);
+                END;
+            """)
+            fts = True
+        except sqlite3.OperationalError:
+            # SQLite ohne FTS5: Suche per LIKE
+            fts = False
+        db.commit()
+        return fts
+
+    def meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.db.close()
+
+    @staticmethod
+    def _entry(day, folder):
+        parts = folder.split("/")
+        return Entry(*parts, PurePosixPath(folder) / "Day.txt", date.fromisoformat(day))
+
+    def _entry_id(self, day_file):
+        folder = str(PurePosixPath(day_file).parent)
+        row = self.db.execute("SELECT id FROM entries WHERE folder = ?", (folder,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Nicht in der Datenbank: {day_file}")
+        return row[0]
+
+    def entries(self):
+        rows = self.db.execute("SELECT day, folder FROM entries ORDER BY day")
+        return [self._entry(day, folder) for day, folder in rows]
+
+    def lookup(self, day):
+        row = self.db.execute("SELECT folder FROM entries WHERE day = ?", (day.isoformat(),)).fetchone()
+        return PurePosixPath(row[0]) / "Day.txt" if row else None
+
+    def folder(self, day_file):
+        return str(PurePosixPath(day_file).parent)
+
+    def read_text(self, day_file):
+        row = self.db.execute("SELECT content FROM entries WHERE folder = ?",
+                              (self.folder(day_file),)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Nicht in der Datenbank: {day_file}")
+        return row[0]
+
+    def parsed(self, day_file):
+        return parse(self.read_text(day_file))
+
+    def attachments(self, day_file):
+        rows = self.db.execute("SELECT name FROM attachments WHERE entry_id = ? ORDER BY name",
+                               (self._entry_id(day_file),))
+        return [name for name, in rows]
+
+    def read_attachment(self, day_file, name):
+        row = self.db.execute("SELECT data, ref FROM attachments WHERE entry_id = ? AND name = ?",
+                              (self._entry_id(day_file), name)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Anhang fehlt: {day_file}: {name}")
+        data, ref = row
+        return data if ref is None else compression.read_bytes(ref)
+
+    def extract_day(self, day_file):
+        """Legt die Anhänge eines Tages in den Cache (Verweise als Symlink)"""
+        key = "db-" + hashlib.sha1(str(self.path.resolve()).encode("utf-8")).hexdigest()[:16]
+        # Ordner und Namen stammen aus der Datenbank (evtl. fremd): nicht aus dem Cache heraus
+        target = safe_join(EXTRACT_CACHE / key, self.folder(day_file))
+        target.mkdir(parents=True, exist_ok=True)
+        rows = self.db.execute("SELECT name, data, ref FROM attachments WHERE entry_id = ?",
+                               (self._entry_id(day_file),))
+        for name, data, ref in rows:
+            path = safe_join(target, name)
+            if ref is not None:
+                if not path.is_symlink():
+                    path.symlink_to(ref)
+            elif not path.exists() or path.stat().st_size != len(data):
+                with open(path, 'wb') as f:
+                    f.write(data)
+        return target
+
+    def diary_files(self):
+        return [name for name, in self.db.execute("SELECT name FROM diary_files ORDER BY name")]
+
+    def read_diary_file(self, name):
+        row = self.db.execute("SELECT data FROM diary_files WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Nicht in der Datenbank: {name}")
+        return row[0]
+
+    def put_diary_file(self, name, data):
+        self.db.execute("INSERT OR REPLACE INTO diary_files VALUES (?, ?)", (name, bytes(data)))
+
+    def days_with(self, kind, name):
+        """Alle Tage mit diesem Label / dieser Person / diesem Ort"""
+        rows = self.db.execute(
+            "SELECT e.day, e.folder FROM names n JOIN entries e ON e.id = n.entry_id "
+            "WHERE n.kind = ? AND n.name = ? ORDER BY e.day", (kind, name))
+        return [self._entry(day, folder) for day, folder in rows]
+
+    def search(self, text, limit=50):
+        """Einträge mit allen Wörtern (Wortanfänge), neueste zuerst"""
+        words = text.split()
+        if not words:
+            return []
+        if self.fts:
+            query = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+            rows = self.db.execute(
+                "SELECT e.day, e.folder FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid "
+                "WHERE entries_fts MATCH ? ORDER BY e.day DESC LIMIT ?", (query, limit))
+        else:
+            where = " AND ".join("content LIKE ?" for _ in words)
+            rows = self.db.execute(
+                f"SELECT day, folder FROM entries WHERE {where} ORDER BY day DESC LIMIT ?",
+                [f"%{word}%" for word in words] + [limit])
+        return [self._entry(day, folder) for day, folder in rows]
+
+    def write_entry(self, day, content, folder=None):
+        """Legt einen Tag an oder ersetzt seinen Text (commit() nicht vergessen)"""
+        if folder is None:
+            existing = self.lookup(day)
+            folder = str(existing.parent) if existing else f"{day.year}/{day.month:02d}/{day.day:02d}"
+        parsed = parse(content)
+        db = self.db
+        db.execute(
+            "INSERT INTO entries (day, folder, content, words) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(day) DO UPDATE SET folder = excluded.folder, content = excluded.content, "
+            "words = excluded.words", (day.isoformat(), folder, content, parsed.words))
+        entry_id = db.execute("SELECT id FROM entries WHERE day = ?", (day.isoformat(),)).fetchone()[0]
+        db.execute("DELETE FROM names WHERE entry_id = ?", (entry_id,))
+        db.executemany("INSERT OR IGNORE INTO names VALUES (?, ?, ?)",
+                       [(entry_id, kind, name) for kind, names in
+                        (("label", parsed.labels), ("person", parsed.people), ("place", parsed.places))
+                        for name in names])
+        return PurePosixPath(folder) / "Day.txt"
+
+    def put_attachment(self, day_file, name, data):
+        self.db.execute("INSERT OR REPLACE INTO attachments VALUES (?, ?, ?, NULL)",
+                        (self._entry_id(day_file), name, bytes(data)))
+
+    def put_reference(self, day_file, name, path):
+        """Anhang bleibt als Datei liegen, die Datenbank merkt sich nur den Pfad"""
+        self.db.execute("INSERT OR REPLACE INTO attachments VALUES (?, ?, NULL, ?)",
+                        (self._entry_id(day_file), name, str(Path(path).resolve())))
+
+    def copy_attachment(self, day_file, name, source):
+        with open(source, 'rb') as f:
+            self.put_attachment(day_file, name, f.read())
+
+    def commit(self):
+        self.db.commit()
+
+
+def open_storage(path, create=False):
+    """Passende Ablage zu einem Pfad: Ordner, .duckdb oder .duckpack"""
+    path = Path(path)
+    if path.suffix == DB_SUFFIX:
+        return SQLiteStorage(path, create)
+    if path.suffix == PACK_SUFFIX:
+        return PackedDiary(path)
+    if create:
+        path.mkdir(parents=True, exist_ok=True)
+    if not path.is_dir():
+        raise FileNotFoundError(f"Kein Tagebuch gefunden: {path}")
+    return FolderStorage(path)
+
+
+def copy_entries(source, target, media_refs=False, progress=None):
+    """Überträgt alle Einträge samt Anhängen; gibt die Anzahl zurück
+
+    media_refs: Medien aus einem Ordner nur verweisen statt kopieren
+    (nur für SQLiteStorage als Ziel). Ordnernamen bleiben erhalten.
+    """
+    entries = source.entries()
+    with span("Einträge übertragen", source=source.name, count=len(entries)):
+        for name in source.diary_files():
+            target.put_diary_file(name, source.read_diary_file(name))
+        for number, entry in enumerate(entries, 1):
+            day_file = target.write_entry(entry.date, source.read_text(entry.day_file),
+                                          source.folder(entry.day_file))
+            for name in source.attachments(entry.day_file):
+                if media_refs and isinstance(source, FolderStorage) and not compression.is_compressible(name):
+                    target.put_reference(day_file, name, Path(entry.day_file).parent / name)
+                else:
+                    target.put_attachment(day_file, name, source.read_attachment(entry.day_file, name))
+            if progress and number % 500 == 0:
+                progress(number, len(entries))
+        if isinstance(target, SQLiteStorage):
+            target.set_meta("diary", source.name)
+        target.commit()
+    return len(entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tagebuch zwischen Ordner und SQLite übertragen")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Ordner → Datenbank")
+    import_parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    import_parser.add_argument("database", help=f"Zieldatei ({DB_SUFFIX})")
+    import_parser.add_argument("--media-refs", action="store_true",
+                               help="Medien nur verweisen statt in die Datenbank kopieren")
+    export_parser = commands.add_parser("export", help="Datenbank (oder Paket) → Ordner")
+    export_parser.add_argument("database", help=f"{DB_SUFFIX} oder {PACK_SUFFIX} Datei")
+    export_parser.add_argument("diary", help="Ziel (.duckday Ordner)")
+    search_parser = commands.add_parser("search", help="Volltextsuche")
+    search_parser.add_argument("database", help=f"{DB_SUFFIX} Datei oder .duckday Ordner")
+    search_parser.add_argument("text")
+    search_parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "import":
+            source = FolderStorage(Path(args.diary).expanduser())
+            target = SQLiteStorage(Path(args.database).expanduser(), create=True)
+            count = copy_entries(source, target, args.media_refs)
+            print(f"{count} Einträge in {target.path} übernommen.")
+            target.close()
+        elif args.command == "export":
+            source = open_storage(Path(args.database).expanduser())
+            diary = Path(args.diary).expanduser()
+            if diary.exists() and any(diary.iterdir()):
+                print(f"Ziel ist nicht leer: {diary}")
+                return 2
+            count = copy_entries(source, open_storage(diary, create=True))
+            print(f"{count} Einträge nach {diary} geschrieben.")
+            source.close()
+        else:
+            storage = open_storage(Path(args.database).expanduser())
+            for entry in storage.search(args.text, args.limit):
+                print(f"{entry.date:%d.%m.%Y}  {entry.day_file}")
+            storage.close()
+    except (OSError, ValueError, sqlite3.Error, PackError) as e:
+        print(e)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
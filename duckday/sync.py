@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Abgleich zweier Kopien eines Tagebuchs in beide Richtungen
+
+    python3 -m duckday.sync ~/Privat.duckday /mnt/nas/Privat.duckday [--dry-run]
+    tagesgans-cli sync Privat /mnt/nas/Privat.duckday
+
+Jede Seite bekommt eine Kennung (.tagesgans/sync-id) und merkt sich pro
+Gegenseite, welche Dateien sie beim letzten Abgleich hatte
+(.tagesgans/sync/<Kennung der Gegenseite>.json: Pfad → Größe, mtime,
+SHA-1). Ein Hash wird nur berechnet, wenn Größe oder mtime nicht mehr
+zum Manifest passen; ein unveränderter Abgleich liest also keine Datei.
+
+Geändert hat sich eine Datei, wenn ihr Inhalt nicht mehr dem Manifest
+entspricht. Was nur auf einer Seite geändert, neu oder gelöscht ist,
+wird auf die andere übertragen. Haben beide Seiten dieselbe Datei
+verschieden geändert, gewinnt die neuere; die andere Fassung bleibt auf
+beiden Seiten als "Day.konflikt-<Zeit>.txt" neben ihr liegen (fsck
+meldet sie, cleanup lässt sie in Ruhe). Gegen Löschen gewinnt Ändern.
+Übertragen wird mit Zeitstempel (copy2) über eine temporäre Datei, so
+dass ein abgebrochener Abgleich keine halben Dateien hinterlässt.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+from .dateindex import INDEX_DIR
+from .trace import span
+
+SYNC_DIR = "sync"
+ID_FILE = "sync-id"
+VERSION = 1
+
+# Kennzeichen der aufbewahrten Fassung bei gleichzeitiger Änderung
+CONFLICT_MARK = ".konflikt-"
+
+# Zustand einer Datei auf einer Seite
+FileState = namedtuple("FileState", "size mtime hash")
+
+# op: "kopieren", "löschen" oder "konflikt"; source: "a" oder "b" (woher der Inhalt kommt)
+Action = namedtuple("Action", "op path source")
+
+
+def is_conflict_copy(name):
+    """Aufbewahrte Fassung aus einem Konflikt?"""
+    return CONFLICT_MARK in name
+
+
+def conflict_name(path, mtime_ns):
+    """Day.txt → Day.konflikt-20260214-103000.txt (Zeit der aufbewahrten Fassung)"""
+    path = Path(path)
+    stamp = datetime.fromtimestamp(mtime_ns / 1e9).strftime("%Y%m%d-%H%M%S")
+    return path.with_name(f"{path.stem}{CONFLICT_MARK}{stamp}{path.suffix}").as_posix()
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def diary_id(diary, create=True):
+    """Kennung einer Kopie; wird beim ersten Abgleich angelegt (create=False: sonst None)"""
+    path = Path(diary) / INDEX_DIR / ID_FILE
+    try:
+        return path.read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        if not create:
+            return None
+        path.parent.mkdir(exist_ok=True)
+        value = uuid.uuid4().hex
+        path.write_text(value + "\n", encoding='utf-8')
+        return value
+
+
+def scan_files(root):
+    """Pfad (relativ, mit /) → (Größe, mtime) aller Dateien außer .tagesgans, Punkt- und .tmp-Dateien"""
+    root = Path(root)
+    stats = {}
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.startswith(".") or entry.name.endswith(".tmp"):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    stat = entry.stat(follow_symlinks=False)
+                    stats[Path(entry.path).relative_to(root).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return stats
+
+
+class Side:
+    """Eine Kopie des Tagebuchs mit ihrem Manifest zur Gegenseite"""
+
+    def __init__(self, diary, peer_id):
+        """peer_id None: Gegenseite noch ohne Kennung, also noch nie abgeglichen"""
+        self.diary = Path(diary)
+        self.manifest_path = self.diary / INDEX_DIR / SYNC_DIR / f"{peer_id}.json" if peer_id else None
+        self.manifest = self.load_manifest()
+        self.stats = scan_files(self.diary)
+        self._hashes = {}
+
+    def load_manifest(self):
+        if self.manifest_path is None:
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != VERSION:
+            return {}
+        return {path: FileState(*values) for path, values in data["files"].items()}
+
+    def save_manifest(self, files):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"version": VERSION, "files": {path: list(state) for path, state in sorted(files.items())}}, f)
+        os.replace(tmp, self.manifest_path)
+
+    def state(self, path):
+        """FileState oder None; hasht nur, wenn Größe/mtime nicht zum Manifest passen"""
+        stat = self.stats.get(path)
+        if stat is None:
+            return None
+        known = self.manifest.get(path)
+        if known and (known.size, known.mtime) == stat:
+            return known
+        digest = self._hashes.get(path)
+        if digest is None:
+            digest = self._hashes[path] = file_hash(self.diary / path)
+        return FileState(stat[0], stat[1], digest)
+
+    def changed(self, path):
+        """Inhalt anders als beim letzten Abgleich (neu und gelöscht zählen als Änderung)"""
+        state = self.state(path)
+        known = self.manifest.get(path)
+        if state is None or known is None:
+            return (state is None) != (known is None)
+        return state.hash != known.hash
+
+    def refresh(self, path, digest=None):
+        """Nach dem Schreiben: neuen Stand übernehmen (digest: bekannter Hash des Inhalts)"""
+        self._hashes.pop(path, None)
+        try:
+            stat = (self.diary / path).stat()
+        except FileNotFoundError:
+            self.stats.pop(path, None)
+            return
+        self.stats[path] = (stat.st_size, stat.st_mtime_ns)
+        if digest is not None:
+            self._hashes[path] = digest
+
+
+def plan(a, b):
+    """Liste von Action für zwei Seiten"""
+    actions = []
+    for path in sorted(set(a.stats) | set(b.stats) | set(a.manifest) | set(b.manifest)):
+        state_a, state_b = a.state(path), b.state(path)
+        if state_a is None and state_b is None:
+            continue
+        if state_a and state_b and state_a.hash == state_b.hash:
+            continue
+        changed_a, changed_b = a.changed(path), b.changed(path)
+        if changed_a and not changed_b:
+            actions.append(Action("kopieren" if state_a else "löschen", path, "a"))
+        elif changed_b and not changed_a:
+            actions.append(Action("kopieren" if state_b else "löschen", path, "b"))
+        elif state_a is None:
+            # Auf a gelöscht, auf b geändert: Ändern gewinnt
+            actions.append(Action("kopieren", path, "b"))
+        elif state_b is None:
+            actions.append(Action("kopieren", path, "a"))
+        else:
+            # Beide geändert: neuere Fassung gewinnt, die andere bleibt als Konflikt-Kopie
+            actions.append(Action("konflikt", path, "a" if state_a.mtime >= state_b.mtime else "b"))
+    return actions
+
+
+def copy_file(source, target):
+    """Kopie mit Zeitstempel über eine temporäre Datei"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.copy2(source, tmp)
+    os.replace(tmp, target)
+
+
+def remove_file(diary, path):
+    """Löscht eine Datei und leer gewordene Ordner darüber"""
+    full = diary / path
+    try:
+        full.unlink()
+    except FileNotFoundError:
+        return
+    folder = full.parent
+    while folder != diary:
+        try:
+            folder.rmdir()
+        except OSError:
+            break
+        folder = folder.parent
+
+
+def apply(a, b, actions):
+    sides = {"a": (a, b), "b": (b, a)}
+    for action in actions:
+        source, target = sides[action.source]
+        if action.op == "kopieren":
+            digest = source.state(action.path).hash
+            copy_file(source.diary / action.path, target.diary / action.path)
+            target.refresh(action.path, digest)
+        elif action.op == "löschen":
+            remove_file(target.diary, action.path)
+            target.refresh(action.path)
+        else:
+            # Ältere Fassung zur Seite legen und auf beiden Seiten verfügbar machen
+            older = target.state(action.path)
+            newer = source.state(action.path)
+            kept = conflict_name(action.path, older.mtime)
+            counter = 1
+            while (target.diary / kept).exists() or (source.diary / kept).exists():
+                kept = conflict_name(action.path, older.mtime).replace(CONFLICT_MARK, f"{CONFLICT_MARK}{counter}-", 1)
+                counter += 1
+            os.replace(target.diary / action.path, target.diary / kept)
+            copy_file(target.diary / kept, source.diary / kept)
+            copy_file(source.diary / action.path, target.diary / action.path)
+            target.refresh(kept, older.hash)
+            source.refresh(kept, older.hash)
+            target.refresh(action.path, newer.hash)
+
+
+def sync(diary_a, diary_b, dry_run=False):
+    """Gleicht zwei Kopien ab; gibt die Liste der Action zurück"""
+    diary_a, diary_b = Path(diary_a), Path(diary_b)
+    if diary_a.resolve() == diary_b.resolve():
+        raise ValueError("Beide Seiten sind dasselbe Tagebuch")
+    with span("Abgleich", a=diary_a, b=diary_b):
+        # Probelauf: nichts schreiben, auch keine Kennung anlegen
+        id_a, id_b = diary_id(diary_a, not dry_run), diary_id(diary_b, not dry_run)
+        if id_a is not None and id_a == id_b:
+            # Von Hand kopiert (samt .tagesgans): die zweite Kopie bekommt eine eigene Kennung
+            if dry_run:
+                id_b = None
+            else:
+                (diary_b / INDEX_DIR / ID_FILE).unlink()
+                id_b = diary_id(diary_b)
+        a, b = Side(diary_a, id_b), Side(diary_b, id_a)
+        actions = plan(a, b)
+        if dry_run:
+            return actions
+        apply(a, b, actions)
+
+        # Neues Manifest: beide Seiten sind jetzt gleich
+        for side in (a, b):
+            side.save_manifest({path: side.state(path) for path in side.stats})
+    return actions
+
+
+def format_action(action, names=("a", "b")):
+    """Eine Zeile für die Ausgabe"""
+    source, target = (names[0], names[1]) if action.source == "a" else (names[1], names[0])
+    if action.op == "kopieren":
+        return f"{source} → {target}  {action.path}"
+    if action.op == "löschen":
+        return f"{target} ✗  {action.path} (auf {source} gelöscht)"
+    return f"Konflikt    {action.path} ({source} ist neuer, andere Fassung bleibt als Kopie)"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gleicht zwei Kopien eines Tagebuchs ab")
+    parser.add_argument("a", help="erste Kopie (.duckday Ordner)")
+    parser.add_argument("b", help="zweite Kopie (.duckday Ordner, z.B. auf dem NAS)")
+    parser.add_argument("--dry-run", action="store_true", help="nur anzeigen, was passieren würde")
+    args = parser.parse_args(argv)
+
+    diary_a, diary_b = Path(args.a).expanduser(), Path(args.b).expanduser()
+    for diary in (diary_a, diary_b):
+        if not diary.is_dir():
+            print(f"Kein Tagebuch gefunden: {diary}")
+            return 2
+    try:
+        actions = sync(diary_a, diary_b, args.dry_run)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 2
+    for action in actions:
+        print(format_action(action, (str(diary_a), str(diary_b))))
+    conflicts = sum(action.op == "konflikt" for action in actions)
+    print(f"{len(actions)} Änderung(en){', davon ' + str(conflicts) + ' Konflikt(e)' if conflicts else ''}"
+          f"{' (Probelauf)' if args.dry_run else ''}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Vorlagen für neue Tagebücher (Info.txt, Install.sh) und das Anlegen
+eines Tagebuchs
+
+Die Vorlagen liegen neben den Programmdateien und werden lokal kopiert.
+Eine optionale Aktualisierung von GitHub läuft im Hintergrund mit kurzem
+Timeout, damit das Erstellen eines Tagebuchs nie auf das Netz wartet.
+"""
+
+import os
+import shutil
+import threading
+from pathlib import Path
+
+# Repository-Wurzel bzw. ~/.local/bin/tagesgans
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent
+
+UPDATE_URL = "https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/refs/heads/main/"
+UPDATE_TIMEOUT = 3
+
+# Dateiname → Dateirechte
+TEMPLATES = {
+    "Info.txt": 0o644,
+    "Install.sh": 0o755,
+}
+
+FALLBACK_INFO = "This is a Tagesgans diary.\n"
+
+# Icon.png, wenn beim Anlegen keins gewählt wird
+DEFAULT_ICON = Path.home() / ".local" / "share" / "icons" / "Goose" / "tagesgans.png"
+
+
+def copy_templates(diary_path, template_dir=TEMPLATE_DIR):
+    """Kopiert die mitgelieferten Vorlagen in ein Tagebuch"""
+    diary_path = Path(diary_path)
+    for name, mode in TEMPLATES.items():
+        src = Path(template_dir) / name
+        dst = diary_path / name
+        if src.exists():
+            shutil.copy(src, dst)
+            dst.chmod(mode)
+        elif name == "Info.txt":
+            with open(dst, 'w', encoding='utf-8') as f:
+                f.write(FALLBACK_INFO)
+
+
+def update_templates(diary_path, timeout=UPDATE_TIMEOUT):
+    """Lädt neuere Vorlagen von GitHub; Fehler werden ignoriert"""
+    import urllib.request
+
+    diary_path = Path(diary_path)
+    for name, mode in TEMPLATES.items():
+        try:
+            with urllib.request.urlopen(UPDATE_URL + name, timeout=timeout) as response:
+                data = response.read()
+        except Exception as e:
+            print(f"Vorlage {name} nicht aktualisiert: {e}")
+            continue
+
+        dst = diary_path / name
+        if dst.exists() and dst.read_bytes() == data:
+            continue
+        # Erst vollständig schreiben, dann ersetzen
+        tmp = dst.with_name(dst.name + ".tmp")
+        tmp.write_bytes(data)
+        tmp.chmod(mode)
+        os.replace(tmp, dst)
+
+
+def update_templates_async(diary_path, timeout=UPDATE_TIMEOUT):
+    """Startet update_templates in einem Hintergrund-Thread"""
+    thread = threading.Thread(
+        target=update_templates, args=(diary_path, timeout),
+        name="tagesgans-template-update", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def create_diary(parent, name, icon=None, update=False):
+    """Legt <parent>/<name>.duckday mit Vorlagen und Icon an; gibt den Pfad zurück"""
+    diary_path = Path(parent) / f"{name}.duckday"
+    diary_path.mkdir(parents=True, exist_ok=True)
+
+    copy_templates(diary_path)
+    if update:
+        update_templates_async(diary_path)
+
+    icon = Path(icon) if icon else DEFAULT_ICON
+    if icon.exists():
+        shutil.copy(icon, diary_path / "Icon.png")
+    return diary_path
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsame Zeitleiste mehrerer Tagebücher
+
+Jedes Tagebuch liefert seine Einträge bereits nach Datum sortiert aus
+dem Datumsindex. heapq.merge mischt diese Ströme (k-Wege-Mischen), und
+es werden immer nur so viele Einträge erzeugt, wie die Ansicht gerade
+anzeigt.
+"""
+
+import heapq
+from collections import namedtuple
+from itertools import islice
+from pathlib import Path
+
+from .trace import span
+
+# diary: Pfad des .duckday Ordners, entry: duckday.dateindex.Entry
+TimelineEntry = namedtuple("TimelineEntry", "diary entry")
+
+
+class Timeline:
+    """Einträge aller angegebenen Tagebücher, standardmäßig neueste zuerst"""
+
+    def __init__(self, cache, diaries, newest_first=True):
+        self.diaries = [Path(diary) for diary in diaries]
+        self.newest_first = newest_first
+        with span("Zeitleiste öffnen", diaries=len(self.diaries)):
+            streams = [self._stream(cache.date_index(diary), diary) for diary in self.diaries]
+        self._merged = heapq.merge(*streams, key=lambda item: item.entry.date,
+                                   reverse=newest_first)
+        self.entries = []        # bisher abgeholte Einträge
+        self.exhausted = False
+
+    def _stream(self, index, diary):
+        for entry in index.iter_entries(self.newest_first):
+            yield TimelineEntry(diary, entry)
+
+    def fetch(self, count):
+        """Holt die nächsten count Einträge (weniger am Ende)"""
+        if self.exhausted:
+            return []
+        with span("Zeitleiste mischen", count=count):
+            chunk = list(islice(self._merged, count))
+        if len(chunk) < count:
+            self.exhausted = True
+        self.entries.extend(chunk)
+        return chunk
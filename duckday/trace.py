@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Optionale Zeitmessung der heißen Pfade (Scan, Einträge, Lesen, Rendern,
+Medien, Speichern)
+
+Aktivierung:
+    TAGESGANS_TRACE=1               Trace beim Beenden nach ~/.cache/tagesgans/
+    TAGESGANS_TRACE=/pfad/trace.json  Trace beim Beenden in diese Datei
+    "trace": true in ~/.config/tagesgans.txt
+
+Die Datei ist im Chrome-Trace-Format und lässt sich in chrome://tracing
+oder https://ui.perfetto.dev öffnen. Ausgeschaltet kostet ein span() nur
+einen Attributzugriff.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+ENV_VAR = "TAGESGANS_TRACE"
+TRACE_DIR = Path.home() / ".cache" / "tagesgans"
+
+# Begrenzter Puffer, damit lange Sitzungen nicht unbegrenzt wachsen
+MAX_EVENTS = 200000
+
+
+class Span:
+    """Ein gemessener Abschnitt mit Kindern"""
+
+    __slots__ = ("name", "cat", "args", "start", "end", "tid", "children")
+
+    def __init__(self, name, cat, args, tid):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.tid = tid
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+
+class Tracer:
+    """Sammelt Spans und exportiert sie als Chrome-Trace"""
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.enabled = False
+        self.export_path = None
+        self.events = deque(maxlen=max_events)
+        self.last_operation = None
+        self.listeners = []
+        self.origin = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._atexit = False
+
+    def enable(self, export_path=None):
+        """Schaltet die Messung ein; export_path wird beim Beenden geschrieben"""
+        self.enabled = True
+        if export_path:
+            self.export_path = Path(export_path)
+        if not self._atexit:
+            atexit.register(self._export_at_exit)
+            self._atexit = True
+
+    def disable(self):
+        self.enabled = False
+
+    def add_listener(self, callback):
+        """callback(span) nach jeder abgeschlossenen Wurzel-Operation"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def span(self, name, cat="tagesgans", **args):
+        """Kontextmanager für einen gemessenen Abschnitt"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, cat, args)
+
+    @contextmanager
+    def _span(self, name, cat, args):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        span = Span(name, cat, args, threading.get_ident())
+        if stack:
+            stack[-1].children.append(span)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            self._record(span)
+            if not stack:
+                self.last_operation = span
+                for callback in list(self.listeners):
+                    try:
+                        callback(span)
+                    except Exception as e:
+                        print(f"Trace-Listener fehlgeschlagen: {e}")
+
+    def _record(self, span):
+        event = {
+            "name": span.name,
+            "cat": span.cat,
+            "ph": "X",
+            "ts": (span.start - self.origin) * 1e6,
+            "dur": (span.end - span.start) * 1e6,
+            "pid": os.getpid(),
+            "tid": span.tid,
+        }
+        if span.args:
+            event["args"] = {key: str(value) for key, value in span.args.items()}
+        with self._lock:
+            self.events.append(event)
+
+    def export_chrome_trace(self, path):
+        """Schreibt alle Spans im Chrome-Trace-Format"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            events = list(self.events)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def _export_at_exit(self):
+        if not self.events:
+            return
+        path = self.export_path or TRACE_DIR / f"trace-{datetime.now():%Y%m%d-%H%M%S}.json"
+        try:
+            self.export_chrome_trace(path)
+            print(f"Trace gespeichert in: {path}")
+        except Exception as e:
+            print(f"Fehler beim Speichern des Trace: {e}")
+
+
+class _NullSpan:
+    """Platzhalter, wenn die Messung aus ist"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+tracer = Tracer()
+span = tracer.span
+
+
+def traced(name, cat="tagesgans"):
+    """Dekorator: misst jeden Aufruf der Funktion als Span"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def breakdown(root):
+    """Fasst die Kinder eines Spans nach Namen zusammen
+
+    Gibt (Tiefe, Name, Gesamtdauer in s, Anzahl) Zeilen zurück, die
+    Wurzel zuerst.
+    """
+    rows = [(0, root.name, root.duration, 1)]
+
+    def walk(children, depth):
+        groups = {}
+        for child in children:
+            group = groups.setdefault(child.name, [0.0, 0, []])
+            group[0] += child.duration
+            group[1] += 1
+            group[2].extend(child.children)
+        for name, (total, count, grandchildren) in groups.items():
+            rows.append((depth, name, total, count))
+            walk(grandchildren, depth + 1)
+
+    walk(root.children, 1)
+    return rows
+
+
+def enable_from_settings(settings):
+    """Schaltet die Messung ein, wenn "trace" in den Einstellungen gesetzt ist"""
+    if settings.get("trace") and not tracer.enabled:
+        tracer.enable()
+
+
+def _enable_from_env():
+    value = os.environ.get(ENV_VAR, "").strip()
+    if not value or value.lower() in ("0", "false", "no"):
+        return
+    if value.lower() in ("1", "true", "yes"):
+        tracer.enable()
+    else:
+        tracer.enable(Path(value).expanduser())
+
+
+_enable_from_env()
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+Tagebuch als statische HTML-Seiten (zum Veröffentlichen oder Archivieren)
+
+    python3 -m duckday.website ~/Privat.duckday ~/Privat-Seiten [--jobs 8] [--full]
+    tagesgans-cli export Privat ~/Privat-Seiten --html
+
+Pro Tag eine Seite (Jahr/MM/TT.html, Medien in Jahr/MM/TT/), dazu
+Monats-, Jahres- und Label-Seiten und eine Startseite. Die Einträge
+werden wie im Reader dargestellt: Zeilenformat und Markup-Zeichen kommen
+aus markup.format_style und markup.token_display, die auch renderer.py
+benutzt; nur die Ausgabe (HTML statt QTextDocument) ist eigen, weil
+duckday ohne Qt laufen muss. Bilder werden verkleinert, wenn Pillow
+installiert ist, sonst kopiert.
+
+Der Export ist inkrementell: .tagesgans-site.json im Ziel merkt sich pro
+Tag eine Signatur aus mtime/Größe der Day.txt und aller Dateien im
+Tagesordner sowie den Nachbartagen (Vor/Zurück-Links). Neu gebaut werden
+nur Tage, deren Signatur sich geändert hat, verteilt auf mehrere
+Prozesse. Übersichtsseiten kommen aus der Statistik-Tabelle und werden
+nur geschrieben, wenn sich ihr Inhalt geändert hat.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+import sys
+from datetime import date
+from pathlib import Path
+from urllib.parse import quote
+
+from . import compression
+from .dateindex import DateIndex
+from .dates import month_label
+from .markup import format_style, parse, token_display
+from .stats import StatsTable
+from .trace import span
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+# Ändert sich das HTML, wird beim nächsten Export alles neu gebaut
+SITE_VERSION = 1
+MANIFEST = ".tagesgans-site.json"
+
+# Längste Bildkante auf den Seiten
+IMAGE_SIZE = 1200
+SCALED_EXTENSIONS = (".png", ".jpg", ".jpeg")
+IMAGE_EXTENSIONS = SCALED_EXTENSIONS + (".svg",)
+AUDIO_EXTENSIONS = (".mp3", ".ogg", ".opus")
+VIDEO_EXTENSIONS = (".mp4",)
+
+# Tage pro Auftrag an den Pool
+BATCH_SIZE = 32
+
+STYLE = """body { font-family: sans-serif; max-width: 800px; margin: 2em auto; padding: 0 1em; color: #222; }
+nav { display: flex; justify-content: space-between; margin: 1em 0; }
+a { color: #0066cc; text-decoration: none; }
+.entry p { margin: 0; }
+.entry img, .entry video { max-width: 100%; height: auto; border-radius: 8px; }
+.missing { color: #dc3545; }
+.snippet { color: #666; }
+ul.days li { margin: 0.4em 0; }
+"""
+
+
+def day_page(day):
+    """Seite eines Tages relativ zur Wurzel"""
+    return f"{day.year:04d}/{day.month:02d}/{day.day:02d}.html"
+
+
+def month_page(year, month):
+    return f"{year:04d}/{month:02d}/index.html"
+
+
+def label_page(label):
+    return f"labels/{label}.html"
+
+
+def line_style(line_format):
+    """CSS zu (Größe, FKUD, Farbe)"""
+    style = format_style(line_format)
+    css = [f"font-size: {style.size}pt", f"color: {style.color}"]
+    if style.bold:
+        css.append("font-weight: bold")
+    if style.italic:
+        css.append("font-style: italic")
+    decoration = [name for flag, name in ((style.underline, "underline"), (style.strike, "line-through")) if flag]
+    if decoration:
+        css.append("text-decoration: " + " ".join(decoration))
+    return "; ".join(css)
+
+
+def media_html(name, url):
+    ext = os.path.splitext(name)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return f'<br><img src="{url}" width="500" alt="{html.escape(name)}"><br>'
+    if ext in AUDIO_EXTENSIONS:
+        return f'<br><audio controls src="{url}"></audio><br>'
+    if ext in VIDEO_EXTENSIONS:
+        return f'<br><video controls width="500" src="{url}"></video><br>'
+    return f'<a href="{url}">🎬 [{html.escape(name)}]</a>'
+
+
+def render_html(parsed, media_urls, root=""):
+    """HTML eines ParsedEntry wie im Reader (renderer.render_lines)
+
+    media_urls: Dateiname → URL der vorhandenen Medien; root: Weg zur
+    Wurzel der Seiten (für Label-Links).
+    """
+    parts = ['<div class="entry">']
+    for line in parsed.lines:
+        if line.blank:
+            parts.append("<p>&nbsp;</p>")
+            continue
+        if not line.format:
+            parts.append(f"<p>{html.escape(line.tokens[0].value)}</p>")
+            continue
+        html_tokens = []
+        for kind, value in line.tokens:
+            if kind == "text":
+                html_tokens.append(html.escape(value))
+            elif kind == "media":
+                url = media_urls.get(value)
+                if url:
+                    html_tokens.append(media_html(value, url))
+                else:
+                    html_tokens.append(f'<span class="missing">⚠️ &lt;{html.escape(value)}&gt;</span>')
+            else:
+                text, color, background = token_display(kind, value)
+                css = f"color: {color}" if color else f"background: {background}"
+                text = html.escape(text)
+                if kind == "url":
+                    html_tokens.append(f'<a href="{html.escape(value)}" style="{css}">{text}</a>')
+                elif kind == "label":
+                    html_tokens.append(f'<a href="{root}{quote(label_page(value))}" style="{css}">{text}</a>')
+                else:
+                    html_tokens.append(f'<span style="{css}">{text}</span>')
+        parts.append(f'<p style="{line_style(line.format)}">{"".join(html_tokens)}</p>')
+    parts.append("</div>")
+    return "\n".join(parts)
+
+
+def page(title, body, root, language="Deutsch"):
+    """Vollständige HTML-Seite; root: Weg zur Wurzel ("", "../", ...)"""
+    lang = "de" if language == "Deutsch" else "en"
+    return (f'<!DOCTYPE html>\n<html lang="{lang}">\n<head>\n<meta charset="utf-8">\n'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+            f'<title>{html.escape(title)}</title>\n'
+            f'<link rel="stylesheet" href="{root}style.css">\n</head>\n<body>\n'
+            f'{body}\n</body>\n</html>\n')
+
+
+def write_if_changed(path, text):
+    """Schreibt nur bei anderem Inhalt (mtime bleibt für rsync & Co. stehen); True wenn geschrieben"""
+    data = text.encode("utf-8")
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def copy_media(source, target):
+    """Bilder verkleinert (mit Pillow), alles andere als Kopie"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if Image is not None and source.suffix.lower() in SCALED_EXTENSIONS:
+        try:
+            with Image.open(source) as image:
+                if max(image.size) > IMAGE_SIZE:
+                    image = ImageOps.exif_transpose(image)
+                    image.thumbnail((IMAGE_SIZE, IMAGE_SIZE))
+                    image.save(target)
+                    return
+        except OSError as e:
+            print(f"Bild nicht verkleinert ({source}): {e}")
+    shutil.copy2(source, target)
+
+
+def day_signature(day_file, previous, following):
+    """Ändert sich, wenn Day.txt, eine Datei im Tagesordner oder ein Nachbartag sich ändert"""
+    files = []
+    with os.scandir(Path(day_file).parent) as scan:
+        for entry in scan:
+            if entry.is_file():
+                stat = entry.stat()
+                files.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    files.sort()
+    key = repr((SITE_VERSION, files, str(previous), str(following)))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def build_day(target, day, day_file, previous, following, language="Deutsch"):
+    """Schreibt die Seite eines Tages samt Medien"""
+    parsed = parse(compression.read_text(day_file))
+    day_dir = Path(day_file).parent
+    media_dir = target / day_page(day)[:-len(".html")]
+
+    media_urls = {}
+    for name in parsed.media:
+        source = day_dir / name
+        if ".." in Path(name).parts or not source.is_file():
+            continue
+        copy_media(source, media_dir / name)
+        media_urls[name] = f"{day.day:02d}/{quote(name)}"
+    # Medien, die nicht mehr im Eintrag stehen
+    if media_dir.is_dir():
+        for path in sorted(media_dir.rglob("*"), reverse=True):
+            name = path.relative_to(media_dir).as_posix()
+            if path.is_file() and name not in media_urls:
+                path.unlink()
+            elif path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+
+    root = "../../"
+    nav = ['<nav>']
+    nav.append(f'<a href="{root}{day_page(previous)}">← {previous:%d.%m.%Y}</a>' if previous else "<span></span>")
+    nav.append(f'<a href="index.html">{month_label(day.month, language)} {day.year}</a>')
+    nav.append(f'<a href="{root}{day_page(following)}">{following:%d.%m.%Y} →</a>' if following else "<span></span>")
+    nav.append('</nav>')
+    nav = "\n".join(nav)
+    body = f'{nav}\n<h1>{day:%d.%m.%Y}</h1>\n{render_html(parsed, media_urls, root)}\n{nav}'
+    write_if_changed(target / day_page(day), page(f"{day:%d.%m.%Y}", body, root, language))
+
+
+def _build_batch(args):
+    """Ein Auftrag im Pool: mehrere Tage; gibt die fehlgeschlagenen Tage zurück"""
+    target, language, days = args
+    failed = []
+    for day, day_file, previous, following in days:
+        try:
+            build_day(target, day, day_file, previous, following, language)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"{day:%d.%m.%Y} nicht exportiert: {e}")
+            failed.append(day)
+    return failed
+
+
+def _day_list(days, stats, root):
+    items = []
+    for day in days:
+        snippet = html.escape(stats[day].snippet) if day in stats else ""
+        items.append(f'<li><a href="{root}{day_page(day)}">{day:%d.%m.%Y}</a> '
+                     f'<span class="snippet">{snippet}</span></li>')
+    return '<ul class="days">\n' + "\n".join(items) + "\n</ul>"
+
+
+def overview_pages(name, stats, language="Deutsch"):
+    """Start-, Jahres-, Monats- und Label-Seiten: {Pfad: HTML}"""
+    de = language == "Deutsch"
+    pages = {}
+    by_month = {}
+    by_label = {}
+    for day in sorted(stats):
+        by_month.setdefault((day.year, day.month), []).append(day)
+        for label in stats[day].labels:
+            by_label.setdefault(label, []).append(day)
+    years = sorted({year for year, _ in by_month})
+
+    # Startseite
+    items = []
+    for year in years:
+        count = sum(len(days) for (y, _), days in by_month.items() if y == year)
+        items.append(f'<li><a href="{year:04d}/index.html">{year}</a> ({count})</li>')
+    body = [f"<h1>{html.escape(name)}</h1>", "<ul>", *items, "</ul>"]
+    if by_label:
+        body.append(f"<h2>{'Label' if de else 'Labels'}</h2>")
+        body.append(" · ".join(f'<a href="{quote(label_page(label))}">#{html.escape(label)}</a> ({len(days)})'
+                               for label, days in sorted(by_label.items())))
+    pages["index.html"] = page(name, "\n".join(body), "", language)
+
+    # Jahre
+    for year in years:
+        items = [f'<li><a href="{month:02d}/index.html">{month_label(month, language)}</a> ({len(days)})</li>'
+                 for (y, month), days in sorted(by_month.items()) if y == year]
+        body = f'<nav><a href="../index.html">{html.escape(name)}</a></nav>\n<h1>{year}</h1>\n<ul>\n' + "\n".join(items) + "\n</ul>"
+        pages[f"{year:04d}/index.html"] = page(f"{name} {year}", body, "../", language)
+
+    # Monate
+    months = sorted(by_month)
+    for number, (year, month) in enumerate(months):
+        root = "../../"
+        nav = ['<nav>']
+        if number > 0:
+            y, m = months[number - 1]
+            nav.append(f'<a href="{root}{month_page(y, m)}">← {month_label(m, language)} {y}</a>')
+        else:
+            nav.append("<span></span>")
+        nav.append(f'<a href="../index.html">{year}</a>')
+        if number + 1 < len(months):
+            y, m = months[number + 1]
+            nav.append(f'<a href="{root}{month_page(y, m)}">{month_label(m, language)} {y} →</a>')
+        else:
+            nav.append("<span></span>")
+        nav.append('</nav>')
+        title = f"{month_label(month, language)} {year}"
+        body = "\n".join(nav) + f"\n<h1>{title}</h1>\n" + _day_list(by_month[(year, month)], stats, root)
+        pages[month_page(year, month)] = page(f"{name} – {title}", body, root, language)
+
+    # Label
+    for label, days in by_label.items():
+        body = (f'<nav><a href="../index.html">{html.escape(name)}</a></nav>\n'
+                f"<h1>#{html.escape(label)}</h1>\n" + _day_list(days, stats, "../"))
+        pages[label_page(label)] = page(f"{name} – #{label}", body, "../", language)
+    return pages
+
+
+def load_manifest(target):
+    try:
+        with open(target / MANIFEST, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def export_site(diary, target, jobs=None, full=False, language="Deutsch", progress=None):
+    """Exportiert bzw. aktualisiert die Seiten; gibt (neu gebaute Tage, Tage) zurück
+
+    progress(erledigt, gesamt) wird nach jedem Paket aufgerufen.
+    """
+    diary = Path(diary)
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+
+    manifest = load_manifest(target)
+    if full or manifest.get("version") != SITE_VERSION or manifest.get("language") != language:
+        manifest = {}
+    known = manifest.get("days", {})
+
+    with span("HTML-Export", diary=diary.name):
+        index = DateIndex.open(diary)
+        entries = index.entries()
+
+        # Welche Tage haben sich geändert?
+        signatures = {}
+        todo = []
+        for number, entry in enumerate(entries):
+            previous = entries[number - 1].date if number > 0 else None
+            following = entries[number + 1].date if number + 1 < len(entries) else None
+            iso = entry.date.isoformat()
+            try:
+                signature = day_signature(entry.day_file, previous, following)
+            except OSError:
+                # Gerade nicht lesbar: Seite behalten, nächstes Mal wieder prüfen
+                if iso in known:
+                    signatures[iso] = known[iso]
+                continue
+            signatures[iso] = signature
+            if known.get(iso) != signature:
+                todo.append((entry.date, entry.day_file, previous, following))
+
+        # Gelöschte Tage
+        for iso in set(known) - set(signatures):
+            page_path = target / day_page(date.fromisoformat(iso))
+            if page_path.exists():
+                page_path.unlink()
+            shutil.rmtree(page_path.with_suffix(""), ignore_errors=True)
+
+        batches = [todo[i:i + BATCH_SIZE] for i in range(0, len(todo), BATCH_SIZE)]
+        done = 0
+        failed = []
+        if len(batches) > 1 and jobs != 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 2) as executor:
+                for batch, errors in zip(batches, executor.map(_build_batch, [(target, language, batch) for batch in batches])):
+                    failed.extend(errors)
+                    done += len(batch)
+                    if progress:
+                        progress(done, len(todo))
+        else:
+            for batch in batches:
+                failed.extend(_build_batch((target, language, batch)))
+                done += len(batch)
+                if progress:
+                    progress(done, len(todo))
+        # Fehlgeschlagene Tage beim nächsten Export erneut bauen
+        for day in failed:
+            iso = day.isoformat()
+            if iso in known:
+                signatures[iso] = known[iso]
+            else:
+                del signatures[iso]
+
+        # Übersichtsseiten aus der Statistik (liest nur geänderte Tage)
+        stats = StatsTable.open(diary, index).days
+        pages = overview_pages(diary.stem, stats, language)
+        pages["style.css"] = STYLE
+        for path, text in pages.items():
+            write_if_changed(target / path, text)
+        for path in set(manifest.get("pages", [])) - set(pages):
+            try:
+                (target / path).unlink()
+            except FileNotFoundError:
+                pass
+
+        manifest = {"version": SITE_VERSION, "language": language,
+                    "days": signatures, "pages": sorted(pages)}
+        tmp = target / (MANIFEST + ".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, target / MANIFEST)
+    return len(todo), len(signatures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exportiert ein Tagebuch als statische HTML-Seiten")
+    parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    parser.add_argument("target", help="Zielordner der Seiten")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--full", action="store_true", help="alle Tage neu bauen")
+    parser.add_argument("--language", choices=("Deutsch", "English"), default="Deutsch")
+    args = parser.parse_args(argv)
+
+    diary = Path(args.diary).expanduser()
+    if not diary.is_dir():
+        print(f"Kein Tagebuch gefunden: {diary}")
+        return 2
+    target = Path(args.target).expanduser()
+    built, total = export_site(diary, target, args.jobs, args.full, args.language)
+    print(f"{built} von {total} Tagen neu gebaut: {target / 'index.html'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
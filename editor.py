@@ -7,20 +7,34 @@ Version: 0.0.2
 """
 
 import sys
-import os
-import json
-import re
-import shutil
-import urllib.request
 from pathlib import Path
 from datetime import datetime
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QLabel, QTextEdit, QToolBar, QAction, QFileDialog,
-                             QColorDialog, QSpinBox, QComboBox, QDialog, QFormLayout,
-                             QDialogButtonBox, QListWidget, QListWidgetItem, QMessageBox,
-                             QCalendarWidget, QLineEdit, QInputDialog, QPlainTextEdit)
-from PyQt5.QtCore import Qt, QUrl, QDate, QMimeData
-from PyQt5.QtGui import QFont, QColor, QTextCharFormat, QIcon, QTextCursor
+
+from duckday.startup import StartupReport
+
+startup = StartupReport.from_argv(sys.argv)
+
+with startup.phase("import PyQt5"):
+    from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                                 QPushButton, QLabel, QToolBar, QFileDialog,
+                                 QSpinBox, QComboBox, QDialog, QFormLayout,
+                                 QDialogButtonBox, QListWidget, QListWidgetItem, QMessageBox,
+                                 QCalendarWidget, QLineEdit, QInputDialog, QPlainTextEdit,
+                                 QSplitter)
+    from PyQt5.QtCore import Qt, QDate
+    from PyQt5.QtGui import QFont, QIcon
+
+with startup.phase("import duckday"):
+    from duckday import DiaryCache, load_settings
+    from duckday import compression
+    from duckday.dates import day_folder
+    from duckday.storage import FolderStorage
+    from duckday.trace import enable_from_settings, span, traced
+    from duckday.templates import create_diary
+    from highlighter import MarkupHighlighter
+    from palette import attach_quick_open
+    from preview import PreviewPane
+    from qtutil import after_first_paint, trace_overlay
 
 
 class DatePickerDialog(QDialog):
@@ -137,10 +151,12 @@ class CreateDiaryDialog(QDialog):
 class DiaryEditor(QMainWindow):
     """Hauptfenster des Tagebuch-Editors"""
     
-    def __init__(self, config_file, mode="edit"):
+    def __init__(self, config_file, mode="edit", settings=None, cache=None):
         super().__init__()
         self.config_file = Path(config_file)
-        self.settings = self.load_settings()
+        # Aus tagesgans.py gestartet: Einstellungen und Cache werden geteilt
+        self.settings = settings if settings is not None else load_settings(self.config_file)
+        self.cache = cache if cache is not None else DiaryCache()
         self.mode = mode
         self.current_diary = None
         self.current_entry = None
@@ -150,32 +166,19 @@ class DiaryEditor(QMainWindow):
         self.vcards = {}
         self.kmls = {}
         self.media_files = []
+        enable_from_settings(self.settings)
         
         self.init_ui()
+        self.trace_overlay = trace_overlay(self)
+        if mode == "edit":
+            self.quick_open = attach_quick_open(self, self.quick_index, self.on_quick_open,
+                                                self.settings["language"])
         
         if mode == "create":
             self.create_new_diary()
         else:
-            self.scan_diaries()
-    
-    def load_settings(self):
-        """Lädt Einstellungen"""
-        default_settings = {
-            "language": "Deutsch",
-            "default_format": "{20|fkud|Schwarz}",
-            "toolbar_position": "Oben"
-        }
-        
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    default_settings.update(loaded)
-                    return default_settings
-            except Exception as e:
-                print(f"Fehler beim Laden der Config: {e}")
-                return default_settings
-        return default_settings
+            # Home-Scan erst nach dem ersten Zeichnen
+            after_first_paint(self, self.scan_diaries)
     
     def init_ui(self):
         """Initialisiert die UI"""
@@ -222,8 +225,14 @@ class DiaryEditor(QMainWindow):
         # Monospace Font für Markup
         font = QFont("Monospace", 12)
         self.text_edit.setFont(font)
+        self.highlighter = MarkupHighlighter(self.text_edit.document(), self.media_exists)
         
-        main_layout.addWidget(self.text_edit)
+        # Vorschau wie im Reader, rechts daneben
+        self.preview = PreviewPane(self.text_edit, self.preview_media_dir)
+        splitter = QSplitter(Qt.Horizontal)
+        splitter.addWidget(self.text_edit)
+        splitter.addWidget(self.preview)
+        main_layout.addWidget(splitter)
         
         # Speichern Button
         save_btn = QPushButton("Speichern" if lang == "Deutsch" else "Save")
@@ -282,6 +291,14 @@ class DiaryEditor(QMainWindow):
         media_btn = QPushButton("+ Medien")
         media_btn.clicked.connect(self.insert_media)
         toolbar.addWidget(media_btn)
+        
+        toolbar.addSeparator()
+        
+        preview_btn = QPushButton("Vorschau" if self.settings["language"] == "Deutsch" else "Preview")
+        preview_btn.setCheckable(True)
+        preview_btn.setChecked(True)
+        preview_btn.toggled.connect(self.preview.setVisible)
+        toolbar.addWidget(preview_btn)
     
     def insert_format(self):
         """Fügt Format-Tag ein"""
@@ -402,8 +419,25 @@ class DiaryEditor(QMainWindow):
         
         for file in files:
             filename = Path(file).name
-            self.text_edit.insertPlainText(f"<{filename}>")
             self.media_files.append(file)
+            self.highlighter.media_added(filename)
+            self.text_edit.insertPlainText(f"<{filename}>")
+    
+    def preview_media_dir(self):
+        """Tagesordner des bearbeiteten Eintrags (Bilder in der Vorschau)"""
+        if self.current_entry:
+            return self.current_entry.parent
+        if self.current_diary and self.current_date:
+            day = self.current_date.date()
+            existing = self.cache.lookup(self.current_diary, day)
+            return existing.parent if existing else day_folder(self.current_diary, day)
+        return None
+    
+    def media_exists(self, name):
+        """<Datei> liegt im Tagesordner oder wird beim Speichern kopiert"""
+        if any(Path(media_file).name == name for media_file in self.media_files):
+            return True
+        return bool(self.current_entry) and compression.exists(self.current_entry.parent / name)
     
     def drag_enter_event(self, event):
         """Drag Enter Event"""
@@ -420,18 +454,17 @@ class DiaryEditor(QMainWindow):
             file_path = Path(file)
             if file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.svg', '.mp3', '.ogg', '.opus', '.mp4']:
                 filename = file_path.name
-                self.text_edit.insertPlainText(f"<{filename}>")
                 self.media_files.append(str(file_path))
+                self.highlighter.media_added(filename)
+                self.text_edit.insertPlainText(f"<{filename}>")
     
+    @traced("Editor: Tagebuchliste")
     def scan_diaries(self):
         """Scannt nach .duckday Ordnern"""
         self.diary_combo.clear()
-        home = Path.home()
         
-        for duckday_dir in home.rglob("*.duckday"):
-            if duckday_dir.is_dir():
-                diary_name = duckday_dir.stem
-                self.diary_combo.addItem(diary_name, str(duckday_dir))
+        for duckday_dir in self.cache.diaries():
+            self.diary_combo.addItem(duckday_dir.stem, str(duckday_dir))
     
     def on_diary_selected(self, index):
         """Wird aufgerufen wenn ein Tagebuch ausgewählt wurde"""
@@ -439,6 +472,7 @@ class DiaryEditor(QMainWindow):
             self.current_diary = Path(self.diary_combo.itemData(index))
             self.load_entries()
     
+    @traced("Editor: Einträge laden")
     def load_entries(self):
         """Lädt alle Einträge"""
         self.entry_list.clear()
@@ -446,32 +480,44 @@ class DiaryEditor(QMainWindow):
         if not self.current_diary:
             return
         
-        entries = []
-        for year_dir in sorted(self.current_diary.glob("*")):
-            if year_dir.is_dir() and year_dir.name.isdigit():
-                for month_dir in sorted(year_dir.glob("*")):
-                    if month_dir.is_dir():
-                        for day_dir in sorted(month_dir.glob("*")):
-                            if day_dir.is_dir():
-                                day_file = day_dir / "Day.txt"
-                                if day_file.exists():
-                                    date_str = f"{day_dir.name}.{month_dir.name}.{year_dir.name}"
-                                    entries.append((date_str, day_file))
-        
-        for date_str, day_file in reversed(sorted(entries)):
-            item = QListWidgetItem(date_str)
-            item.setData(Qt.UserRole, str(day_file))
+        # Chronologisch (neueste zuerst), unabhängig von Monatsnamen
+        for entry in reversed(self.cache.entries(self.current_diary)):
+            item = QListWidgetItem(entry.date.strftime("%d.%m.%Y"))
+            item.setData(Qt.UserRole, str(entry.day_file))
             self.entry_list.addItem(item)
     
+    @traced("Eintrag zum Bearbeiten laden")
     def on_entry_selected(self, item):
         """Lädt einen Eintrag zum Bearbeiten"""
         day_file = Path(item.data(Qt.UserRole))
         self.current_entry = day_file
         
-        with open(day_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with span("Datei lesen", file=day_file):
+            content = compression.read_text(day_file)
         
-        self.text_edit.setPlainText(content)
+        self.highlighter.reset_media()
+        with span("Hervorheben", lines=content.count("\n") + 1):
+            self.text_edit.setPlainText(content)
+        self.preview.reset()
+        self.cache.set_open_day(self, day_file.parent)
+    
+    def quick_index(self):
+        """Schnellsuche im gewählten Tagebuch"""
+        if not self.current_diary:
+            return None
+        return self.cache.quick_index([self.current_diary])
+    
+    def on_quick_open(self, result):
+        """Lädt den Tag eines Treffers aus der Schnellsuche"""
+        day_file = self.cache.lookup(self.current_diary, result.day)
+        if day_file is None:
+            return
+        for row in range(self.entry_list.count()):
+            item = self.entry_list.item(row)
+            if item.data(Qt.UserRole) == str(day_file):
+                self.entry_list.setCurrentItem(item)
+                self.on_entry_selected(item)
+                return
     
     def new_entry(self):
         """Erstellt einen neuen Eintrag"""
@@ -482,11 +528,16 @@ class DiaryEditor(QMainWindow):
         dialog = DatePickerDialog(self, self.settings["language"])
         if dialog.exec_() == QDialog.Accepted:
             self.current_date = dialog.get_date()
+            self.highlighter.reset_media()
             self.text_edit.clear()
             
             # Standardformatierung einfügen
             default_format = self.settings.get("default_format", "{20|fkud|Schwarz}")
             self.text_edit.setPlainText(default_format + "\n")
+            self.preview.reset()
+            day = self.current_date.date()
+            existing = self.cache.lookup(self.current_diary, day)
+            self.cache.set_open_day(self, existing.parent if existing else day_folder(self.current_diary, day))
     
     def create_new_diary(self):
         """Erstellt ein neues Tagebuch"""
@@ -499,38 +550,12 @@ class DiaryEditor(QMainWindow):
                 self.close()
                 return
             
-            # Tagebuch-Ordner erstellen
-            diary_path = info["path"] / f"{info['name']}.duckday"
-            diary_path.mkdir(parents=True, exist_ok=True)
-            
-            # Info.txt herunterladen
-            try:
-                info_url = "https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/refs/heads/main/Info.txt"
-                info_file = diary_path / "Info.txt"
-                urllib.request.urlretrieve(info_url, info_file)
-            except:
-                with open(diary_path / "Info.txt", 'w') as f:
-                    f.write("This is a Tagesgans diary.\n")
-            
-            # Install.sh herunterladen
-            try:
-                install_url = "https://raw.githubusercontent.com/Change-Goose-Open-Surce-Software/Tagesgans/refs/heads/main/Install.sh"
-                install_file = diary_path / "Install.sh"
-                urllib.request.urlretrieve(install_url, install_file)
-                install_file.chmod(0o755)
-            except:
-                pass
-            
-            # Icon kopieren
-            if info["icon"]:
-                shutil.copy(info["icon"], diary_path / "Icon.png")
-            else:
-                # Standard-Icon verwenden
-                icon_src = Path.home() / ".local" / "share" / "icons" / "Goose" / "tagesgans.png"
-                if icon_src.exists():
-                    shutil.copy(icon_src, diary_path / "Icon.png")
+            # Ordner, Info.txt/Install.sh aus den Vorlagen und Icon
+            diary_path = create_diary(info["path"], info["name"], info["icon"],
+                                      self.settings.get("update_templates"))
             
             self.current_diary = diary_path
+            self.cache.add_diary(diary_path)
             
             # Ersten Eintrag erstellen
             self.new_entry()
@@ -543,60 +568,79 @@ class DiaryEditor(QMainWindow):
             QMessageBox.warning(self, "Fehler", "Kein Tagebuch ausgewählt!")
             return
         
+        storage = FolderStorage(self.current_diary, self.cache.date_index(self.current_diary))
+        
         # Datum bestimmen
+        day = None
+        folder = None
         if self.current_entry:
-            entry_dir = self.current_entry.parent
+            folder = storage.folder(self.current_entry)
+        elif not self.current_date:
+            QMessageBox.warning(self, "Fehler", "Kein Datum ausgewählt!")
+            return
         else:
-            if not self.current_date:
-                QMessageBox.warning(self, "Fehler", "Kein Datum ausgewählt!")
-                return
-            
-            year_dir = self.current_diary / str(self.current_date.year)
-            month_dir = year_dir / self.current_date.strftime("%B")
-            day_dir = month_dir / f"{self.current_date.day:02d}"
-            entry_dir = day_dir
-            entry_dir.mkdir(parents=True, exist_ok=True)
+            # Vorhandenen Tag (auch in alten Monatsnamen-Ordnern) weiterverwenden,
+            # neue Tage kommen nach Jahr/MM/TT
+            day = self.current_date.date()
         
-        # Day.txt speichern
-        day_file = entry_dir / "Day.txt"
-        content = self.text_edit.toPlainText()
+        day_file = self.write_entry(storage, day, folder)
+        self.cache.entry_saved(self.current_diary, day, day_file)
         
-        with open(day_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+        QMessageBox.information(self, "Gespeichert", "Eintrag wurde gespeichert!")
+        
+        if self.mode == "edit":
+            self.load_entries()
+    
+    @traced("Speichern")
+    def write_entry(self, storage, day, folder=None):
+        """Schreibt Day.txt und kopiert vCards, KMLs und Medien"""
+        day_file = storage.write_entry(day, self.text_edit.toPlainText(), folder)
         
         # vCards kopieren
         for name, vcard_file in self.vcards.items():
-            shutil.copy(vcard_file, entry_dir / f"{name}.vcard")
+            storage.copy_attachment(day_file, f"{name}.vcard", vcard_file)
         self.vcards = {}
         
         # KMLs kopieren
         for name, kml_file in self.kmls.items():
-            shutil.copy(kml_file, entry_dir / f"{name}.kml")
+            storage.copy_attachment(day_file, f"{name}.kml", kml_file)
         self.kmls = {}
         
         # Medien kopieren
         for media_file in self.media_files:
-            shutil.copy(media_file, entry_dir / Path(media_file).name)
+            storage.copy_attachment(day_file, Path(media_file).name, media_file)
         self.media_files = []
+        storage.commit()
         
-        QMessageBox.information(self, "Gespeichert", "Eintrag wurde gespeichert!")
-        
-        if self.mode == "edit":
-            self.load_entries()
+        return day_file
+    
+    def closeEvent(self, event):
+        """Tag freigeben (Archivmodus darf ihn wieder komprimieren)"""
+        self.cache.set_open_day(self, None)
+        super().closeEvent(event)
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: editor.py <config_file> [edit|create]")
+    argv = StartupReport.strip_flag(sys.argv)
+    if len(argv) < 2:
+        print("Usage: editor.py <config_file> [edit|create] [--startup-report]")
         sys.exit(1)
     
-    mode = sys.argv[2] if len(sys.argv) > 2 else "edit"
-    
-    app = QApplication(sys.argv)
-    app.setApplicationName("DuckDiary")
-    
-    editor = DiaryEditor(sys.argv[1], mode)
-    editor.show()
+    mode = argv[2] if len(argv) > 2 else "edit"
+    
+    with startup.phase("QApplication"):
+        app = QApplication(argv)
+        app.setApplicationName("DuckDiary")
+    
+    with startup.phase("Editor aufbauen"):
+        editor = DiaryEditor(argv[1], mode)
+    # Abgebrochenes Erstellen: kein leeres Fenster anzeigen
+    if mode == "create" and not editor.current_diary:
+        sys.exit(0)
+    with startup.phase("Editor anzeigen"):
+        editor.show()
+    if startup.enabled:
+        after_first_paint(editor, startup.finish)
     
     sys.exit(app.exec_())
 
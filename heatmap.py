@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Jahresübersicht als Heatmap (ein Kästchen pro Tag)
+
+Die Werte kommen aus duckday.stats; beim Jahreswechsel werden nur die
+Kästchen neu berechnet, keine Day.txt gelesen.
+"""
+
+from datetime import date, timedelta
+
+from PyQt5.QtWidgets import (QWidget, QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QLabel, QComboBox, QToolTip)
+from PyQt5.QtCore import Qt, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QFont
+
+from duckday.dates import month_label
+from duckday.stats import day_value
+
+# Leerer Tag, dann 4 Stufen von wenig nach viel
+LEVEL_COLORS = ["#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39"]
+LABEL_COLOR = "#fd7e14"
+WEEKDAYS_DE = ["Mo", "", "Mi", "", "Fr", "", ""]
+WEEKDAYS_EN = ["Mon", "", "Wed", "", "Fri", "", ""]
+
+
+def levels(values):
+    """Grenzen für 4 Farbstufen aus den Werten eines Jahres (Quartile)"""
+    values = sorted(v for v in values if v > 0)
+    if not values:
+        return []
+    return [values[min(len(values) - 1, len(values) * i // 4)] for i in (1, 2, 3)]
+
+
+class HeatmapWidget(QWidget):
+    """Kalender eines Jahres, Wochen als Spalten, Wochentage als Zeilen"""
+
+    day_clicked = pyqtSignal(object)
+
+    CELL = 12
+    GAP = 2
+    LEFT = 30
+    TOP = 18
+
+    def __init__(self, parent=None, language="Deutsch"):
+        super().__init__(parent)
+        self.language = language
+        self.cells = []      # (QRect, QColor, date, DayStats oder None)
+        self.months = []     # (x, Monatsname)
+        self.setMouseTracking(True)
+        self.setFont(QFont(self.font().family(), 8))
+
+    def sizeHint(self):
+        step = self.CELL + self.GAP
+        return QSize(self.LEFT + 54 * step, self.TOP + 7 * step)
+
+    def set_year(self, year, days, metric="words", label=None):
+        """Berechnet Farben und Positionen aller Tage eines Jahres"""
+        step = self.CELL + self.GAP
+        values = {day: day_value(stats, metric, label) for day, stats in days.items()}
+        bounds = levels(values.values())
+
+        self.cells = []
+        self.months = []
+        first = date(year, 1, 1)
+        offset = first.weekday()
+        day = first
+        while day.year == year:
+            index = (day - first).days + offset
+            column, row = divmod(index, 7)
+            rect = QRect(self.LEFT + column * step, self.TOP + row * step, self.CELL, self.CELL)
+            value = values.get(day, 0)
+            if metric == "label":
+                color = LABEL_COLOR if value else LEVEL_COLORS[0]
+            else:
+                color = LEVEL_COLORS[sum(1 for bound in bounds if value >= bound) + 1 if value else 0]
+            self.cells.append((rect, QColor(color), day, days.get(day)))
+            if day.day == 1:
+                self.months.append((rect.x(), month_label(day.month, self.language)[:3]))
+            day += timedelta(days=1)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(self.palette().text().color())
+        for x, name in self.months:
+            painter.drawText(x, self.TOP - 5, name)
+        weekdays = WEEKDAYS_EN if self.language == "English" else WEEKDAYS_DE
+        step = self.CELL + self.GAP
+        for row, name in enumerate(weekdays):
+            if name:
+                painter.drawText(0, self.TOP + row * step + self.CELL - 2, name)
+
+        painter.setPen(Qt.NoPen)
+        for rect, color, _, _ in self.cells:
+            if rect.intersects(event.rect()):
+                painter.fillRect(rect, color)
+
+    def cell_at(self, pos):
+        for cell in self.cells:
+            if cell[0].contains(pos):
+                return cell
+        return None
+
+    def mouseMoveEvent(self, event):
+        cell = self.cell_at(event.pos())
+        if cell is None:
+            QToolTip.hideText()
+            return
+        _, _, day, stats = cell
+        text = day.strftime("%d.%m.%Y")
+        if stats:
+            if self.language == "Deutsch":
+                text += f"\n{stats.words} Wörter, {stats.media} Medien"
+            else:
+                text += f"\n{stats.words} words, {stats.media} media"
+            if stats.labels:
+                text += "\n" + " ".join(f"#{label}" for label in stats.labels)
+        QToolTip.showText(event.globalPos(), text, self)
+
+    def mousePressEvent(self, event):
+        cell = self.cell_at(event.pos())
+        if cell is not None and cell[3] is not None and event.button() == Qt.LeftButton:
+            self.day_clicked.emit(cell[2])
+
+
+class HeatmapDialog(QDialog):
+    """Jahresübersicht eines Tagebuchs; Klick auf einen Tag öffnet ihn"""
+
+    def __init__(self, stats, open_day, parent=None, language="Deutsch"):
+        super().__init__(parent)
+        self.stats = stats
+        self.open_day = open_day
+        self.language = language
+        self.years = stats.years() or [date.today().year]
+        self.year = self.years[-1]
+        self.setWindowTitle("Jahresübersicht" if language == "Deutsch" else "Year overview")
+        self.init_ui()
+        self.show_year()
+
+    def init_ui(self):
+        lang = self.language
+        layout = QVBoxLayout()
+
+        controls = QHBoxLayout()
+        self.prev_button = QPushButton("◀")
+        self.prev_button.setShortcut("Left")
+        self.prev_button.clicked.connect(lambda: self.step_year(-1))
+        controls.addWidget(self.prev_button)
+
+        self.year_label = QLabel()
+        year_font = QFont()
+        year_font.setBold(True)
+        self.year_label.setFont(year_font)
+        controls.addWidget(self.year_label)
+
+        self.next_button = QPushButton("▶")
+        self.next_button.setShortcut("Right")
+        self.next_button.clicked.connect(lambda: self.step_year(1))
+        controls.addWidget(self.next_button)
+        controls.addStretch()
+
+        self.metric_combo = QComboBox()
+        for key, de, en in (("words", "Wörter", "Words"), ("media", "Medien", "Media"),
+                            ("label", "Label", "Label")):
+            self.metric_combo.addItem(de if lang == "Deutsch" else en, key)
+        self.metric_combo.currentIndexChanged.connect(self.show_year)
+        controls.addWidget(self.metric_combo)
+
+        self.label_combo = QComboBox()
+        self.label_combo.addItems(self.stats.labels())
+        self.label_combo.currentIndexChanged.connect(self.show_year)
+        self.label_combo.setVisible(False)
+        controls.addWidget(self.label_combo)
+        layout.addLayout(controls)
+
+        self.heatmap = HeatmapWidget(self, lang)
+        self.heatmap.day_clicked.connect(self.open_day)
+        layout.addWidget(self.heatmap)
+
+        self.summary = QLabel()
+        layout.addWidget(self.summary)
+        self.setLayout(layout)
+
+    def step_year(self, delta):
+        """Springt zum vorherigen/nächsten Jahr mit Einträgen"""
+        position = self.years.index(self.year) + delta
+        if 0 <= position < len(self.years):
+            self.year = self.years[position]
+            self.show_year()
+
+    def show_year(self):
+        metric = self.metric_combo.currentData()
+        self.label_combo.setVisible(metric == "label")
+        days = self.stats.year(self.year)
+        self.heatmap.set_year(self.year, days, metric, self.label_combo.currentText())
+
+        self.year_label.setText(str(self.year))
+        position = self.years.index(self.year)
+        self.prev_button.setEnabled(position > 0)
+        self.next_button.setEnabled(position + 1 < len(self.years))
+
+        words = sum(stats.words for stats in days.values())
+        if self.language == "Deutsch":
+            self.summary.setText(f"{len(days)} Einträge, {words} Wörter")
+        else:
+            self.summary.setText(f"{len(days)} entries, {words} words")
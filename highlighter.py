@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Hervorhebung des Markups im Editor
+
+Qt ruft highlightBlock nur für geänderte Zeilen auf. Der Blockzustand
+ist die Nummer des gerade gültigen {Format}s (-1: noch keins); Qt färbt
+nach einer Änderung nur so lange weiter, bis der Zustand einer Zeile
+wieder gleich bleibt, also höchstens bis zum nächsten {Format}.
+Kaputte §Zeitstempel, fehlende <Medien> und fehlerhafte {Formate}
+werden rot unterkringelt.
+"""
+
+from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+
+from duckday.markup import TOKEN_RE, parse_format, timestamp_valid
+
+# Wie im Reader (renderer.py)
+TOKEN_COLORS = {
+    "person": "#0066cc", "place": "#28a745", "copy": "#8a6d00", "time": "#6f42c1",
+    "label": "#fd7e14", "media": "#17a2b8", "url": "#0066cc",
+}
+FORMAT_COLOR = "#888888"
+INVALID_COLOR = "#dc3545"
+
+
+def _styles():
+    """QTextCharFormat pro Markup-Art"""
+    styles = {}
+    for kind, color in TOKEN_COLORS.items():
+        style = QTextCharFormat()
+        style.setForeground(QColor(color))
+        styles[kind] = style
+    styles["copy"].setBackground(QColor("#ffffcc"))
+
+    style = QTextCharFormat()
+    style.setForeground(QColor(FORMAT_COLOR))
+    style.setFontWeight(QFont.Bold)
+    styles["format"] = style
+
+    style = QTextCharFormat()
+    style.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
+    style.setUnderlineColor(QColor(INVALID_COLOR))
+    style.setForeground(QColor(INVALID_COLOR))
+    styles["invalid"] = style
+    return styles
+
+
+class MarkupHighlighter(QSyntaxHighlighter):
+    """Färbt {Format}, @, %, §, =, '…', <…> und Links ein
+
+    media_exists(name) sagt, ob eine <Datei> zum Eintrag gehört; das
+    Ergebnis wird pro Name gemerkt, bis reset_media() aufgerufen wird.
+    """
+
+    def __init__(self, document, media_exists=None):
+        super().__init__(document)
+        self.media_exists = media_exists
+        self.styles = _styles()
+        self._media = {}
+        self._states = {}     # (Größe, FKUD, Farbe) → Blockzustand
+        self._bases = []      # Blockzustand → Schrift für normalen Text
+        self._merged = {}     # (Blockzustand, Art) → Schrift
+
+    def reset_media(self, rehighlight=False):
+        """Anderer Eintrag oder neue Medien: Dateien neu prüfen"""
+        self._media.clear()
+        if rehighlight:
+            self.rehighlight()
+
+    def media_added(self, name):
+        self._media[name] = True
+
+    def _has_media(self, name):
+        found = self._media.get(name)
+        if found is None:
+            found = self._media[name] = self.media_exists is None or bool(self.media_exists(name))
+        return found
+
+    def _state(self, line_format):
+        """Blockzustand zu einem Format; FKUD wird als Schrift übernommen"""
+        state = self._states.get(line_format)
+        if state is None:
+            state = self._states[line_format] = len(self._bases)
+            _, style, _ = line_format
+            base = QTextCharFormat()
+            base.setFontWeight(QFont.Bold if 'F' in style else QFont.Normal)
+            base.setFontItalic('K' in style)
+            base.setFontUnderline('U' in style)
+            base.setFontStrikeOut('D' in style)
+            self._bases.append(base)
+        return state
+
+    def _style(self, state, kind):
+        key = (state, kind)
+        style = self._merged.get(key)
+        if style is None:
+            style = self._merged[key] = QTextCharFormat(self._bases[state])
+            style.merge(self.styles[kind])
+        return style
+
+    def highlightBlock(self, text):
+        state = self.previousBlockState()
+        line_format, end = parse_format(text)
+        if line_format:
+            state = self._state(line_format)
+            self.setFormat(0, end, self.styles["format"])
+        elif text.startswith("{") and "|" in text.split("}", 1)[0]:
+            # Sieht aus wie ein Format, ist aber keins
+            self.setFormat(0, text.find("}") + 1 or len(text), self.styles["invalid"])
+        self.setCurrentBlockState(state)
+
+        # Ohne Format zeigt der Reader die Zeile als Text: kein Markup
+        if state < 0 or end == len(text):
+            return
+        self.setFormat(end, len(text) - end, self._bases[state])
+        for match in TOKEN_RE.finditer(text, end):
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == "time" and not timestamp_valid(value):
+                kind = "invalid"
+            elif kind == "media" and not self._has_media(value):
+                kind = "invalid"
+            self.setFormat(match.start(), match.end() - match.start(), self._style(state, kind))
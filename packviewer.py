@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - gepacktes Tagebuch (.duckpack) oder SQLite-Tagebuch (.duckdb) lesen
+
+Nur lesend: Einträge kommen aus der Ablage (duckday.pack bzw.
+duckday.storage), die Anhänge eines Tages werden erst beim Anzeigen in
+den Cache entpackt. Die Suche nimmt die Volltextsuche der Ablage.
+"""
+
+import os
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QTreeWidget, QTreeWidgetItem, QLineEdit,
+                             QTextBrowser, QSplitter, QApplication, QMessageBox, QLabel)
+from PyQt5.QtCore import Qt, QUrl
+from PyQt5.QtGui import QDesktopServices
+
+from duckday.dates import month_label
+from duckday.trace import traced
+from renderer import render_document
+
+
+class PackViewerDialog(QDialog):
+    """Baum Jahr/Monat/Tag (oder Suchtreffer) links, Eintrag rechts"""
+
+    def __init__(self, pack, parent=None, language="Deutsch"):
+        super().__init__(parent)
+        self.pack = pack
+        self.language = language
+        self.media_dir = None
+        self.setWindowTitle(f"📦 {pack.name}")
+        self.setMinimumSize(900, 600)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.init_ui()
+        self.fill_tree()
+
+    def init_ui(self):
+        lang = self.language
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Tagebuch nur lesen" if lang == "Deutsch" else "Diary (read-only)"))
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Suchen …" if lang == "Deutsch" else "Search …")
+        self.search_edit.returnPressed.connect(self.search)
+        layout.addWidget(self.search_edit)
+
+        splitter = QSplitter(Qt.Horizontal)
+        self.entry_tree = QTreeWidget()
+        self.entry_tree.setHeaderLabels(["Datum" if lang == "Deutsch" else "Date"])
+        self.entry_tree.currentItemChanged.connect(self.on_item_changed)
+        splitter.addWidget(self.entry_tree)
+
+        self.text_browser = QTextBrowser()
+        self.text_browser.setOpenLinks(False)
+        self.text_browser.anchorClicked.connect(self.on_link_clicked)
+        splitter.addWidget(self.text_browser)
+        splitter.setSizes([250, 650])
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+
+    @traced("Paket: Einträge auflisten")
+    def fill_tree(self, entries=None):
+        """Neueste Jahre oben, Tage chronologisch"""
+        self.entry_tree.clear()
+        years = {}
+        months = {}
+        for entry in (self.pack.entries() if entries is None else sorted(entries, key=lambda e: e.date)):
+            year_item = years.get(entry.year)
+            if year_item is None:
+                year_item = years[entry.year] = QTreeWidgetItem([entry.year])
+            key = (entry.year, entry.month)
+            month_item = months.get(key)
+            if month_item is None:
+                month_item = months[key] = QTreeWidgetItem(
+                    [month_label(entry.date.month, self.language)])
+                year_item.addChild(month_item)
+            day_item = QTreeWidgetItem([f"{entry.date:%d.%m.%Y}"])
+            day_item.setData(0, Qt.UserRole, str(entry.day_file))
+            month_item.addChild(day_item)
+        self.entry_tree.addTopLevelItems(sorted(years.values(), key=lambda item: item.text(0),
+                                                reverse=True))
+        if entries is not None:
+            self.entry_tree.expandAll()
+
+    @traced("Paket: Suchen")
+    def search(self):
+        """Leere Suche zeigt wieder alle Einträge"""
+        text = self.search_edit.text().strip()
+        self.fill_tree(self.pack.search(text, 200) if text else None)
+
+    def on_item_changed(self, item, _previous):
+        day_file = item.data(0, Qt.UserRole) if item else None
+        if day_file:
+            self.show_entry(day_file)
+
+    @traced("Paket: Eintrag anzeigen")
+    def show_entry(self, day_file):
+        try:
+            parsed = self.pack.parsed(day_file)
+            self.media_dir = self.pack.extract_day(day_file)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.warning(self, "Fehler", f"Eintrag nicht lesbar: {e}")
+            return
+        document = render_document(parsed, self.media_dir, self, self.text_browser.font())
+        old = self.text_browser.document()
+        self.text_browser.setDocument(document)
+        if old.parent() is self:
+            old.deleteLater()
+
+    def on_link_clicked(self, url):
+        """Wie im Eintragsfenster, aber ohne Änderungen am Tagebuch"""
+        url_str = url.toString()
+        if url_str.startswith("person:") and self.media_dir is not None:
+            vcard_file = self.media_dir / f"{url_str.split(':', 1)[1]}.vcard"
+            if vcard_file.exists():
+                QDesktopServices.openUrl(QUrl.fromLocalFile(str(vcard_file)))
+        elif url_str.startswith("place:") and self.media_dir is not None:
+            kml_file = self.media_dir / f"{url_str.split(':', 1)[1]}.kml"
+            if kml_file.exists():
+                os.system(f"qgis '{kml_file}' &")
+        elif url_str.startswith("copy:"):
+            QApplication.clipboard().setText(url_str.split(":", 1)[1])
+        elif url_str.startswith("media:"):
+            QDesktopServices.openUrl(QUrl.fromLocalFile(url_str.split(":", 1)[1]))
+        elif url_str.startswith("http"):
+            QDesktopServices.openUrl(url)
+
+    def closeEvent(self, event):
+        self.pack.close()
+        super().closeEvent(event)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Schnellsuche (Strg+P) für Reader und Editor
+
+Sucht in duckday.quickindex nach Daten, #Label, @Personen, %Orten und
+Textanfängen; Enter öffnet den gewählten Tag.
+"""
+
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QShortcut
+from PyQt5.QtCore import Qt, QPoint, pyqtSignal
+from PyQt5.QtGui import QKeySequence
+
+from duckday.trace import span
+
+ICONS = {"date": "📅", "label": "🏷️", "person": "👤", "place": "📍", "snippet": "📝"}
+
+
+class QuickOpenPalette(QDialog):
+    """Eingabezeile mit Trefferliste, schließt sich nach der Auswahl"""
+
+    # duckday.quickindex.Result
+    chosen = pyqtSignal(object)
+
+    LIMIT = 30
+
+    def __init__(self, index, parent=None, language="Deutsch"):
+        super().__init__(parent, Qt.Popup)
+        self.index = index
+        self.results = []
+        self.setMinimumWidth(560)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText(
+            "Datum, #Label, @Person, %Ort oder Text …" if language == "Deutsch"
+            else "Date, #label, @person, %place or text …")
+        self.query_edit.textChanged.connect(self.update_results)
+        self.query_edit.returnPressed.connect(self.accept_current)
+        self.query_edit.installEventFilter(self)
+        layout.addWidget(self.query_edit)
+
+        self.result_list = QListWidget()
+        self.result_list.itemActivated.connect(lambda _item: self.accept_current())
+        layout.addWidget(self.result_list)
+        self.setLayout(layout)
+
+        self.update_results("")
+
+    def update_results(self, text):
+        with span("Schnellsuche", query=text):
+            self.results = self.index.search(text, self.LIMIT)
+        self.result_list.clear()
+        for result in self.results:
+            title = f"{ICONS[result.kind]} {result.title}"
+            if result.detail:
+                title += f"    {result.detail}"
+            self.result_list.addItem(QListWidgetItem(title))
+        if self.results:
+            self.result_list.setCurrentRow(0)
+
+    def eventFilter(self, obj, event):
+        # Pfeiltasten in der Eingabezeile bewegen die Auswahl
+        if obj is self.query_edit and event.type() == event.KeyPress:
+            if event.key() in (Qt.Key_Down, Qt.Key_Up, Qt.Key_PageDown, Qt.Key_PageUp):
+                self.result_list.keyPressEvent(event)
+                return True
+        return super().eventFilter(obj, event)
+
+    def accept_current(self):
+        row = self.result_list.currentRow()
+        if 0 <= row < len(self.results):
+            self.chosen.emit(self.results[row])
+        self.close()
+
+
+def attach_quick_open(window, index_factory, on_chosen, language="Deutsch"):
+    """Strg+P in window öffnet die Schnellsuche
+
+    index_factory() liefert den aktuellen QuickIndex oder None (z.B. kein
+    Tagebuch ausgewählt); on_chosen(result) öffnet den Treffer.
+    """
+    def open_palette():
+        index = index_factory()
+        if index is None:
+            return
+        palette = QuickOpenPalette(index, window, language)
+        palette.setAttribute(Qt.WA_DeleteOnClose)
+        palette.chosen.connect(on_chosen)
+        # Oben mittig über dem Fenster
+        palette.adjustSize()
+        top = window.mapToGlobal(QPoint((window.width() - palette.width()) // 2, 40))
+        palette.move(top)
+        palette.show()
+        palette.query_edit.setFocus()
+
+    shortcut = QShortcut(QKeySequence("Ctrl+P"), window)
+    shortcut.activated.connect(open_palette)
+    return shortcut
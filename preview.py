@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Live-Vorschau im Editor
+
+Zeigt den Eintrag so, wie ihn der Reader darstellt (renderer.py). Nach
+einer kurzen Tipp-Pause werden nur die geänderten Zeilen neu gerendert:
+gleicher Anfang und gleiches Ende bleiben im Dokument stehen, dazwischen
+wird ersetzt. Ändert sich dabei das gültige {Format}, wird weiter
+gerendert, bis es wieder übereinstimmt. Pro Zeile merkt sich die
+Vorschau, wie viele Absätze sie erzeugt hat (Bilder und Videos brauchen
+mehrere); damit folgt die Vorschau auch dem Scrollen im Editor.
+"""
+
+from PyQt5.QtWidgets import QTextBrowser
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QTextCursor, QDesktopServices
+
+from duckday.markup import parse
+from duckday.trace import span, traced
+from renderer import render_lines
+
+
+class PreviewPane(QTextBrowser):
+    """Vorschau zu einem QPlainTextEdit; media_dir() liefert den Tagesordner oder None"""
+
+    # Wartezeit nach dem letzten Tastendruck
+    DEBOUNCE_MS = 150
+
+    def __init__(self, text_edit, media_dir, parent=None):
+        # media_dir() ist None, solange kein Tagebuch gewählt ist
+        super().__init__(parent)
+        self.text_edit = text_edit
+        self.media_dir = media_dir
+        self.setOpenLinks(False)
+        self.anchorClicked.connect(self.on_link_clicked)
+        # Nur lesen: kein Undo-Verlauf im Speicher
+        self.document().setUndoRedoEnabled(False)
+        self.document().setDefaultFont(self.font())
+
+        self.lines = []     # Quelltext pro Zeile, wie zuletzt gerendert
+        self.formats = []   # gültiges Format nach jeder Zeile
+        self.blocks = []    # erzeugte Absätze pro Zeile
+        self._media_dir = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DEBOUNCE_MS)
+        self.timer.timeout.connect(self.refresh)
+        # Beim Tippen nur den Timer neu starten: kostet nichts
+        text_edit.textChanged.connect(self.timer.start)
+        text_edit.verticalScrollBar().valueChanged.connect(self.sync_scroll)
+
+    def reset(self):
+        """Anderer Eintrag: alles neu rendern"""
+        self.timer.stop()
+        self.clear()
+        self.lines = []
+        self.formats = []
+        self.blocks = []
+        self.refresh()
+
+    @traced("Vorschau aktualisieren")
+    def refresh(self):
+        if not self.isVisible():
+            return
+        media_dir = self.media_dir()
+        if media_dir is None:
+            return
+        if media_dir != self._media_dir:
+            # Medien liegen woanders: nichts vom alten Stand übernehmen
+            self._media_dir = media_dir
+            self.clear()
+            self.lines, self.formats, self.blocks = [], [], []
+
+        new = self.text_edit.toPlainText().split('\n')
+        old = self.lines
+
+        # Gleicher Anfang und gleiches Ende
+        start = 0
+        limit = min(len(old), len(new))
+        while start < limit and old[start] == new[start]:
+            start += 1
+        end = 0
+        while end < limit - start and old[-1 - end] == new[-1 - end]:
+            end += 1
+        old_end = len(old) - end
+        new_end = len(new) - end
+
+        carried = self.formats[start - 1] if start else None
+        lines = new[start:new_end]
+        parsed = parse('\n'.join(lines), carried).lines if lines else []
+        after = parsed[-1].format if parsed else carried
+        # Format am Ende des Ausschnitts anders als vorher: weiterrendern
+        while old_end < len(old) and (self.formats[old_end - 1] if old_end else None) != after:
+            lines.append(new[new_end])
+            parsed.extend(parse(new[new_end], after).lines)
+            after = parsed[-1].format
+            old_end += 1
+            new_end += 1
+
+        if not lines and old_end == start:
+            return
+        with span("Vorschau: Zeilen ersetzen", lines=len(lines), removed=old_end - start):
+            counts = self.replace_lines(start, old_end, parsed)
+        self.lines[start:old_end] = new[start:new_end]
+        self.formats[start:old_end] = [line.format for line in parsed]
+        self.blocks[start:old_end] = counts
+        self.sync_scroll()
+
+    def replace_lines(self, start, old_end, parsed):
+        """Ersetzt die Absätze der Zeilen start..old_end; gibt die neuen Anzahlen zurück"""
+        document = self.document()
+        first = sum(self.blocks[:start])
+        removed = sum(self.blocks[start:old_end])
+
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        cursor.setPosition(document.findBlockByNumber(first).position())
+        if removed:
+            # Es bleibt immer ein leerer Absatz am Ende stehen
+            cursor.setPosition(document.findBlockByNumber(first + removed).position(),
+                               QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+
+        counts = []
+        media_dir = self._media_dir
+        for line in parsed:
+            before = document.blockCount()
+            render_lines(cursor, [line], media_dir)
+            counts.append(document.blockCount() - before)
+        cursor.endEditBlock()
+        return counts
+
+    def sync_scroll(self):
+        """Erste sichtbare Editor-Zeile oben in der Vorschau"""
+        if not self.blocks:
+            return
+        line = min(self.text_edit.firstVisibleBlock().blockNumber(), len(self.blocks) - 1)
+        block = self.document().findBlockByNumber(sum(self.blocks[:line]))
+        top = self.document().documentLayout().blockBoundingRect(block).top()
+        self.verticalScrollBar().setValue(int(top))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def on_link_clicked(self, url):
+        # Nur Links nach außen; @, %, § usw. wirken erst im Reader
+        if url.scheme() in ("http", "https"):
+            QDesktopServices.openUrl(url)
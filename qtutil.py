@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - kleine Qt-Hilfen für Reader, Editor und Hauptfenster
+"""
+
+from PyQt5.QtCore import QObject, QEvent, QTimer
+
+
+class _FirstPaintFilter(QObject):
+    """Ruft callback auf, sobald das Widget zum ersten Mal gezeichnet wurde"""
+
+    # Fallback, falls die Plattform (z.B. offscreen) kein Paint-Event liefert
+    FALLBACK_MS = 500
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        self.done = False
+        # Timer als Kind: stirbt mit dem Widget, kein Aufruf ins Leere
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.fire)
+        self.timer.start(self.FALLBACK_MS)
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and not self.done:
+            obj.removeEventFilter(self)
+            # Erst nach dem Zeichnen weiterarbeiten
+            self.timer.start(0)
+        return False
+
+    def fire(self):
+        if self.done:
+            return
+        self.done = True
+        self.callback()
+
+
+def after_first_paint(widget, callback):
+    """Verschiebt Arbeit (Scans, Nebenansichten) bis nach dem ersten Zeichnen"""
+    return _FirstPaintFilter(widget, callback)
+
+
+def trace_overlay(window):
+    """Einblendung der Zeitmessung; traceoverlay wird nur bei aktiver Messung geladen"""
+    from duckday.trace import tracer
+    if not tracer.enabled:
+        return None
+    from traceoverlay import attach_trace_overlay
+    return attach_trace_overlay(window)
@@ -8,18 +8,39 @@ Version: 0.0.2 - Modern UI
 
 import sys
 import os
-import json
-import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QPushButton, QLabel, QListWidget, QTextBrowser, QSplitter,
-                             QFileDialog, QListWidgetItem, QDockWidget, QMessageBox,
-                             QCalendarWidget, QDialog, QDialogButtonBox, QTreeWidget,
-                             QTreeWidgetItem, QFrame, QScrollArea, QToolButton)
-from PyQt5.QtCore import Qt, QUrl, QDate, QSize
-from PyQt5.QtGui import QFont, QTextCursor, QTextCharFormat, QColor, QDesktopServices, QIcon, QPalette
-from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
+
+from duckday.startup import StartupReport
+
+startup = StartupReport.from_argv(sys.argv)
+
+# QtMultimedia wird nicht gebraucht: Medien öffnet das System
+with startup.phase("import PyQt5"):
+    from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                                 QPushButton, QLabel, QListWidget, QTextBrowser,
+                                 QListWidgetItem, QMessageBox,
+                                 QCalendarWidget, QDialog, QDialogButtonBox, QTreeWidget,
+                                 QTreeWidgetItem, QFrame, QToolButton, QTabWidget, QFileDialog)
+    from PyQt5.QtCore import (Qt, QUrl, QDate, QSize, QFileSystemWatcher, QTimer, QProcess,
+                              QProcessEnvironment, pyqtSignal)
+    from PyQt5.QtGui import QFont, QTextCursor, QDesktopServices, QIcon, QKeySequence
+
+with startup.phase("import duckday"):
+    from duckday import DiaryCache, load_settings
+    from duckday import compression
+    from duckday.dates import month_label
+    from duckday.markup import parse, tokenize
+    from duckday.trace import enable_from_settings, span, traced
+    from diarywatcher import DiaryWatcher
+    from palette import attach_quick_open
+    from qtutil import after_first_paint, trace_overlay
+    from renderer import insert_tokens, render_document
+
+# Liest Nachbartage vorab, während ein Eintrag angezeigt wird
+PREFETCH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tagesgans-prefetch")
 
 
 class CalendarDialog(QDialog):
@@ -56,30 +77,45 @@ class CalendarDialog(QDialog):
 class EntryViewerWindow(QMainWindow):
     """Separates Fenster für Tagebucheinträge"""
     
-    def __init__(self, day_file, settings, parent=None):
+    # Aktueller Tag plus vorheriger und nächster
+    DOCUMENT_CACHE_SIZE = 3
+    
+    # (Day.txt, ParsedEntry oder None) aus dem Vorab-Thread
+    prefetched = pyqtSignal(object, object)
+    
+    def __init__(self, day_file, settings, parent=None, cache=None):
         super().__init__(parent)
         self.day_file = day_file
         self.settings = settings
+        self.cache = cache if cache is not None else DiaryCache()
         self.labels = []
         self.timestamps = []
         self.entry_dark_mode = False  # Unabhängig vom System
         
+        # Day.txt → (ParsedEntry, QTextDocument), zuletzt benutzt am Ende
+        self.documents = OrderedDict()
+        # Das angezeigte Dokument (nur von uns gerenderte, nicht das leere von Qt)
+        self.shown_document = None
+        self.pending = set()
+        self.previous_file = None
+        self.next_file = None
+        self.prefetched.connect(self.on_prefetched)
+        
+        # Day.txt von außen geändert (z.B. im Editor gespeichert): neu anzeigen
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(lambda _path: self.reload_timer.start())
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(DiaryWatcher.DEBOUNCE_MS)
+        self.reload_timer.timeout.connect(self.reload_entry)
+        
         self.init_ui()
+        self.trace_overlay = trace_overlay(self)
         self.load_entry()
     
     def init_ui(self):
         """Initialisiert die UI"""
-        # Datum aus Pfad extrahieren
-        parts = self.day_file.parts
-        try:
-            day = parts[-2]
-            month = parts[-3]
-            year = parts[-4]
-            date_str = f"{day}.{month}.{year}"
-        except:
-            date_str = "Eintrag"
-        
-        self.setWindowTitle(f"Tagesgans - {date_str}")
+        self.update_title()
         self.setMinimumSize(900, 700)
         
         # Icon
@@ -120,66 +156,34 @@ class EntryViewerWindow(QMainWindow):
         mode_layout.addStretch()
         right_layout.addLayout(mode_layout)
         
+        # Blättern zwischen Tagen
+        nav_layout = QHBoxLayout()
+        self.previous_btn = QPushButton("◀")
+        self.previous_btn.setToolTip("Vorheriger Tag (Alt+Links)")
+        self.previous_btn.setShortcut(QKeySequence("Alt+Left"))
+        self.previous_btn.clicked.connect(self.show_previous)
+        self.next_btn = QPushButton("▶")
+        self.next_btn.setToolTip("Nächster Tag (Alt+Rechts)")
+        self.next_btn.setShortcut(QKeySequence("Alt+Right"))
+        self.next_btn.clicked.connect(self.show_next)
+        nav_layout.addWidget(self.previous_btn)
+        nav_layout.addWidget(self.next_btn)
+        nav_layout.addStretch()
+        right_layout.addLayout(nav_layout)
+        
         # Trennlinie
         line = QFrame()
         line.setFrameShape(QFrame.HLine)
         line.setFrameShadow(QFrame.Sunken)
         right_layout.addWidget(line)
         
-        # Labels
-        label_header = QHBoxLayout()
-        label_icon_path = Path.home() / ".local" / "share" / "icons" / "Goose" / "label.png"
-        label_toggle = QToolButton()
-        if label_icon_path.exists():
-            label_toggle.setIcon(QIcon(str(label_icon_path)))
-        label_toggle.setIconSize(QSize(24, 24))
-        label_toggle.setCheckable(True)
-        label_toggle.setChecked(True)
-        label_toggle.toggled.connect(lambda checked: self.label_list.setVisible(checked))
-        
-        label_title = QLabel("Labels")
-        label_title_font = QFont()
-        label_title_font.setBold(True)
-        label_title.setFont(label_title_font)
-        
-        label_header.addWidget(label_toggle)
-        label_header.addWidget(label_title)
-        label_header.addStretch()
-        right_layout.addLayout(label_header)
-        
-        self.label_list = QListWidget()
-        self.label_list.itemClicked.connect(self.on_label_clicked)
-        self.label_list.setMaximumWidth(200)
-        right_layout.addWidget(self.label_list)
-        
-        # Zeitstempel
-        time_header = QHBoxLayout()
-        time_icon_path = Path.home() / ".local" / "share" / "icons" / "Goose" / "time.png"
-        time_toggle = QToolButton()
-        if time_icon_path.exists():
-            time_toggle.setIcon(QIcon(str(time_icon_path)))
-        time_toggle.setIconSize(QSize(24, 24))
-        time_toggle.setCheckable(True)
-        time_toggle.setChecked(True)
-        time_toggle.toggled.connect(lambda checked: self.time_list.setVisible(checked))
-        
-        time_title = QLabel("Zeitstempel")
-        time_title_font = QFont()
-        time_title_font.setBold(True)
-        time_title.setFont(time_title_font)
-        
-        time_header.addWidget(time_toggle)
-        time_header.addWidget(time_title)
-        time_header.addStretch()
-        right_layout.addLayout(time_header)
-        
-        self.time_list = QListWidget()
-        self.time_list.itemClicked.connect(self.on_timestamp_clicked)
-        self.time_list.setMaximumWidth(200)
-        right_layout.addWidget(self.time_list)
+        # Labels und Zeitstempel werden erst gebaut, wenn der Eintrag welche hat
+        self.label_list = None
+        self.time_list = None
         
         right_layout.addStretch()
         right_panel.setLayout(right_layout)
+        self.right_layout = right_layout
         
         main_layout.addWidget(right_panel, 1)
         central_widget.setLayout(main_layout)
@@ -187,6 +191,74 @@ class EntryViewerWindow(QMainWindow):
         # Initial: System-Theme
         self.apply_entry_theme()
     
+    def entry_title(self):
+        """Datum aus dem Pfad (Tag.Monat.Jahr)"""
+        parts = self.day_file.parts
+        try:
+            day = parts[-2]
+            month = parts[-3]
+            year = parts[-4]
+            return f"{day}.{month}.{year}"
+        except:
+            return "Eintrag"
+    
+    def update_title(self):
+        self.setWindowTitle(f"Tagesgans - {self.entry_title()}")
+    
+    def show_entry(self, day_file):
+        """Zeigt einen anderen Eintrag im selben Fenster (Wiederverwendung)"""
+        self.day_file = day_file
+        self.update_title()
+        self.load_entry()
+    
+    def add_side_list(self, icon_name, title, on_click):
+        """Fügt eine ein-/ausklappbare Liste in die Seitenleiste ein"""
+        header = QHBoxLayout()
+        icon_path = Path.home() / ".local" / "share" / "icons" / "Goose" / icon_name
+        toggle = QToolButton()
+        if icon_path.exists():
+            toggle.setIcon(QIcon(str(icon_path)))
+        toggle.setIconSize(QSize(24, 24))
+        toggle.setCheckable(True)
+        toggle.setChecked(True)
+        
+        title_label = QLabel(title)
+        title_font = QFont()
+        title_font.setBold(True)
+        title_label.setFont(title_font)
+        
+        header.addWidget(toggle)
+        header.addWidget(title_label)
+        header.addStretch()
+        
+        side_list = QListWidget()
+        side_list.itemClicked.connect(on_click)
+        side_list.setMaximumWidth(200)
+        toggle.toggled.connect(side_list.setVisible)
+        
+        # Vor dem abschließenden Stretch einfügen
+        index = self.right_layout.count() - 1
+        self.right_layout.insertLayout(index, header)
+        self.right_layout.insertWidget(index + 1, side_list)
+        return side_list
+    
+    def update_side_lists(self):
+        """Füllt Labels und Zeitstempel, baut die Listen bei Bedarf"""
+        if self.labels and self.label_list is None:
+            self.label_list = self.add_side_list("label.png", "Labels", self.on_label_clicked)
+        if self.timestamps and self.time_list is None:
+            self.time_list = self.add_side_list("time.png", "Zeitstempel", self.on_timestamp_clicked)
+        
+        if self.label_list is not None:
+            self.label_list.clear()
+            for label in self.labels:
+                self.label_list.addItem(QListWidgetItem(f"#{label}"))
+        
+        if self.time_list is not None:
+            self.time_list.clear()
+            for ts in self.timestamps:
+                self.time_list.addItem(ts)
+    
     def toggle_entry_mode(self):
         """Wechselt zwischen Dark und Light Mode für den Eintrag"""
         self.entry_dark_mode = self.mode_toggle.isChecked()
@@ -227,178 +299,148 @@ class EntryViewerWindow(QMainWindow):
     
     def load_entry(self):
         """Lädt und zeigt einen Tagebucheintrag"""
-        if not self.day_file.exists():
+        self.labels = []
+        self.timestamps = []
+        if not compression.exists(self.day_file):
             return
+        self.watch_file()
         
-        with open(self.day_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        parsed = self.cache.parsed(self.day_file)
+        cached = self.documents.get(self.day_file)
+        if cached and cached[0] is parsed:
+            # Vorab gerendert und seitdem unverändert
+            self.documents.move_to_end(self.day_file)
+            self.show_document(parsed, cached[1])
+        else:
+            self.show_parsed(parsed, self.day_file)
         
-        self.display_content(content, self.day_file.parent)
+        self.update_navigation()
+        self.prefetch_neighbours()
+    
+    def watch_file(self):
+        """Beobachtet nur die Day.txt des angezeigten Tages (ggf. komprimiert)"""
+        path = str(compression.find(self.day_file) or self.day_file)
+        files = self.file_watcher.files()
+        if files == [path]:
+            return
+        if files:
+            self.file_watcher.removePaths(files)
+        self.file_watcher.addPath(path)
+    
+    @traced("Eintrag neu laden")
+    def reload_entry(self):
+        """Zeigt die geänderte Day.txt an (Scrollposition bleibt)"""
+        if not compression.exists(self.day_file):
+            return
+        scroll = self.text_browser.verticalScrollBar().value()
+        # Beim Ersetzen der Datei fällt sie aus dem Watcher: neu eintragen
+        files = self.file_watcher.files()
+        if files:
+            self.file_watcher.removePaths(files)
+        self.load_entry()
+        self.text_browser.verticalScrollBar().setValue(scroll)
     
     def display_content(self, content, media_dir):
         """Zeigt formatierten Inhalt an"""
-        self.text_browser.clear()
-        cursor = self.text_browser.textCursor()
-        
-        lines = content.split('\n')
-        current_format = None
-        
-        for line in lines:
-            if not line.strip():
-                cursor.insertText('\n')
-                continue
-            
-            # Format am Zeilenanfang?
-            format_match = re.match(r'\{(\d+)\|([FfKkUuDd]{4})\|([^}]+)\}', line)
-            if format_match:
-                size = int(format_match.group(1))
-                style = format_match.group(2)
-                color = format_match.group(3)
-                current_format = (size, style, color)
-                line = line[format_match.end():]
-            
-            if current_format:
-                self.insert_formatted_line(cursor, line, current_format, media_dir)
-            else:
-                cursor.insertText(line + '\n')
+        self.show_parsed(parse(content), media_dir / "Day.txt")
+    
+    def show_parsed(self, parsed, day_file):
+        """Rendert einen zerlegten Eintrag und zeigt ihn an"""
+        document = render_document(parsed, day_file.parent, self, self.text_browser.font())
+        self.store_document(day_file, parsed, document)
+        self.show_document(parsed, document)
+    
+    def show_document(self, parsed, document):
+        """Zeigt ein fertiges Dokument samt Labels und Zeitstempeln"""
+        previous, self.shown_document = self.shown_document, document
+        self.text_browser.setDocument(document)
+        if previous is not None and previous is not document and not self.is_cached(previous):
+            # Wurde angezeigt, während es aus dem Cache fiel: jetzt freigeben
+            previous.deleteLater()
+        self.labels = list(parsed.labels)
+        self.timestamps = list(parsed.timestamps)
         
         # Labels und Zeitstempel in Seitenleisten
-        self.label_list.clear()
-        self.time_list.clear()
-        
-        for label in self.labels:
-            item = QListWidgetItem(f"#{label}")
-            self.label_list.addItem(item)
-        
-        for ts in self.timestamps:
-            self.time_list.addItem(ts)
+        self.update_side_lists()
     
     def insert_formatted_line(self, cursor, line, format_info, media_dir):
         """Fügt eine formatierte Zeile ein"""
-        size, style, color = format_info
-        
-        char_format = QTextCharFormat()
-        font = QFont()
-        font.setPointSize(size)
-        font.setBold('F' in style)
-        font.setItalic('K' in style)
-        font.setUnderline('U' in style)
-        font.setStrikeOut('D' in style)
-        char_format.setFont(font)
-        
-        char_format.setForeground(QColor(color))
-        
-        pos = 0
-        while pos < len(line):
-            # @Person (vCard)
-            person_match = re.match(r'@(\w+)', line[pos:])
-            if person_match:
-                person_name = person_match.group(1)
-                link_format = QTextCharFormat(char_format)
-                link_format.setForeground(QColor("#0066cc"))
-                link_format.setFontUnderline(True)
-                link_format.setAnchor(True)
-                link_format.setAnchorHref(f"person:{person_name}")
-                cursor.insertText(f"👤 {person_name}", link_format)
-                pos += person_match.end()
-                continue
-            
-            # %Ort (KML)
-            place_match = re.match(r'%(\w+)', line[pos:])
-            if place_match:
-                place_name = place_match.group(1)
-                link_format = QTextCharFormat(char_format)
-                link_format.setForeground(QColor("#28a745"))
-                link_format.setFontUnderline(True)
-                link_format.setAnchor(True)
-                link_format.setAnchorHref(f"place:{place_name}")
-                cursor.insertText(f"📍 {place_name}", link_format)
-                pos += place_match.end()
-                continue
-            
-            # 'Text' (Easy Copy)
-            copy_match = re.match(r"'([^']+)'", line[pos:])
-            if copy_match:
-                copy_text = copy_match.group(1)
-                link_format = QTextCharFormat(char_format)
-                link_format.setBackground(QColor("#ffffcc"))
-                link_format.setAnchor(True)
-                link_format.setAnchorHref(f"copy:{copy_text}")
-                cursor.insertText(f"📋 {copy_text}", link_format)
-                pos += copy_match.end()
-                continue
-            
-            # §Zeitstempel
-            time_match = re.match(r'§([\d.]+)', line[pos:])
-            if time_match:
-                timestamp = time_match.group(1)
-                self.timestamps.append(timestamp)
-                link_format = QTextCharFormat(char_format)
-                link_format.setForeground(QColor("#6f42c1"))
-                link_format.setFontUnderline(True)
-                link_format.setAnchor(True)
-                link_format.setAnchorHref(f"time:{timestamp}")
-                cursor.insertText(f"🕒 {timestamp}", link_format)
-                pos += time_match.end()
-                continue
-            
-            # =Label
-            label_match = re.match(r'=(\w+)', line[pos:])
-            if label_match:
-                label = label_match.group(1)
-                if label not in self.labels:
-                    self.labels.append(label)
-                link_format = QTextCharFormat(char_format)
-                link_format.setForeground(QColor("#fd7e14"))
-                link_format.setFontUnderline(True)
-                link_format.setAnchor(True)
-                link_format.setAnchorHref(f"label:{label}")
-                cursor.insertText(f"🏷️ #{label}", link_format)
-                pos += label_match.end()
-                continue
-            
-            # <Dateiname> (Media)
-            media_match = re.match(r'<([^>]+)>', line[pos:])
-            if media_match:
-                filename = media_match.group(1)
-                media_file = media_dir / filename
-                if media_file.exists():
-                    self.insert_media(cursor, media_file)
-                pos += media_match.end()
-                continue
-            
-            # URLs
-            url_match = re.match(r'(https?://[^\s]+)', line[pos:])
-            if url_match:
-                url = url_match.group(1)
-                link_format = QTextCharFormat(char_format)
-                link_format.setForeground(QColor("#0066cc"))
-                link_format.setFontUnderline(True)
-                link_format.setAnchor(True)
-                link_format.setAnchorHref(url)
-                cursor.insertText(f"🔗 {url}", link_format)
-                pos += url_match.end()
+        tokens = tokenize(line)
+        for token in tokens:
+            if token.kind == "time":
+                self.timestamps.append(token.value)
+            elif token.kind == "label" and token.value not in self.labels:
+                self.labels.append(token.value)
+        insert_tokens(cursor, tokens, format_info, media_dir)
+    
+    def store_document(self, day_file, parsed, document):
+        """Merkt sich ein Dokument; nur der aktuelle Tag und seine Nachbarn bleiben"""
+        replaced = self.documents.get(day_file)
+        self.documents[day_file] = (parsed, document)
+        self.documents.move_to_end(day_file)
+        if replaced and replaced[1] is not document:
+            # Datei hat sich geändert: alte Fassung freigeben
+            self.release_document(replaced[1])
+        while len(self.documents) > self.DOCUMENT_CACHE_SIZE:
+            # Der angezeigte Tag bleibt, auch wenn er am längsten unbenutzt ist
+            oldest = next(key for key, (_, cached) in self.documents.items() if cached is not self.shown_document)
+            self.release_document(self.documents.pop(oldest)[1])
+    
+    def is_cached(self, document):
+        return any(cached is document for _, cached in self.documents.values())
+    
+    def release_document(self, document):
+        """Gibt ein Dokument frei, das nicht mehr im Cache ist (das angezeigte erst beim Wechsel)"""
+        if document is not self.shown_document:
+            document.deleteLater()
+    
+    # --- Blättern ---
+    
+    def update_navigation(self):
+        """Aktiviert Vor/Zurück je nach Nachbarn"""
+        self.previous_file, self.next_file = self.cache.neighbours(self.day_file)
+        self.previous_btn.setEnabled(self.previous_file is not None)
+        self.next_btn.setEnabled(self.next_file is not None)
+    
+    def show_previous(self):
+        if self.previous_file:
+            self.show_entry(self.previous_file)
+    
+    def show_next(self):
+        if self.next_file:
+            self.show_entry(self.next_file)
+    
+    def prefetch_neighbours(self):
+        """Liest und zerlegt die Nachbartage im Hintergrund"""
+        for day_file in (self.previous_file, self.next_file):
+            if day_file is None or day_file in self.documents or day_file in self.pending:
                 continue
-            
-            # Normaler Text
-            cursor.insertText(line[pos], char_format)
-            pos += 1
-        
-        cursor.insertText('\n')
-    
-    def insert_media(self, cursor, media_file):
-        """Fügt Medien ein"""
-        ext = media_file.suffix.lower()
-        
-        if ext in ['.png', '.jpg', '.jpeg', '.svg']:
-            cursor.insertHtml(f'<br><img src="{media_file}" width="500" style="border-radius: 8px;"><br>')
-        elif ext in ['.mp3', '.ogg', '.opus', '.mp4']:
-            link_format = QTextCharFormat()
-            link_format.setForeground(QColor("#0066cc"))
-            link_format.setFontUnderline(True)
-            link_format.setAnchor(True)
-            link_format.setAnchorHref(f"media:{media_file}")
-            cursor.insertText(f"\n🎬 [{media_file.name}]\n", link_format)
+            self.pending.add(day_file)
+            future = PREFETCH_EXECUTOR.submit(self.cache.parsed, day_file)
+            future.add_done_callback(
+                lambda f, day_file=day_file: self.emit_prefetched(day_file, f)
+            )
+    
+    def emit_prefetched(self, day_file, future):
+        """Läuft im Worker: Ergebnis per Signal in den GUI-Thread"""
+        parsed = None if future.exception() else future.result()
+        try:
+            self.prefetched.emit(day_file, parsed)
+        except RuntimeError:
+            # Fenster wurde inzwischen geschlossen
+            pass
+    
+    def on_prefetched(self, day_file, parsed):
+        """Rendert einen vorab gelesenen Nachbartag (GUI-Thread)"""
+        self.pending.discard(day_file)
+        if parsed is None or day_file not in (self.previous_file, self.next_file):
+            return
+        with span("Vorab rendern", file=day_file):
+            document = render_document(parsed, day_file.parent, self, self.text_browser.font())
+        self.store_document(day_file, parsed, document)
+        # Aktuellen Tag als zuletzt benutzt halten
+        if self.day_file in self.documents:
+            self.documents.move_to_end(self.day_file)
     
     def on_link_clicked(self, url):
         """Behandelt Klicks auf Links"""
@@ -406,14 +448,14 @@ class EntryViewerWindow(QMainWindow):
         
         if url_str.startswith("person:"):
             person = url_str.split(":", 1)[1]
-            vcard_file = self.day_file.parent / f"{person}.vcard"
-            if vcard_file.exists():
+            vcard_file = compression.plain_copy(self.day_file.parent / f"{person}.vcard")
+            if vcard_file:
                 QDesktopServices.openUrl(QUrl.fromLocalFile(str(vcard_file)))
         
         elif url_str.startswith("place:"):
             place = url_str.split(":", 1)[1]
-            kml_file = self.day_file.parent / f"{place}.kml"
-            if kml_file.exists():
+            kml_file = compression.plain_copy(self.day_file.parent / f"{place}.kml")
+            if kml_file:
                 os.system(f"qgis '{kml_file}' &")
         
         elif url_str.startswith("copy:"):
@@ -458,35 +500,197 @@ class EntryViewerWindow(QMainWindow):
         self.text_browser.find(timestamp)
 
 
+class EntryTabWindow(QMainWindow):
+    """Ein Fenster mit Tabs für Einträge (Modus "Tabs")"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Tagesgans - Einträge")
+        self.setMinimumSize(900, 700)
+        
+        self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.setDocumentMode(True)
+        self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.setCentralWidget(self.tabs)
+    
+    def add_viewer(self, viewer):
+        """Bettet ein EntryViewerWindow als Tab ein"""
+        viewer.setWindowFlags(Qt.Widget)
+        index = self.tabs.addTab(viewer, viewer.entry_title())
+        viewer.windowTitleChanged.connect(
+            lambda _title, v=viewer: self.tabs.setTabText(self.tabs.indexOf(v), v.entry_title())
+        )
+        self.tabs.setCurrentIndex(index)
+    
+    def close_tab(self, index):
+        """Schließt einen Tab und gibt den Eintrag frei"""
+        viewer = self.tabs.widget(index)
+        self.tabs.removeTab(index)
+        viewer.deleteLater()
+        if self.tabs.count() == 0:
+            self.close()
+
+
+class EntryViewerPool:
+    """Verwaltet die offenen Eintragsfenster
+    
+    Geschlossene Fenster werden sofort freigegeben. Ist die Obergrenze
+    erreicht, zeigt das am längsten nicht benutzte Fenster den neuen
+    Eintrag, statt ein weiteres QTextDocument samt Bildern anzulegen.
+    """
+    
+    # Einstellungswert "viewer_mode"
+    MODES = ("Fenster", "Einzelfenster", "Tabs")
+    
+    def __init__(self, settings, parent, cache=None):
+        self.settings = settings
+        self.parent = parent
+        self.cache = cache
+        self.viewers = OrderedDict()  # älteste zuerst
+        self.mode = None
+        self.tab_window = None
+    
+    def capacity(self):
+        if self.settings.get("viewer_mode") == "Einzelfenster":
+            return 1
+        return max(1, int(self.settings.get("viewer_pool_size", 5)))
+    
+    def open(self, day_file):
+        """Zeigt einen Eintrag und gibt das Fenster zurück"""
+        mode = self.settings.get("viewer_mode", "Fenster")
+        if mode != self.mode:
+            # Modus geändert: alte Fenster passen nicht mehr
+            self.close_all()
+            self.mode = mode
+        
+        viewer = next((v for v in self.viewers if v.day_file == day_file), None)
+        if viewer is None:
+            if len(self.viewers) >= self.capacity():
+                viewer = next(iter(self.viewers))
+                viewer.show_entry(day_file)
+            else:
+                viewer = self.create_viewer(day_file)
+        
+        self.viewers.move_to_end(viewer)
+        self.activate(viewer)
+        return viewer
+    
+    def create_viewer(self, day_file):
+        if self.mode == "Tabs":
+            if self.tab_window is None:
+                self.tab_window = EntryTabWindow(self.parent)
+                self.tab_window.setAttribute(Qt.WA_DeleteOnClose)
+                self.tab_window.destroyed.connect(
+                    lambda _=None, w=self.tab_window: self.on_tab_window_destroyed(w)
+                )
+            viewer = EntryViewerWindow(day_file, self.settings, cache=self.cache)
+            self.tab_window.add_viewer(viewer)
+        else:
+            viewer = EntryViewerWindow(day_file, self.settings, self.parent, self.cache)
+            viewer.setAttribute(Qt.WA_DeleteOnClose)
+        
+        viewer.destroyed.connect(lambda _=None, v=viewer: self.viewers.pop(v, None))
+        self.viewers[viewer] = None
+        return viewer
+    
+    def activate(self, viewer):
+        if self.mode == "Tabs":
+            self.tab_window.tabs.setCurrentWidget(viewer)
+            window = self.tab_window
+        else:
+            window = viewer
+        window.show()
+        window.raise_()
+        window.activateWindow()
+    
+    def on_tab_window_destroyed(self, window):
+        # Die Tabs melden sich über ihr eigenes destroyed ab
+        if self.tab_window is window:
+            self.tab_window = None
+    
+    def close_all(self):
+        if self.tab_window is not None:
+            self.tab_window.close()
+            self.tab_window = None
+        for viewer in list(self.viewers):
+            viewer.close()
+        self.viewers.clear()
+
+
+class CheckResultDialog(QDialog):
+    """Ergebnis der Tagebuch-Prüfung; Doppelklick öffnet den Eintrag"""
+    
+    def __init__(self, diary, problems, open_day_file, parent=None, language="Deutsch"):
+        super().__init__(parent)
+        self.setWindowTitle("Tagebuch prüfen" if language == "Deutsch" else "Check diary")
+        self.setMinimumSize(700, 400)
+        self.open_day_file = open_day_file
+        
+        from duckday.fsck import format_problem
+        
+        layout = QVBoxLayout()
+        if problems:
+            text = (f"{len(problems)} Problem(e) in {diary.stem}" if language == "Deutsch"
+                    else f"{len(problems)} problem(s) in {diary.stem}")
+        else:
+            text = "Keine Probleme gefunden." if language == "Deutsch" else "No problems found."
+        layout.addWidget(QLabel(text))
+        
+        problem_list = QListWidget()
+        for problem in problems:
+            item = QListWidgetItem(format_problem(problem, diary))
+            if problem.path.name == "Day.txt":
+                item.setData(Qt.UserRole, str(problem.path))
+            problem_list.addItem(item)
+        problem_list.itemDoubleClicked.connect(self.on_problem_double_clicked)
+        layout.addWidget(problem_list)
+        
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        layout.addWidget(button_box)
+        self.setLayout(layout)
+    
+    def on_problem_double_clicked(self, item):
+        day_file = item.data(Qt.UserRole)
+        if day_file:
+            self.open_day_file(Path(day_file))
+
+
 class DiaryReader(QMainWindow):
     """Hauptfenster des Tagebuch-Readers"""
     
-    def __init__(self, config_file):
+    # (Tagebuch, Probleme oder Exception) aus dem Prüf-Thread
+    check_finished = pyqtSignal(object, object)
+    
+    def __init__(self, config_file, settings=None, cache=None):
         super().__init__()
         self.config_file = Path(config_file)
-        self.settings = self.load_settings()
+        # Aus tagesgans.py gestartet: Einstellungen und Cache werden geteilt
+        self.settings = settings if settings is not None else load_settings(self.config_file)
+        self.cache = cache if cache is not None else DiaryCache()
         self.current_diary = None
-        self.entry_windows = []
+        self.heatmap_dialog = None
+        self.timeline = None
+        self.year_items = {}
+        self.month_items = {}
+        self.day_items = {}
+        self.viewer_pool = EntryViewerPool(self.settings, self, self.cache)
+        self.watcher = DiaryWatcher(self.cache, self)
+        self.watcher.entries_changed.connect(self.on_entries_changed)
+        self.check_finished.connect(self.on_check_finished)
+        enable_from_settings(self.settings)
         
         self.init_ui()
-        self.scan_diaries()
-    
-    def load_settings(self):
-        """Lädt Einstellungen"""
-        default_settings = {
-            "language": "Deutsch",
-            "sidebar_position": "Rechts"
-        }
-        
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded = json.load(f)
-                    default_settings.update(loaded)
-                    return default_settings
-            except:
-                return default_settings
-        return default_settings
+        self.trace_overlay = trace_overlay(self)
+        self.quick_open = attach_quick_open(self, self.quick_index, self.on_quick_open,
+                                            self.settings["language"])
+        # Home-Scan erst nach dem ersten Zeichnen, damit das Fenster sofort da ist
+        after_first_paint(self, self.scan_diaries)
+        # Archivmodus: ältere Einträge im Hintergrund komprimieren
+        after_first_paint(self, lambda: compression.compress_in_background(self.cache.diaries(),
+                                                                         self.settings,
+                                                                         self.cache.day_is_open))
     
     def init_ui(self):
         """Initialisiert die UI"""
@@ -521,100 +725,430 @@ class DiaryReader(QMainWindow):
         label_font = QFont()
         label_font.setBold(True)
         diary_label.setFont(label_font)
-        main_layout.addWidget(diary_label)
+        diary_header = QHBoxLayout()
+        diary_header.addWidget(diary_label)
+        diary_header.addStretch()
+        pack_button = QPushButton("📦 Paket öffnen" if lang == "Deutsch" else "📦 Open pack")
+        pack_button.clicked.connect(self.open_pack)
+        diary_header.addWidget(pack_button)
+        main_layout.addLayout(diary_header)
         
         self.diary_list = QListWidget()
         self.diary_list.itemClicked.connect(self.on_diary_selected)
         main_layout.addWidget(self.diary_list)
         
         # Eintrags-Navigation als Baum
+        entry_header = QHBoxLayout()
         entry_label = QLabel("Einträge:" if lang == "Deutsch" else "Entries:")
         entry_label.setFont(label_font)
-        main_layout.addWidget(entry_label)
+        entry_header.addWidget(entry_label)
+        entry_header.addStretch()
+        
+        self.heatmap_button = QPushButton("🗓️ Jahresübersicht" if lang == "Deutsch" else "🗓️ Year overview")
+        self.heatmap_button.setEnabled(False)
+        self.heatmap_button.clicked.connect(self.show_heatmap)
+        entry_header.addWidget(self.heatmap_button)
+        
+        self.analytics_button = QPushButton("📊 Auswertungen" if lang == "Deutsch" else "📊 Analytics")
+        self.analytics_button.setEnabled(False)
+        self.analytics_button.clicked.connect(self.show_analytics)
+        entry_header.addWidget(self.analytics_button)
+        
+        self.check_button = QPushButton("🩺 Prüfen" if lang == "Deutsch" else "🩺 Check")
+        self.check_button.setEnabled(False)
+        self.check_button.clicked.connect(self.check_current_diary)
+        entry_header.addWidget(self.check_button)
+        
+        self.yearbook_button = QPushButton("📕 Jahrbuch" if lang == "Deutsch" else "📕 Year book")
+        self.yearbook_button.setEnabled(False)
+        self.yearbook_button.clicked.connect(self.make_yearbook)
+        entry_header.addWidget(self.yearbook_button)
+        main_layout.addLayout(entry_header)
         
         self.entry_tree = QTreeWidget()
         self.entry_tree.setHeaderLabels(["Datum", "Jahr", "Monat"])
         self.entry_tree.itemDoubleClicked.connect(self.on_entry_double_clicked)
+        self.entry_tree.verticalScrollBar().valueChanged.connect(self.on_tree_scrolled)
         main_layout.addWidget(self.entry_tree)
         
         central_widget.setLayout(main_layout)
     
+    @traced("Reader: Tagebuchliste")
     def scan_diaries(self):
         """Scannt nach .duckday Ordnern"""
         self.diary_list.clear()
-        home = Path.home()
-        
-        for duckday_dir in home.rglob("*.duckday"):
-            if duckday_dir.is_dir():
-                diary_name = duckday_dir.stem
-                item = QListWidgetItem(f"📔 {diary_name}")
-                item.setData(Qt.UserRole, str(duckday_dir))
-                
-                # Icon laden
-                icon_file = duckday_dir / "Icon.png"
-                if icon_file.exists():
-                    item.setIcon(QIcon(str(icon_file)))
-                
-                self.diary_list.addItem(item)
+        
+        for duckday_dir in self.cache.diaries():
+            diary_name = duckday_dir.stem
+            item = QListWidgetItem(f"📔 {diary_name}")
+            item.setData(Qt.UserRole, str(duckday_dir))
+            
+            # Icon laden
+            icon_file = duckday_dir / "Icon.png"
+            if icon_file.exists():
+                item.setIcon(QIcon(str(icon_file)))
+            
+            self.diary_list.addItem(item)
+        
+        # Gemeinsame Zeitleiste (ohne Pfad) erst ab zwei Tagebüchern
+        if self.diary_list.count() > 1:
+            lang = self.settings["language"]
+            item = QListWidgetItem("🧵 Alle Tagebücher (Zeitleiste)" if lang == "Deutsch"
+                                   else "🧵 All diaries (timeline)")
+            self.diary_list.insertItem(0, item)
+    
+    def open_pack(self):
+        """Öffnet ein gepacktes (.duckpack) oder SQLite-Tagebuch (.duckdb) nur zum Lesen"""
+        import sqlite3
+        from duckday.pack import SUFFIX as PACK_SUFFIX, PackError
+        from duckday.storage import DB_SUFFIX, open_storage
+        from packviewer import PackViewerDialog
+        
+        lang = self.settings["language"]
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Paket öffnen" if lang == "Deutsch" else "Open pack", str(Path.home()),
+            f"Tagebuch-Paket (*{PACK_SUFFIX} *{DB_SUFFIX})")
+        if not path:
+            return
+        try:
+            pack = open_storage(path)
+        except (OSError, PackError, sqlite3.Error) as e:
+            QMessageBox.warning(self, "Fehler", str(e))
+            return
+        dialog = PackViewerDialog(pack, self, lang)
+        dialog.show()
     
     def on_diary_selected(self, item):
         """Wird aufgerufen wenn ein Tagebuch ausgewählt wurde"""
-        self.current_diary = Path(item.data(Qt.UserRole))
+        diary = item.data(Qt.UserRole)
+        if diary is None:
+            self.load_timeline()
+            return
+        self.timeline = None
+        self.current_diary = Path(diary)
+        self.heatmap_button.setEnabled(True)
+        self.analytics_button.setEnabled(True)
+        self.yearbook_button.setEnabled(True)
+        self.check_button.setEnabled(True)
+        self.load_entries()
+    
+    # --- Zeitleiste aller Tagebücher ---
+    
+    # Einträge pro Nachladen; reicht, um die Liste einmal zu füllen
+    TIMELINE_PAGE = 100
+    
+    @traced("Reader: Zeitleiste laden")
+    def load_timeline(self):
+        """Zeigt alle Tagebücher gemischt, neueste zuerst"""
+        from duckday.timeline import Timeline
+        
+        self.current_diary = None
+        self.timeline = None
+        self.heatmap_button.setEnabled(False)
+        self.analytics_button.setEnabled(False)
+        self.check_button.setEnabled(False)
+        self.yearbook_button.setEnabled(False)
         self.load_entries()
+        self.entry_tree.setHeaderLabels(["Datum", "Tagebuch"])
+        self.timeline = Timeline(self.cache, self.cache.diaries())
+        self.fetch_timeline()
+    
+    def fetch_timeline(self):
+        """Hängt die nächsten Einträge der Zeitleiste an"""
+        for diary, entry in self.timeline.fetch(self.TIMELINE_PAGE):
+            item = QTreeWidgetItem([f"📝 {entry.date:%d.%m.%Y}", f"📔 {diary.stem}"])
+            item.setData(0, Qt.UserRole, str(entry.day_file))
+            self.entry_tree.addTopLevelItem(item)
+    
+    def on_tree_scrolled(self, value):
+        """Lädt weitere Einträge, kurz bevor das Ende sichtbar wird"""
+        if self.timeline is None or self.timeline.exhausted:
+            return
+        scrollbar = self.entry_tree.verticalScrollBar()
+        if value >= scrollbar.maximum() - scrollbar.pageStep():
+            self.fetch_timeline()
     
+    @traced("Reader: Einträge laden")
     def load_entries(self):
         """Lädt alle Einträge als Baum"""
         self.entry_tree.clear()
+        self.entry_tree.setHeaderLabels(["Datum", "Jahr", "Monat"])
+        self.year_items = {}
+        self.month_items = {}
+        self.day_items = {}
+        
+        if not self.current_diary:
+            self.watcher.stop()
+            return
+        
+        # Jahr → Monat → Tag Hierarchie (neueste zuerst), nach Datum statt
+        # nach Ordnernamen: "March" und "03" landen im selben Monat
+        entries = self.cache.entries(self.current_diary)
+        for entry in reversed(entries):
+            self.insert_entry(entry, append=True)
+        
+        # Spätere Änderungen kommen einzeln über den Watcher
+        self.watcher.watch(self.current_diary, entries)
+    
+    def insert_entry(self, entry, append=False):
+        """Fügt einen Tag in den Baum ein (neueste zuerst)
+        
+        append: Einträge kommen bereits absteigend sortiert (load_entries)
+        """
+        day = entry.date
+        
+        def position(keys, key):
+            # Anzahl neuerer Geschwister = Einfügeposition
+            return 0 if append else sum(1 for other in keys if other > key)
+        
+        year_item = self.year_items.get(day.year)
+        if year_item is None:
+            year_item = QTreeWidgetItem([f"📅 {day.year}"])
+            index = self.entry_tree.topLevelItemCount() if append else position(self.year_items, day.year)
+            self.entry_tree.insertTopLevelItem(index, year_item)
+            year_item.setExpanded(True)
+            self.year_items[day.year] = year_item
+        
+        month_key = (day.year, day.month)
+        month_item = self.month_items.get(month_key)
+        if month_item is None:
+            month_item = QTreeWidgetItem([f"📆 {month_label(day.month, self.settings['language'])}"])
+            siblings = [key for key in self.month_items if key[0] == day.year]
+            index = year_item.childCount() if append else position(siblings, month_key)
+            year_item.insertChild(index, month_item)
+            month_item.setExpanded(True)
+            self.month_items[month_key] = month_item
+        
+        day_item = QTreeWidgetItem([f"📝 Tag {day.day:02d}"])
+        day_item.setData(0, Qt.UserRole, str(entry.day_file))
+        siblings = [other for other in self.day_items if (other.year, other.month) == month_key]
+        index = month_item.childCount() if append else position(siblings, day)
+        month_item.insertChild(index, day_item)
+        self.day_items[day] = day_item
+    
+    def remove_entry(self, entry):
+        """Entfernt einen Tag und leere Monats-/Jahresknoten"""
+        day = entry.date
+        day_item = self.day_items.pop(day, None)
+        if day_item is None:
+            return
+        month_key = (day.year, day.month)
+        month_item = self.month_items[month_key]
+        month_item.removeChild(day_item)
+        if month_item.childCount() == 0:
+            year_item = self.year_items[day.year]
+            year_item.removeChild(self.month_items.pop(month_key))
+            if year_item.childCount() == 0:
+                self.entry_tree.takeTopLevelItem(
+                    self.entry_tree.indexOfTopLevelItem(self.year_items.pop(day.year))
+                )
+    
+    @traced("Reader: Änderungen übernehmen")
+    def on_entries_changed(self, diary, added, removed, moved):
+        """Übernimmt Änderungen am Tagebuch, ohne den Baum neu aufzubauen"""
+        if diary != self.current_diary:
+            return
+        for entry in removed:
+            self.remove_entry(entry)
+        for entry in added:
+            self.insert_entry(entry)
+        for entry in moved:
+            item = self.day_items.get(entry.date)
+            if item is not None:
+                item.setData(0, Qt.UserRole, str(entry.day_file))
+        # Offene Fenster: Vor/Zurück passt zu den neuen Nachbarn
+        for viewer in self.viewer_pool.viewers:
+            viewer.update_navigation()
+    
+    def quick_index(self):
+        """Schnellsuche im gewählten Tagebuch, in der Zeitleiste über alle"""
+        if self.current_diary:
+            return self.cache.quick_index([self.current_diary])
+        if self.timeline is not None:
+            return self.cache.quick_index(self.timeline.diaries)
+        return None
+    
+    def on_quick_open(self, result):
+        """Öffnet den Tag eines Treffers aus der Schnellsuche"""
+        self.open_day(result.diary, result.day)
+        item = self.day_items.get(result.day)
+        if item is not None and result.diary == self.current_diary:
+            self.entry_tree.setCurrentItem(item)
+            self.entry_tree.scrollToItem(item)
+    
+    @traced("Jahresübersicht")
+    def show_heatmap(self):
+        """Zeigt die Heatmap des aktuellen Tagebuchs"""
+        from heatmap import HeatmapDialog
         
         if not self.current_diary:
             return
+        if self.heatmap_dialog is not None:
+            self.heatmap_dialog.close()
+        diary = self.current_diary
+        self.heatmap_dialog = HeatmapDialog(
+            self.cache.stats(diary),
+            lambda day: self.open_day(diary, day),
+            self,
+            self.settings["language"],
+        )
+        self.heatmap_dialog.show()
+    
+    @traced("Auswertungen")
+    def show_analytics(self):
+        """Zeigt Trends des aktuellen Tagebuchs als Diagramme"""
+        if not self.current_diary:
+            return
+        lang = self.settings["language"]
+        # NumPy nur laden, wenn die Auswertungen wirklich geöffnet werden
+        try:
+            from charts import AnalyticsDialog
+        except ImportError as e:
+            QMessageBox.warning(
+                self, "Fehler" if lang == "Deutsch" else "Error",
+                (f"Auswertungen benötigen NumPy (sudo apt install python3-numpy): {e}"
+                 if lang == "Deutsch" else
+                 f"Analytics need NumPy (sudo apt install python3-numpy): {e}"))
+            return
+        dialog = AnalyticsDialog(self.cache.stats(self.current_diary), self, lang)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+    
+    def check_current_diary(self):
+        """Prüft das Tagebuch im Hintergrund (duckday.fsck)"""
+        from duckday.fsck import check_diary
         
-        # Jahr → Monat → Tag Hierarchie
-        year_items = {}
-        
-        for year_dir in sorted(self.current_diary.glob("*"), reverse=True):
-            if year_dir.is_dir() and year_dir.name.isdigit():
-                year_item = QTreeWidgetItem([f"📅 {year_dir.name}"])
-                year_item.setExpanded(True)
-                self.entry_tree.addTopLevelItem(year_item)
-                
-                for month_dir in sorted(year_dir.glob("*"), reverse=True):
-                    if month_dir.is_dir():
-                        month_item = QTreeWidgetItem([f"📆 {month_dir.name}"])
-                        month_item.setExpanded(True)
-                        year_item.addChild(month_item)
-                        
-                        for day_dir in sorted(month_dir.glob("*"), reverse=True):
-                            if day_dir.is_dir():
-                                day_file = day_dir / "Day.txt"
-                                if day_file.exists():
-                                    day_item = QTreeWidgetItem([f"📝 Tag {day_dir.name}"])
-                                    day_item.setData(0, Qt.UserRole, str(day_file))
-                                    month_item.addChild(day_item)
+        if not self.current_diary:
+            return
+        diary = self.current_diary
+        self.check_button.setEnabled(False)
+        self.check_button.setText("🩺 …")
+        
+        def run():
+            try:
+                # Threads statt Prozesse: kein fork() aus der Qt-Anwendung
+                result = check_diary(diary, processes=False)
+            except Exception as e:
+                result = e
+            try:
+                self.check_finished.emit(diary, result)
+            except RuntimeError:
+                # Reader wurde inzwischen geschlossen
+                pass
+        
+        threading.Thread(target=run, daemon=True).start()
     
+    def on_check_finished(self, diary, result):
+        lang = self.settings["language"]
+        self.check_button.setText("🩺 Prüfen" if lang == "Deutsch" else "🩺 Check")
+        self.check_button.setEnabled(self.current_diary is not None)
+        if isinstance(result, Exception):
+            QMessageBox.warning(self, "Fehler" if lang == "Deutsch" else "Error",
+                                f"Prüfung fehlgeschlagen: {result}")
+            return
+        dialog = CheckResultDialog(diary, result, self.viewer_pool.open, self, lang)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+    
+    def make_yearbook(self):
+        """Jahrbuch des Tagebuchs als PDF: yearbook.py als eigener Prozess
+        
+        Gemalt wird dort im Hauptthread einer QGuiApplication (offscreen);
+        der Reader liest nur den Fortschritt mit.
+        """
+        from yearbook import YearbookDialog
+        
+        if not self.current_diary:
+            return
+        lang = self.settings["language"]
+        diary = self.current_diary
+        dialog = YearbookDialog(self.cache.stats(diary).years(), self, lang)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        start, end = dialog.get_range()
+        name = f"{diary.stem}-{start.year}.pdf" if start.year == end.year else f"{diary.stem}-{start}-{end}.pdf"
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Jahrbuch speichern" if lang == "Deutsch" else "Save year book",
+            str(Path.home() / name), "PDF (*.pdf)")
+        if not path:
+            return
+        self.yearbook_button.setEnabled(False)
+        self.yearbook_button.setText("📕 …")
+        
+        process = QProcess(self)
+        environment = QProcessEnvironment.systemEnvironment()
+        environment.insert("QT_QPA_PLATFORM", "offscreen")
+        process.setProcessEnvironment(environment)
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        self.yearbook_output = []
+        process.readyReadStandardOutput.connect(lambda: self.on_yearbook_output(process))
+        process.finished.connect(lambda code, status: self.on_yearbook_finished(path, code, status))
+        process.errorOccurred.connect(lambda error: self.on_yearbook_error(process, path, error))
+        process.start(sys.executable, [str(Path(__file__).resolve().with_name("yearbook.py")),
+                                       str(diary), start.isoformat(), path,
+                                       "--to", end.isoformat(), "--language", lang])
+    
+    def on_yearbook_output(self, process):
+        """Fortschritt ("3/12 Monate") aus der Ausgabe von yearbook.py"""
+        text = bytes(process.readAllStandardOutput()).decode("utf-8", errors="replace")
+        lines = [line for line in text.splitlines() if line.strip()]
+        self.yearbook_output.extend(lines)
+        for line in reversed(lines):
+            done, _, rest = line.partition("/")
+            if done.isdigit() and rest.endswith(" Monate"):
+                self.yearbook_button.setText(f"📕 {done}/{rest.split()[0]}")
+                break
+    
+    def on_yearbook_error(self, process, path, error):
+        """Nur Startfehler: sonst meldet sich finished"""
+        if error == QProcess.FailedToStart:
+            self.yearbook_output.append(process.errorString())
+            self.on_yearbook_finished(path, -1, QProcess.CrashExit)
+    
+    def on_yearbook_finished(self, path, code, status):
+        lang = self.settings["language"]
+        self.yearbook_button.setText("📕 Jahrbuch" if lang == "Deutsch" else "📕 Year book")
+        self.yearbook_button.setEnabled(self.current_diary is not None)
+        if status != QProcess.NormalExit or code != 0:
+            message = self.yearbook_output[-1] if self.yearbook_output else f"Exit-Code {code}"
+            QMessageBox.warning(self, "Fehler" if lang == "Deutsch" else "Error",
+                                f"Jahrbuch fehlgeschlagen: {message}")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(path))
+    
+    def open_day(self, diary, day):
+        """Öffnet den Eintrag eines Datums"""
+        day_file = self.cache.lookup(diary, day)
+        if day_file:
+            self.viewer_pool.open(day_file)
+    
+    @traced("Eintrag öffnen")
     def on_entry_double_clicked(self, item, column):
-        """Öffnet Eintrag in neuem Fenster"""
+        """Öffnet Eintrag in einem (ggf. wiederverwendeten) Fenster"""
         day_file_str = item.data(0, Qt.UserRole)
         if day_file_str:
-            day_file = Path(day_file_str)
-            window = EntryViewerWindow(day_file, self.settings, self)
-            window.show()
-            self.entry_windows.append(window)
+            self.viewer_pool.open(Path(day_file_str))
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: reader.py <config_file>")
+    argv = StartupReport.strip_flag(sys.argv)
+    if len(argv) < 2:
+        print("Usage: reader.py <config_file> [--startup-report]")
         sys.exit(1)
     
-    app = QApplication(sys.argv)
-    app.setApplicationName("DiaryDuck")
-    
-    # Modernes Theme
-    app.setStyle("Fusion")
+    with startup.phase("QApplication"):
+        app = QApplication(argv)
+        app.setApplicationName("DiaryDuck")
+        
+        # Modernes Theme
+        app.setStyle("Fusion")
     
-    reader = DiaryReader(sys.argv[1])
-    reader.show()
+    with startup.phase("Reader aufbauen"):
+        reader = DiaryReader(argv[1])
+    with startup.phase("Reader anzeigen"):
+        reader.show()
+    if startup.enabled:
+        after_first_paint(reader, startup.finish)
     
     sys.exit(app.exec_())
 
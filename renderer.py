@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Darstellung zerlegter Einträge in einem QTextDocument
+Wird von Reader (Eintragsfenster) und Editor (Vorschau) verwendet
+"""
+
+from PyQt5.QtCore import QUrl
+from PyQt5.QtGui import QFont, QTextCharFormat, QColor, QTextCursor, QTextDocument
+
+from duckday.markup import format_style, token_display
+from duckday.trace import span, traced
+
+IMAGE_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.svg']
+PLAYABLE_EXTENSIONS = ['.mp3', '.ogg', '.opus', '.mp4']
+
+
+def char_format(format_info):
+    """QTextCharFormat aus (Größe, FKUD, Farbe)"""
+    style = format_style(format_info)
+
+    char_format = QTextCharFormat()
+    font = QFont()
+    font.setPointSize(style.size)
+    font.setBold(style.bold)
+    font.setItalic(style.italic)
+    font.setUnderline(style.underline)
+    font.setStrikeOut(style.strike)
+    char_format.setFont(font)
+
+    char_format.setForeground(QColor(style.color))
+    return char_format
+
+
+def link_format(base, href, color=None, underline=True, background=None):
+    """Abgeleitetes Format für klickbare Markup-Elemente"""
+    link = QTextCharFormat(base)
+    if color:
+        link.setForeground(QColor(color))
+    if underline:
+        link.setFontUnderline(True)
+    if background:
+        link.setBackground(QColor(background))
+    link.setAnchor(True)
+    link.setAnchorHref(href)
+    return link
+
+
+def insert_tokens(cursor, tokens, format_info, media_dir):
+    """Fügt eine formatierte Zeile (Tokens aus duckday.markup) ein"""
+    base = char_format(format_info)
+
+    for kind, value in tokens:
+        if kind == "text":
+            cursor.insertText(value, base)
+        elif kind == "media":
+            media_file = media_dir / value
+            if media_file.exists():
+                insert_media(cursor, media_file)
+            else:
+                # Sichtbar statt still übersprungen (siehe duckday.fsck)
+                missing = QTextCharFormat(base)
+                missing.setForeground(QColor("#dc3545"))
+                cursor.insertText(f"⚠️ <{value}>", missing)
+        else:
+            # Zeichen und Farbe wie im HTML-Export (duckday.website)
+            text, color, background = token_display(kind, value)
+            href = value if kind == "url" else f"{kind}:{value}"
+            cursor.insertText(text, link_format(base, href, color, underline=background is None,
+                                                background=background))
+
+    cursor.insertText('\n')
+
+
+@traced("Medien laden")
+def insert_media(cursor, media_file):
+    """Fügt Medien ein"""
+    ext = media_file.suffix.lower()
+
+    if ext in IMAGE_EXTENSIONS:
+        src = QUrl.fromLocalFile(str(media_file)).toString()
+        cursor.insertHtml(f'<br><img src="{src}" width="500" style="border-radius: 8px;"><br>')
+    elif ext in PLAYABLE_EXTENSIONS:
+        link = QTextCharFormat()
+        link.setForeground(QColor("#0066cc"))
+        link.setFontUnderline(True)
+        link.setAnchor(True)
+        link.setAnchorHref(f"media:{media_file}")
+        cursor.insertText(f"\n🎬 [{media_file.name}]\n", link)
+
+
+def render_lines(cursor, lines, media_dir):
+    """Fügt alle Zeilen eines ParsedEntry ein"""
+    for line in lines:
+        if line.blank:
+            cursor.insertText('\n')
+        elif line.format:
+            insert_tokens(cursor, line.tokens, line.format, media_dir)
+        else:
+            cursor.insertText(line.tokens[0].value + '\n')
+
+
+def render_document(parsed, media_dir, parent=None, default_font=None):
+    """Baut ein neues QTextDocument für einen Eintrag"""
+    with span("Rendern"):
+        document = QTextDocument(parent)
+        # Nur lesen: kein Undo-Verlauf im Speicher
+        document.setUndoRedoEnabled(False)
+        if default_font is not None:
+            document.setDefaultFont(default_font)
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        render_lines(cursor, parsed.lines, media_dir)
+        cursor.endEditBlock()
+    return document
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Gemeinsame Hilfen für die Tests: kleine Tagebücher in tmp_path"""
+
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from duckday.dates import day_folder  # noqa: E402
+
+
+def write_day(diary, day, text, mtime=None, **attachments):
+    """Legt Jahr/MM/TT/Day.txt (und Anhänge Name=Inhalt) an; gibt den Tagesordner zurück"""
+    folder = day_folder(diary, day)
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "Day.txt").write_text(text, encoding="utf-8")
+    for name, content in attachments.items():
+        (folder / name.replace("__", ".")).write_text(content, encoding="utf-8")
+    if mtime is not None:
+        for path in folder.iterdir():
+            os.utime(path, (mtime, mtime))
+    return folder
+
+
+@pytest.fixture
+def diary(tmp_path):
+    """Tagebuch mit drei alten Tagen"""
+    path = tmp_path / "Test.duckday"
+    path.mkdir()
+    write_day(path, date(2020, 1, 1), "{20|fkud|Schwarz}\nNeujahr #Feiertag\n")
+    write_day(path, date(2020, 1, 2), "{20|fkud|Schwarz}\nArbeit mit @Ben\n", Ben__vcard="BEGIN:VCARD\n")
+    write_day(path, date(2020, 2, 3), "{20|fkud|Schwarz}\nUrlaub im %Harz\n", Harz__kml="<kml/>\n")
+    return path
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import os
+import socket
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+
+from duckday import compression
+from duckday.backup import (LOCK, MANIFEST, backup, backup_folder, keep_snapshots, prune, restore_day,
+                            restore_snapshot, snapshots)
+
+
+def backup_as(diary, target, stamp):
+    """Schnappschuss anlegen und auf einen festen Zeitpunkt umbenennen"""
+    name = backup(diary, target)[0]
+    folder = backup_folder(diary, target)
+    os.rename(folder / name, folder / stamp)
+    return folder / stamp
+
+
+def test_second_snapshot_links_unchanged_files(diary, tmp_path):
+    target = tmp_path / "Backups"
+    first = backup_as(diary, target, "2026-10-17_030000")
+    (diary / "2020/01/01/Day.txt").write_text("geändert\n", encoding="utf-8")
+    name, copied, linked, _ = backup(diary, target)
+    second = backup_folder(diary, target) / name
+    assert (copied, linked) == (1, 4)
+    assert os.stat(second / "2020/01/02/Ben.vcard").st_nlink == 2
+    assert (first / "2020/01/01/Day.txt").read_text(encoding="utf-8") != "geändert\n"
+    assert not (second / ".tagesgans").exists()
+    assert not (backup_folder(diary, target) / LOCK).exists()
+
+
+def test_keep_snapshots():
+    names = ["2026-09-01_030000", "2026-10-01_030000", "2026-10-17_030000",
+             "2026-10-18_010000", "2026-10-18_030000"]
+    assert keep_snapshots(names) == {"2026-10-18_030000"}
+    assert keep_snapshots(names, daily=2) == {"2026-10-18_030000", "2026-10-17_030000"}
+    assert keep_snapshots(names, monthly=3) == {"2026-10-18_030000", "2026-09-01_030000"}
+
+
+def test_prune(diary, tmp_path):
+    target = tmp_path / "Backups"
+    for stamp in ("2026-10-16_030000", "2026-10-17_030000", "2026-10-17_120000"):
+        backup_as(diary, target, stamp)
+    folder = backup_folder(diary, target)
+    assert prune(folder, daily=2) == ["2026-10-17_030000"]
+    assert snapshots(folder) == ["2026-10-16_030000", "2026-10-17_120000"]
+
+
+def test_restore(diary, tmp_path):
+    snapshot = backup_as(diary, tmp_path / "Backups", "2026-10-17_030000")
+    (diary / "2020/01/02/Day.txt").write_text("kaputt\n", encoding="utf-8")
+    assert restore_day(snapshot, diary, date(2020, 1, 2)) == ["Ben.vcard", "Day.txt"]
+    assert "@Ben" in (diary / "2020/01/02/Day.txt").read_text(encoding="utf-8")
+
+    copy = tmp_path / "Alt.duckday"
+    restore_snapshot(snapshot, copy)
+    assert (copy / "2020/02/03/Harz.kml").exists()
+    assert not (copy / MANIFEST).exists()
+    with pytest.raises(ValueError):
+        restore_snapshot(snapshot, copy)
+
+
+@pytest.mark.parametrize("where", ["parent", "inside", "same"])
+def test_target_must_not_overlap_diary(diary, where):
+    target = {"parent": diary.parent, "inside": diary / "Backups", "same": diary}[where]
+    before = sorted(path.name for path in diary.iterdir())
+    with pytest.raises(ValueError):
+        backup(diary, target)
+    assert sorted(path.name for path in diary.iterdir()) == before
+
+
+def test_running_backup_is_not_disturbed(diary, tmp_path):
+    target = tmp_path / "Backups"
+    folder = backup_folder(diary, target)
+    busy = folder / "2026-10-18_030000.tmp"
+    busy.mkdir(parents=True)
+    (folder / LOCK).write_text(f"{socket.gethostname()} {os.getpid()}\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        backup(diary, target)
+    assert busy.is_dir()
+    assert (folder / LOCK).exists()
+
+
+def test_stale_lock_is_taken_over(diary, tmp_path):
+    target = tmp_path / "Backups"
+    folder = backup_folder(diary, target)
+    leftover = folder / "2026-10-18_030000.tmp"
+    leftover.mkdir(parents=True)
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    (folder / LOCK).write_text(f"{socket.gethostname()} {finished.pid}\n", encoding="utf-8")
+    backup(diary, target)
+    assert not leftover.exists()
+    assert len(snapshots(folder)) == 1
+    assert not (folder / LOCK).exists()
+
+
+def test_restore_day_replaces_other_compression(diary, tmp_path):
+    day_dir = diary / "2020/01/02"
+    content = "{20|fkud|Schwarz}\nArbeit mit @Ben\n" * 50
+    (day_dir / "Day.txt").write_text(content, encoding="utf-8")
+    assert compression.compress_file(day_dir / "Day.txt", "gzip") > 0
+    packed = backup_as(diary, tmp_path / "Backups", "2026-10-17_030000")
+
+    # Inzwischen unkomprimiert gespeichert
+    compression.remove_compressed(day_dir / "Day.txt")
+    (day_dir / "Day.txt").write_text("neuer\n", encoding="utf-8")
+    plain = backup_as(diary, tmp_path / "Plain", "2026-10-17_030000")
+    restore_day(packed, diary, date(2020, 1, 2))
+    assert not (day_dir / "Day.txt").exists()
+    assert compression.read_text(day_dir / "Day.txt") == content
+
+    # Und umgekehrt: Schnappschuss unkomprimiert, Tag komprimiert
+    restore_day(plain, diary, date(2020, 1, 2))
+    assert not (day_dir / "Day.txt.gz").exists()
+    assert (day_dir / "Day.txt").read_text(encoding="utf-8") == "neuer\n"
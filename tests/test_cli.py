@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+import runpy
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_as_worker_main_does_not_run_cli(monkeypatch, capsys):
+    # So importieren spawn/forkserver-Worker das Skript: mit den Argumenten des Elternprozesses
+    monkeypatch.setattr(sys, "argv", ["tagesgans.py", "list", "Gibt-es-nicht"])
+    namespace = runpy.run_path(str(ROOT / "tagesgans.py"), run_name="__mp_main__")
+    assert "main" in namespace
+    assert capsys.readouterr().out == ""
+    assert "mainwindow" not in sys.modules
+
+
+def test_cli_command(diary):
+    result = subprocess.run([sys.executable, str(ROOT / "tagesgans.py"), "list", str(diary)],
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "2020-01-01" in result.stdout
+    assert "PyQt5" not in result.stderr
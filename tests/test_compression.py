@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import gzip
+import os
+
+from duckday import compression
+
+
+def test_compress_and_decompress_roundtrip(diary):
+    count, saved = compression.compress_diary(diary, "gzip", older_than_days=0, processes=False)
+    assert count >= 0
+    for day_file in diary.glob("*/*/*/Day.txt*"):
+        assert compression.read_text(day_file.with_name("Day.txt")).startswith("{20|fkud|Schwarz}")
+    compression.decompress_diary(diary, processes=False)
+    assert not list(diary.glob("*/*/*/*.gz"))
+    assert (diary / "2020" / "01" / "01" / "Day.txt").read_text(encoding="utf-8").startswith("{20|")
+
+
+def test_decompress_leaves_user_archives_alone(diary):
+    archive = diary / "2020" / "01" / "01" / "notes.tar.gz"
+    data = gzip.compress(b"Anhang des Benutzers")
+    archive.write_bytes(data)
+    compression.compress_file(diary / "2020" / "01" / "02" / "Ben.vcard", "gzip")
+    assert compression.compressed_files(diary) == []
+    compression.decompress_diary(diary, processes=False)
+    assert archive.read_bytes() == data
+    assert not (archive.parent / "notes.tar").exists()
+
+
+def test_decompress_restores_own_files(diary):
+    day_file = diary / "2020" / "01" / "01" / "Day.txt"
+    content = day_file.read_bytes() * 50
+    day_file.write_bytes(content)
+    assert compression.compress_file(day_file, "gzip") > 0
+    assert compression.compressed_files(diary) == [day_file.with_name("Day.txt.gz")]
+    compression.decompress_diary(diary, processes=False)
+    assert day_file.read_bytes() == content
+
+
+def test_compress_keeps_concurrent_save(diary, monkeypatch):
+    day_file = diary / "2020" / "01" / "01" / "Day.txt"
+    day_file.write_text("alt\n" * 200, encoding="utf-8")
+    original = compression._compress
+
+    def save_while_compressing(data, codec):
+        # Der Editor speichert, während komprimiert wird
+        day_file.write_text("neu gespeichert\n" * 300, encoding="utf-8")
+        st = os.stat(day_file)
+        os.utime(day_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        return original(data, codec)
+
+    monkeypatch.setattr(compression, "_compress", save_while_compressing)
+    assert compression.compress_file(day_file, "gzip") == 0
+    assert day_file.read_text(encoding="utf-8") == "neu gespeichert\n" * 300
+    assert not day_file.with_name("Day.txt.gz").exists()
+    assert not day_file.with_name("Day.txt.gz.tmp").exists()
+
+
+def test_cold_files_skips_open_days(diary):
+    open_day = diary / "2020" / "01" / "02"
+    files = compression.cold_files(diary, 0, skip=lambda day_dir: day_dir == open_day)
+    assert files
+    assert all(path.parent != open_day for path in files)
+
+
+def test_decompress_keeps_newer_plain_copy(diary):
+    # Nach einem Sync: eine Seite hat komprimiert, die andere danach bearbeitet
+    day_file = diary / "2020" / "01" / "01" / "Day.txt"
+    packed = day_file.with_name("Day.txt.gz")
+    packed.write_bytes(gzip.compress(b"alte Fassung\n"))
+    os.utime(packed, (1_600_000_000, 1_600_000_000))
+    day_file.write_text("neue Fassung\n", encoding="utf-8")
+    compression.decompress_diary(diary, processes=False)
+    assert day_file.read_text(encoding="utf-8") == "neue Fassung\n"
+    assert not packed.exists()
+
+
+def test_decompress_replaces_older_plain_copy(diary):
+    day_file = diary / "2020" / "01" / "01" / "Day.txt"
+    os.utime(day_file, (1_600_000_000, 1_600_000_000))
+    packed = day_file.with_name("Day.txt.gz")
+    packed.write_bytes(gzip.compress(b"neuere Fassung\n"))
+    compression.decompress_file(packed)
+    assert day_file.read_text(encoding="utf-8") == "neuere Fassung\n"
+    assert not packed.exists()
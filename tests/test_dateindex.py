@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+import json
+from datetime import date
+
+from duckday.dateindex import DateIndex
+from duckday.dates import day_folder
+
+from conftest import write_day
+
+
+def test_open_finds_days(diary):
+    index = DateIndex.open(diary)
+    assert [entry.date for entry in index.entries()] == [date(2020, 1, 1), date(2020, 1, 2), date(2020, 2, 3)]
+    assert index.lookup(date(2020, 1, 2)) == diary / "2020/01/02/Day.txt"
+    assert index.lookup(date(2020, 1, 3)) is None
+
+
+def test_day_txt_in_existing_folder(diary):
+    # Tagesordner nur mit Anhang, z.B. halb synchronisiert
+    folder = day_folder(diary, date(2020, 1, 5))
+    folder.mkdir()
+    (folder / "Bild.png").write_bytes(b"png")
+    assert DateIndex.open(diary).lookup(date(2020, 1, 5)) is None
+
+    # Day.txt kommt dazu: ändert nur die mtime des Tagesordners
+    write_day(diary, date(2020, 1, 5), "Nachgereicht\n")
+    assert DateIndex.open(diary).lookup(date(2020, 1, 5)) == folder / "Day.txt"
+
+    (folder / "Day.txt").unlink()
+    assert date(2020, 1, 5) not in DateIndex.open(diary).dates
+
+
+def test_old_index_is_rebuilt(diary):
+    index = DateIndex.open(diary)
+    data = json.loads(index.path.read_text(encoding="utf-8"))
+    data["version"] = 1
+    del data["days"]
+    index.path.write_text(json.dumps(data), encoding="utf-8")
+    assert len(DateIndex.open(diary)) == 3
+    assert "days" in json.loads(index.path.read_text(encoding="utf-8"))
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from duckday.dates import folder_date, month_number, parse_iso
+
+
+def test_month_number():
+    assert month_number("03") == 3
+    assert month_number("3") == 3
+    assert month_number("März") == 3
+    assert month_number("march") == 3
+    assert month_number("Maerz") == 3
+    assert month_number("Jänner") == 1
+    assert month_number("13") is None
+    assert month_number("00") is None
+    assert month_number("Urlaub") is None
+
+
+def test_folder_date():
+    assert folder_date("2020", "Februar", "3") == date(2020, 2, 3)
+    assert folder_date("2020", "02", "30") is None
+    assert folder_date("2020", "02", "Bilder") is None
+
+
+def test_parse_iso():
+    assert parse_iso(" 2019-03-14 ") == date(2019, 3, 14)
+    assert parse_iso("14.03.2019") == date(2019, 3, 14)
+    assert parse_iso("14.03") is None
+    assert parse_iso("gestern") is None
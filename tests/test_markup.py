@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from duckday.markup import Token, parse, timestamp_valid, tokenize
+
+
+def test_tokenize_kinds():
+    line = "Mit @Ben in %Harz, 'Zitat' §2020.1.2 =Urlaub <Bild.png> https://example.org/x?y=1 Ende"
+    assert tokenize(line) == [
+        Token("text", "Mit "), Token("person", "Ben"), Token("text", " in "), Token("place", "Harz"),
+        Token("text", ", "), Token("copy", "Zitat"), Token("text", " "), Token("time", "2020.1.2"),
+        Token("text", " "), Token("label", "Urlaub"), Token("text", " "), Token("media", "Bild.png"),
+        Token("text", " "), Token("url", "https://example.org/x?y=1"), Token("text", " Ende"),
+    ]
+
+
+def test_tokenize_plain_text():
+    assert tokenize("kein Markup, nur 100 %") == [Token("text", "kein Markup, nur 100 %")]
+    assert tokenize("") == []
+
+
+def test_tokenize_unicode_names():
+    assert tokenize("@Jörg") == [Token("person", "Jörg")]
+
+
+def test_timestamp_valid():
+    assert timestamp_valid("2020.1.2")
+    assert timestamp_valid("2020.01.02.23.59.")
+    assert not timestamp_valid("2020.2.30")
+    assert not timestamp_valid("2020.1.2.24.00")
+    assert not timestamp_valid("2020.1")
+
+
+def test_parse_collects_unique_names():
+    entry = parse("{20|fkud|Schwarz}\n@Ben und @Ben, =A §2020.1.1\n\n=A =B §2020.1.1\nohne")
+    assert entry.people == ["Ben"]
+    assert entry.labels == ["A", "B"]
+    assert entry.timestamps == ["2020.1.1", "2020.1.1"]
+    assert [line.blank for line in entry.lines] == [False, False, True, False, False]
+    assert entry.words == 9
+
+
+def test_parse_without_format_keeps_line():
+    entry = parse("@Ben ohne Format")
+    assert entry.lines[0].format is None
+    assert entry.lines[0].tokens == [Token("text", "@Ben ohne Format")]
+    assert entry.people == []
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import io
+from datetime import date
+
+from duckday.dateindex import INDEX_DIR, DateIndex
+from duckday.migrate import LOG_NAME, migrate_diary, plan_migration
+
+
+def old_day(diary, month, day, text="{20|fkud|Schwarz}\nAlt\n"):
+    folder = diary / "2019" / month / day
+    folder.mkdir(parents=True)
+    (folder / "Day.txt").write_text(text, encoding="utf-8")
+    return folder
+
+
+def test_migrates_named_months(tmp_path):
+    diary = tmp_path / "Alt.duckday"
+    old_day(diary, "March", "5")
+    old_day(diary, "Februar", "14")
+    plan = migrate_diary(diary, out=io.StringIO())
+    assert not plan.problems
+    assert sorted(p.relative_to(diary).as_posix() for p in diary.glob("2019/*/*")) == ["2019/02/14", "2019/03/05"]
+    assert "2019/March -> 2019/03" in (diary / INDEX_DIR / LOG_NAME).read_text(encoding="utf-8")
+    assert DateIndex.open(diary).lookup(date(2019, 3, 5)) == diary / "2019/03/05/Day.txt"
+    assert not plan_migration(diary)
+
+
+def test_dry_run_changes_nothing(tmp_path):
+    diary = tmp_path / "Alt.duckday"
+    old_day(diary, "March", "5")
+    plan = migrate_diary(diary, dry_run=True, out=io.StringIO())
+    assert plan.moves
+    assert (diary / "2019/March/5/Day.txt").exists()
+    assert not (diary / INDEX_DIR).exists()
+
+
+def test_resumes_half_done_migration(tmp_path):
+    diary = tmp_path / "Alt.duckday"
+    old_day(diary, "03", "05")
+    old_day(diary, "March", "6")
+    old_day(diary, "March", "5", "Doppelt\n")
+    plan = migrate_diary(diary, out=io.StringIO())
+    # Tag 6 kommt dazu, der doppelte Tag 5 bleibt mit Meldung liegen
+    assert (diary / "2019/03/06/Day.txt").exists()
+    assert [message for _, message in plan.problems] == [f"Ziel existiert bereits: {diary / '2019/03/05'}"]
+    assert (diary / "2019/March/5/Day.txt").exists()
+    assert (diary / "2019/03/05/Day.txt").read_text(encoding="utf-8") != "Doppelt\n"
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+import gzip
+from datetime import date
+
+import pytest
+
+from duckday import pack as pack_module
+from duckday.pack import PackedDiary, PackError, pack_diary, unpack
+
+
+def test_roundtrip(diary, tmp_path):
+    target, count = pack_diary(diary, tmp_path / "Test.duckpack")
+    assert count >= 5
+    copy = tmp_path / "Kopie.duckday"
+    assert unpack(target, copy) == count
+    for rel in ("2020/01/01/Day.txt", "2020/01/02/Ben.vcard", "2020/02/03/Harz.kml"):
+        assert (copy / rel).read_bytes() == (diary / rel).read_bytes()
+
+
+def test_lookup(diary, tmp_path):
+    target, _ = pack_diary(diary, tmp_path / "Test.duckpack")
+    with PackedDiary(target) as pack:
+        assert [entry.date for entry in pack.entries()] == [date(2020, 1, 1), date(2020, 1, 2), date(2020, 2, 3)]
+        assert str(pack.lookup(date(2020, 1, 2))) == "2020/01/02/Day.txt"
+        assert pack.lookup(date(2020, 1, 3)) is None
+        assert pack.attachments(pack.lookup(date(2020, 1, 2))) == ["Ben.vcard"]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "kaputt.duckpack"
+    path.write_bytes(b"kein Paket, aber lang genug " * 4)
+    with pytest.raises(PackError):
+        PackedDiary(path)
+
+
+def test_packs_only_the_version_that_is_read(diary, tmp_path):
+    day_dir = diary / "2020" / "01" / "01"
+    (day_dir / "Day.txt.gz").write_bytes(gzip.compress("alte Fassung\n".encode("utf-8")))
+    target, _ = pack_diary(diary, tmp_path / "Test.duckpack")
+    # Einmal eingepackt, nicht zweimal unter demselben Namen
+    assert target.read_bytes().count((day_dir / "Day.txt").read_bytes()) == 1
+    with PackedDiary(target) as pack:
+        assert "2020/01/01/Day.txt.gz" not in pack.files
+        assert pack.read_bytes("2020/01/01/Day.txt") == (day_dir / "Day.txt").read_bytes()
+
+    # Nur komprimiert vorhanden: entpackt eingepackt
+    (day_dir / "Day.txt").unlink()
+    target, _ = pack_diary(diary, tmp_path / "Test.duckpack")
+    with PackedDiary(target) as pack:
+        assert pack.read_bytes("2020/01/01/Day.txt") == "alte Fassung\n".encode("utf-8")
+
+
+def test_extract_stays_in_cache(diary, tmp_path, monkeypatch):
+    monkeypatch.setattr(pack_module, "EXTRACT_CACHE", tmp_path / "cache" / "inner")
+    target, _ = pack_diary(diary, tmp_path / "Test.duckpack")
+    with PackedDiary(target) as pack:
+        assert (pack.extract_day("2020/01/02/Day.txt") / "Ben.vcard").exists()
+        with pytest.raises(ValueError):
+            pack.extract_day("../../Ausbruch/Day.txt")
+    assert not (tmp_path / "cache" / "Ausbruch").exists()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from collections import namedtuple
+from datetime import date
+from pathlib import Path
+
+from duckday.quickindex import QuickIndex
+
+Stats = namedtuple("Stats", "snippet labels people places")
+
+
+class FakeCache:
+    """Nur das, was QuickIndex von DiaryCache braucht"""
+
+    def __init__(self, days):
+        self.table = namedtuple("Table", "days")(days)
+
+    def stats(self, diary):
+        return self.table
+
+
+def make_index():
+    days = {
+        date(2024, 1, day): Stats(f"Tag {day}", ["Arbeit"], ["Anna"], ["Berlin"])
+        for day in range(1, 11)
+    }
+    return QuickIndex(FakeCache(days), [Path("Test.duckday")])
+
+
+def test_empty_query_returns_newest_days():
+    results = make_index().search("", limit=3)
+    assert [result.kind for result in results] == ["date"] * 3
+    assert [result.day for result in results] == [date(2024, 1, 10), date(2024, 1, 9), date(2024, 1, 8)]
+
+
+def test_prefix_alone_lists_names():
+    results = make_index().search("#", limit=2)
+    assert [result.title for result in results] == ["#Arbeit", "#Arbeit"]
+
+
+def test_label_query():
+    results = make_index().search("arb")
+    assert results[0].kind == "label"
+    assert results[0].day == date(2024, 1, 10)
+
+
+def test_date_query():
+    results = make_index().search("3.1.2024")
+    assert results[0].day == date(2024, 1, 3)
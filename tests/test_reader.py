@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import os
+from datetime import date
+
+import pytest
+
+pytest.importorskip("PyQt5")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5 import sip  # noqa: E402
+from PyQt5.QtCore import QCoreApplication, QEvent  # noqa: E402
+from PyQt5.QtGui import QTextDocument  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from duckday.dates import day_folder  # noqa: E402
+
+from conftest import write_day  # noqa: E402
+
+
+@pytest.fixture
+def viewer(diary, tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    app = QApplication.instance() or QApplication([])
+    from reader import EntryViewerWindow
+    window = EntryViewerWindow(day_folder(diary, date(2020, 1, 1)) / "Day.txt", {})
+    yield window
+    window.close()
+    window.deleteLater()
+    app.processEvents()
+
+
+def flush():
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def fill(window, diary, count):
+    """Rendert count weitere Tage in den Cache, ohne sie anzuzeigen"""
+    documents = []
+    for number in range(count):
+        day_file = write_day(diary, date(2021, 1, number + 1), "Text\n") / "Day.txt"
+        document = QTextDocument(window)
+        window.store_document(day_file, None, document)
+        documents.append(document)
+    return documents
+
+
+def test_shown_document_is_never_evicted(viewer, diary):
+    shown = viewer.text_browser.document()
+    assert shown is viewer.shown_document
+    documents = fill(viewer, diary, viewer.DOCUMENT_CACHE_SIZE + 2)
+    flush()
+    assert not sip.isdeleted(shown)
+    assert viewer.is_cached(shown)
+    assert len(viewer.documents) == viewer.DOCUMENT_CACHE_SIZE
+    # Verdrängt und nicht angezeigt: freigegeben
+    assert [sip.isdeleted(document) for document in documents] == [True, True, True, False, False]
+
+
+def test_replaced_shown_document_is_freed_on_switch(viewer, diary):
+    shown = viewer.shown_document
+    write_day(diary, date(2020, 1, 1), "Geändert\n", mtime=1_700_000_000)
+    viewer.reload_entry()
+    flush()
+    # Neu gerendert und angezeigt; die alte Fassung ist weg
+    assert viewer.shown_document is not shown
+    assert sip.isdeleted(shown)
+    assert viewer.is_cached(viewer.shown_document)
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+from duckday.dateindex import DateIndex
+from duckday.stats import StatsTable
+
+
+def test_broken_day_is_skipped(diary):
+    (diary / "2020/01/02/Day.txt").write_bytes(b"{20|fkud|Schwarz}\n\xff kaputt\n")
+    table = StatsTable.open(diary, DateIndex.open(diary))
+    assert sorted(table.days) == [date(2020, 1, 1), date(2020, 2, 3)]
+    assert table.days[date(2020, 2, 3)].words == 3
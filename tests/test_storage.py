@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+from datetime import date
+
+import pytest
+
+from duckday import storage
+from duckday.dateindex import Entry
+from duckday.pack import safe_join
+from duckday.storage import FolderStorage, copy_entries, open_storage
+
+
+class CraftedSource:
+    """Ablage mit präparierten Namen, wie aus einer fremden .duckdb"""
+
+    name = "Fremd"
+
+    def __init__(self, folder="2020/01/01", attachment="Bild.png", diary_file="Info.txt"):
+        self.folder_name = folder
+        self.attachment = attachment
+        self.diary_file = diary_file
+
+    def entries(self):
+        return [Entry("2020", "01", "01", "2020/01/01/Day.txt", date(2020, 1, 1))]
+
+    def folder(self, day_file):
+        return self.folder_name
+
+    def read_text(self, day_file):
+        return "{20|fkud|Schwarz}\nText\n"
+
+    def attachments(self, day_file):
+        return [self.attachment]
+
+    def read_attachment(self, day_file, name):
+        return b"Inhalt"
+
+    def diary_files(self):
+        return [self.diary_file]
+
+    def read_diary_file(self, name):
+        return b"Info"
+
+
+@pytest.mark.parametrize("rel", ["../x", "a/../../x", "/etc/passwd", ".tagesgans/dates.json", "..\\x", ""])
+def test_safe_join_rejects(tmp_path, rel):
+    with pytest.raises(ValueError):
+        safe_join(tmp_path, rel)
+
+
+def test_safe_join_accepts_relative(tmp_path):
+    assert safe_join(tmp_path, "2020/March/01") == tmp_path / "2020" / "March" / "01"
+
+
+@pytest.mark.parametrize("crafted", [
+    {"folder": "../../Ausbruch"},
+    {"folder": "/tmp/Ausbruch"},
+    {"folder": ".tagesgans"},
+    {"attachment": "../../Ausbruch.png"},
+    {"diary_file": "../Ausbruch.txt"},
+])
+def test_export_to_folder_stays_inside(tmp_path, crafted):
+    target = tmp_path / "inner" / "Ziel.duckday"
+    target.mkdir(parents=True)
+    with pytest.raises(ValueError):
+        copy_entries(CraftedSource(**crafted), FolderStorage(target))
+    assert not (tmp_path / "Ausbruch").exists()
+    assert not (tmp_path / "inner" / "Ausbruch.png").exists()
+    assert not (tmp_path / "inner" / "Ausbruch.txt").exists()
+
+
+def test_database_roundtrip(diary, tmp_path):
+    database = open_storage(tmp_path / "Test.duckdb", create=True)
+    assert copy_entries(FolderStorage(diary), database) == 3
+    target = open_storage(tmp_path / "Kopie.duckday", create=True)
+    assert copy_entries(database, target) == 3
+    database.close()
+    for rel in ("2020/01/01/Day.txt", "2020/01/02/Ben.vcard", "2020/02/03/Harz.kml"):
+        assert (tmp_path / "Kopie.duckday" / rel).read_bytes() == (diary / rel).read_bytes()
+
+
+@pytest.mark.parametrize("query, day_file", [
+    ("UPDATE attachments SET name = '../../../Ausbruch.vcard' WHERE name = 'Ben.vcard'", "2020/01/02/Day.txt"),
+    ("UPDATE entries SET folder = '../../Ausbruch' WHERE folder = '2020/01/02'", "../../Ausbruch/Day.txt"),
+])
+def test_extract_from_database_stays_in_cache(diary, tmp_path, monkeypatch, query, day_file):
+    monkeypatch.setattr(storage, "EXTRACT_CACHE", tmp_path / "cache" / "inner")
+    database = open_storage(tmp_path / "Fremd.duckdb", create=True)
+    copy_entries(FolderStorage(diary), database)
+    database.db.execute(query)
+    with pytest.raises(ValueError):
+        database.extract_day(day_file)
+    database.close()
+    assert not list((tmp_path / "cache").glob("Ausbruch*"))
+    assert not (tmp_path / "Ausbruch.vcard").exists()
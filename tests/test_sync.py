@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+
+from duckday.sync import ID_FILE, is_conflict_copy, scan_files, sync
+from duckday.dateindex import INDEX_DIR
+
+
+def tree(root):
+    """Alle Dateien samt Inhalt, auch .tagesgans"""
+    return {path.relative_to(root).as_posix(): path.read_bytes() for path in root.rglob("*") if path.is_file()}
+
+
+def touch_later(path, seconds):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_first_sync_copies_everything(diary, tmp_path):
+    other = tmp_path / "Andere.duckday"
+    other.mkdir()
+    actions = sync(diary, other)
+    assert {action.op for action in actions} == {"kopieren"}
+    assert scan_files(other).keys() == scan_files(diary).keys()
+    assert sync(diary, other) == []
+
+
+def test_changes_and_deletes_propagate(diary, tmp_path):
+    other = tmp_path / "Andere.duckday"
+    other.mkdir()
+    sync(diary, other)
+    day = "2020/01/01/Day.txt"
+    (diary / day).write_text("geändert\n", encoding="utf-8")
+    (other / "2020/01/02/Ben.vcard").unlink()
+    actions = sync(diary, other)
+    assert sorted((action.op, action.path) for action in actions) == [
+        ("kopieren", day), ("löschen", "2020/01/02/Ben.vcard")]
+    assert (other / day).read_text(encoding="utf-8") == "geändert\n"
+    assert not (diary / "2020/01/02/Ben.vcard").exists()
+
+
+def test_conflict_keeps_both_versions(diary, tmp_path):
+    other = tmp_path / "Andere.duckday"
+    other.mkdir()
+    sync(diary, other)
+    day = "2020/01/01/Day.txt"
+    (diary / day).write_text("Fassung A\n", encoding="utf-8")
+    (other / day).write_text("Fassung B\n", encoding="utf-8")
+    touch_later(other / day, 10)
+    actions = sync(diary, other)
+    assert [(action.op, action.source) for action in actions] == [("konflikt", "b")]
+    for side in (diary, other):
+        assert (side / day).read_text(encoding="utf-8") == "Fassung B\n"
+        kept = [path for path in (side / "2020/01/01").iterdir() if is_conflict_copy(path.name)]
+        assert [path.read_text(encoding="utf-8") for path in kept] == ["Fassung A\n"]
+
+
+def test_modify_wins_over_delete(diary, tmp_path):
+    other = tmp_path / "Andere.duckday"
+    other.mkdir()
+    sync(diary, other)
+    day = "2020/02/03/Day.txt"
+    (diary / day).unlink()
+    (other / day).write_text("noch da\n", encoding="utf-8")
+    sync(diary, other)
+    assert (diary / day).read_text(encoding="utf-8") == "noch da\n"
+
+
+def test_dry_run_writes_nothing(diary, tmp_path):
+    other = tmp_path / "Andere.duckday"
+    other.mkdir()
+    before = (tree(diary), tree(other))
+    actions = sync(diary, other, dry_run=True)
+    assert actions
+    assert (tree(diary), tree(other)) == before
+    assert not (diary / INDEX_DIR / ID_FILE).exists()
+
+
+def test_dry_run_on_hand_copy_keeps_ids(diary, tmp_path):
+    first = tmp_path / "Erste.duckday"
+    first.mkdir()
+    sync(diary, first)
+    copy = tmp_path / "Kopie.duckday"
+    shutil.copytree(diary, copy)
+    (copy / "2020/01/01/Day.txt").write_text("nur in der Kopie\n", encoding="utf-8")
+    before = (tree(diary), tree(copy))
+    sync(diary, copy, dry_run=True)
+    assert (tree(diary), tree(copy)) == before
+
+    sync(diary, copy)
+    ids = {(side / INDEX_DIR / ID_FILE).read_text(encoding="utf-8") for side in (diary, copy)}
+    assert len(ids) == 2
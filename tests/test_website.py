@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from pathlib import Path
+
+from duckday import website
+from duckday.markup import format_style, parse, token_display
+from duckday.website import export_site, line_style, render_html
+
+
+def test_format_style():
+    style = format_style((14, "FkUd", "Rot"))
+    assert style == (14, True, False, True, False, "red")
+    assert line_style((14, "FkUd", "Rot")) == "font-size: 14pt; color: red; font-weight: bold; text-decoration: underline"
+
+
+def test_render_html_uses_shared_display():
+    parsed = parse("{20|fkud|Schwarz}\n@Ben =Urlaub <fehlt.png>")
+    text, color, _ = token_display("person", "Ben")
+    page = render_html(parsed, {}, "../../")
+    assert f'<span style="color: {color}">{text}</span>' in page
+    assert 'href="../../labels/Urlaub.html"' in page
+    assert 'class="missing"' in page
+
+
+def test_failed_day_is_retried(diary, tmp_path):
+    target = tmp_path / "Seiten"
+    broken = diary / "2020/01/02/Day.txt"
+    broken.write_bytes(b"{20|fkud|Schwarz}\n\xff\xfe kaputt\n")
+    assert export_site(diary, target, jobs=1) == (3, 2)
+    assert not (target / "2020/01/02.html").exists()
+    # Unverändert: wird trotzdem wieder versucht
+    assert export_site(diary, target, jobs=1)[0] == 1
+
+    broken.write_text("{20|fkud|Schwarz}\nrepariert\n", encoding="utf-8")
+    assert export_site(diary, target, jobs=1) == (1, 3)
+    assert "repariert" in (target / "2020/01/02.html").read_text(encoding="utf-8")
+
+
+def test_unreadable_day_keeps_its_page(diary, tmp_path, monkeypatch):
+    target = tmp_path / "Seiten"
+    export_site(diary, target, jobs=1)
+    signature = website.day_signature
+
+    def failing(day_file, previous, following):
+        if "2020/01/02" in Path(day_file).as_posix():
+            raise OSError("gesperrt")
+        return signature(day_file, previous, following)
+
+    monkeypatch.setattr(website, "day_signature", failing)
+    assert export_site(diary, target, jobs=1) == (0, 3)
+    assert (target / "2020/01/02.html").exists()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def offscreen_env():
+    return dict(os.environ, QT_QPA_PLATFORM="offscreen")
+
+
+def test_smoke_run_writes_pdf(diary, tmp_path):
+    target = tmp_path / "Jahrbuch.pdf"
+    result = subprocess.run([sys.executable, str(ROOT / "yearbook.py"), str(diary), "2020", str(target),
+                             "--jobs", "1"], env=offscreen_env(), capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "2/2 Monate" in result.stdout
+    assert target.read_bytes().startswith(b"%PDF")
+    assert not target.with_name("Jahrbuch.pdf.tmp").exists()
+
+
+def test_failure_keeps_previous_pdf(diary, tmp_path, monkeypatch):
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtGui import QGuiApplication
+    import yearbook
+
+    app = QGuiApplication.instance() or QGuiApplication([])
+    target = tmp_path / "Jahrbuch.pdf"
+    target.write_bytes(b"altes PDF")
+
+    def broken(*args):
+        raise RuntimeError("Absturz beim Malen")
+
+    monkeypatch.setattr(yearbook, "render_lines", broken)
+    with pytest.raises(RuntimeError):
+        yearbook.export_yearbook(diary, date(2020, 1, 1), date(2020, 12, 31), target, jobs=1)
+    assert target.read_bytes() == b"altes PDF"
+    assert not target.with_name("Jahrbuch.pdf.tmp").exists()
+    assert app is not None
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Einblendung der Zeitmessung (nur wenn duckday.trace aktiv ist)
+
+Strg+Umschalt+T blendet die Anzeige ein/aus,
+Strg+Umschalt+E speichert den bisherigen Trace als Chrome-Trace-JSON.
+"""
+
+from datetime import datetime
+
+from PyQt5.QtWidgets import QLabel, QShortcut
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
+from PyQt5.QtGui import QFont, QKeySequence
+
+from duckday.trace import TRACE_DIR, breakdown, tracer
+
+
+class TraceOverlay(QLabel):
+    """Zeigt die Aufteilung der zuletzt gemessenen Operation"""
+
+    # Spans können aus Worker-Threads kommen: per Signal in den GUI-Thread
+    span_finished = pyqtSignal(object)
+
+    MARGIN = 10
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        self.setFont(QFont("Monospace", 9))
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 180); color: #e0e0e0;"
+            "border-radius: 5px; padding: 6px;"
+        )
+        self.hidden_by_user = False
+        self.hide()
+
+        self.span_finished.connect(self.show_span)
+        listener = self.span_finished.emit
+        tracer.add_listener(listener)
+        self.destroyed.connect(lambda _=None: tracer.remove_listener(listener))
+
+        parent.installEventFilter(self)
+
+        toggle = QShortcut(QKeySequence("Ctrl+Shift+T"), parent)
+        toggle.activated.connect(self.toggle)
+        export = QShortcut(QKeySequence("Ctrl+Shift+E"), parent)
+        export.activated.connect(self.export)
+
+    def show_span(self, span):
+        """Stellt die Zeitaufteilung eines Spans dar"""
+        lines = []
+        for depth, name, duration, count in breakdown(span):
+            suffix = f" ({count}×)" if count > 1 else ""
+            lines.append(f"{'  ' * depth}{name}{suffix}: {duration * 1000:.1f} ms")
+        self.setText("\n".join(lines))
+        if not self.hidden_by_user:
+            self.adjustSize()
+            self.reposition()
+            self.raise_()
+            self.show()
+
+    def toggle(self):
+        self.hidden_by_user = self.isVisible()
+        self.setVisible(not self.hidden_by_user and bool(self.text()))
+
+    def export(self):
+        """Speichert den Trace und zeigt den Pfad an"""
+        path = TRACE_DIR / f"trace-{datetime.now():%Y%m%d-%H%M%S}.json"
+        try:
+            tracer.export_chrome_trace(path)
+            self.setText(f"Trace gespeichert:\n{path}")
+        except Exception as e:
+            self.setText(f"Fehler beim Speichern des Trace:\n{e}")
+        self.adjustSize()
+        self.reposition()
+        self.show()
+
+    def reposition(self):
+        """Oben rechts im Elternfenster"""
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - self.MARGIN, self.MARGIN)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize and self.isVisible():
+            self.reposition()
+        return False
+
+
+def attach_trace_overlay(window):
+    """Hängt die Einblendung an ein Fenster, falls die Messung aktiv ist"""
+    if not tracer.enabled:
+        return None
+    return TraceOverlay(window)
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Tagesgans - Jahrbuch als PDF
+
+    python3 yearbook.py ~/Privat.duckday 2024 Privat-2024.pdf
+    python3 yearbook.py ~/Privat.duckday 2023-06-01 Sommer.pdf --to 2023-08-31
+
+Jeder Tag wird wie im Reader dargestellt (renderer.render_lines). Die
+Arbeit ist nach Monaten aufgeteilt: Worker-Prozesse lesen und zerlegen
+die Einträge eines Monats und verkleinern dessen Bilder (QImageReader
+dekodiert JPEGs gleich in der Zielgröße). Der Hauptprozess setzt Monat
+für Monat ein eigenes QTextDocument, malt dessen Seiten in denselben
+QPdfWriter und verwirft es wieder. Im Speicher liegt also nie mehr als
+ein Monat, auf der Platte nur die verkleinerten Bilder der Monate, die
+noch nicht gemalt sind. Am Ende folgt ein Verzeichnis der Label und
+Personen mit Seitenzahlen.
+
+Die Worker werden mit "spawn" gestartet: kein fork() aus der
+Qt-Anwendung. Der Reader ruft dieses Skript als eigenen Prozess auf
+(QT_QPA_PLATFORM=offscreen): gemalt wird dort im Hauptthread einer
+QGuiApplication, nie in einem Thread des Readers, und die Worker laden
+nur dieses Modul statt reader.py/tagesgans.py. Das PDF entsteht als
+<Ziel>.tmp und ersetzt das Ziel erst, wenn es vollständig ist.
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+from PyQt5.QtCore import QDate, QMarginsF, QRectF, QSizeF, Qt
+from PyQt5.QtGui import (QFont, QGuiApplication, QImageReader, QPageLayout, QPageSize,
+                         QPainter, QPdfWriter, QTextBlockFormat, QTextCharFormat,
+                         QTextCursor, QTextDocument)
+from PyQt5.QtWidgets import QComboBox, QDateEdit, QDialog, QDialogButtonBox, QFormLayout
+
+from duckday import compression
+from duckday.dateindex import DateIndex
+from duckday.dates import month_label, parse_iso
+from duckday.markup import parse
+from duckday.trace import span
+from renderer import IMAGE_EXTENSIONS, render_lines
+
+# Längste Bildkante der verkleinerten Bilder (im PDF 500 Pixel breit)
+IMAGE_SIZE = 1000
+JPEG_QUALITY = 85
+
+# 96 dpi: Bilder und Schrift wie im Reader
+RESOLUTION = 96
+MARGIN_MM = 15
+FOOTER = 30
+
+
+def scale_image(source, target):
+    """Verkleinert ein Bild beim Dekodieren; False, wenn es nicht lesbar ist"""
+    reader = QImageReader(str(source))
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid() and max(size.width(), size.height()) > IMAGE_SIZE:
+        reader.setScaledSize(size.scaled(IMAGE_SIZE, IMAGE_SIZE, Qt.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        return False
+    return image.save(str(target), None, JPEG_QUALITY if target.suffix.lower() in (".jpg", ".jpeg") else -1)
+
+
+def prepare_month(args):
+    """Ein Auftrag im Pool: [(Datum, Day.txt)] → [(Datum, ParsedEntry, Medienordner)]
+
+    Bilder landen verkleinert im Medienordner, andere Medien als Verweis.
+    """
+    entries, media_root = args
+    prepared = []
+    for day, day_file in entries:
+        try:
+            parsed = parse(compression.read_text(day_file))
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"{day:%d.%m.%Y} übersprungen: {e}")
+            continue
+        media_dir = Path(media_root) / day.isoformat()
+        media_dir.mkdir(parents=True, exist_ok=True)
+        for name in parsed.media:
+            source = Path(day_file).parent / name
+            target = media_dir / name
+            if ".." in Path(name).parts or not source.is_file():
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            if source.suffix.lower() in IMAGE_EXTENSIONS and source.suffix.lower() != ".svg":
+                if scale_image(source, target):
+                    continue
+            if not target.exists():
+                os.symlink(source, target)
+        prepared.append((day, parsed, media_dir))
+    return prepared
+
+
+def months(entries):
+    """Einträge nach Monat gruppiert, chronologisch"""
+    groups = {}
+    for entry in entries:
+        groups.setdefault((entry.date.year, entry.date.month), []).append((entry.date, entry.day_file))
+    return [groups[key] for key in sorted(groups)]
+
+
+class PageWriter:
+    """Malt QTextDocuments seitenweise in einen QPdfWriter, mit Seitenzahlen"""
+
+    def __init__(self, target, title):
+        # Erst fertig umbenennen: ein Fehler hinterlässt kein halbes PDF am Ziel
+        self.target = Path(target)
+        self.tmp = self.target.with_name(self.target.name + ".tmp")
+        self.writer = QPdfWriter(str(self.tmp))
+        self.writer.setTitle(title)
+        self.writer.setCreator("Tagesgans")
+        self.writer.setResolution(RESOLUTION)
+        self.writer.setPageLayout(QPageLayout(QPageSize(QPageSize.A4), QPageLayout.Portrait,
+                                              QMarginsF(MARGIN_MM, MARGIN_MM, MARGIN_MM, MARGIN_MM),
+                                              QPageLayout.Millimeter))
+        rect = self.writer.pageLayout().paintRectPixels(RESOLUTION)
+        self.width = rect.width()
+        self.height = rect.height() - FOOTER
+        self.painter = QPainter(self.writer)
+        self.pages = 0
+
+    def document(self):
+        """Leeres Dokument im Format der Seiten"""
+        document = QTextDocument()
+        document.setUndoRedoEnabled(False)
+        document.documentLayout().setPaintDevice(self.writer)
+        document.setPageSize(QSizeF(self.width, self.height))
+        return document
+
+    def page_of(self, document, block):
+        """Seitenzahl (ab 1), auf der ein Absatz landet, wenn document als Nächstes gemalt wird"""
+        top = document.documentLayout().blockBoundingRect(block).top()
+        return self.pages + int(top // self.height) + 1
+
+    def paint(self, document):
+        """Malt alle Seiten eines Dokuments, beginnend auf einer neuen Seite"""
+        for number in range(document.pageCount()):
+            if self.pages:
+                self.writer.newPage()
+            self.pages += 1
+            self.painter.save()
+            self.painter.translate(0, -number * self.height)
+            document.drawContents(self.painter, QRectF(0, number * self.height, self.width, self.height))
+            self.painter.restore()
+            self.painter.drawText(QRectF(0, self.height, self.width, FOOTER),
+                                  Qt.AlignHCenter | Qt.AlignBottom, str(self.pages))
+
+    def finish(self):
+        """PDF abschließen und an seinen Platz legen"""
+        self.painter.end()
+        # QPdfWriter freigeben, damit die Datei geschlossen ist
+        self.painter = self.writer = None
+        os.replace(self.tmp, self.target)
+
+    def close(self):
+        """Nach einem Fehler: Maler beenden, halbe Datei löschen"""
+        if self.painter is not None:
+            if self.painter.isActive():
+                self.painter.end()
+            self.painter = self.writer = None
+        if self.tmp.exists():
+            self.tmp.unlink()
+
+
+def _heading(cursor, text, size):
+    """Überschrift als eigener Absatz; danach geht es ohne Format weiter"""
+    block_format = QTextBlockFormat()
+    block_format.setTopMargin(size)
+    block_format.setBottomMargin(size / 2)
+    font = QFont()
+    font.setPointSize(size)
+    font.setBold(True)
+    char_format = QTextCharFormat()
+    char_format.setFont(font)
+    cursor.insertBlock(block_format, char_format)
+    cursor.insertText(text, char_format)
+    cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+
+
+def _index_html(title, names):
+    """Verzeichnis: Name … Seiten"""
+    if not names:
+        return ""
+    rows = [f"<h2>{title}</h2>"]
+    for name in sorted(names, key=str.lower):
+        rows.append(f"<p>{name} … {', '.join(str(page) for page in sorted(set(names[name])))}</p>")
+    return "\n".join(rows)
+
+
+def export_yearbook(diary, start, end, target, jobs=None, language="Deutsch", progress=None):
+    """Schreibt das PDF für start..end (einschließlich); gibt die Anzahl der Tage zurück
+
+    progress(erledigte Monate, Monate) nach jedem Monat.
+    """
+    diary = Path(diary)
+    de = language == "Deutsch"
+    entries = [entry for entry in DateIndex.open(diary).entries() if start <= entry.date <= end]
+    chunks = months(entries)
+    labels = {}
+    people = {}
+
+    with span("Jahrbuch", diary=diary.name, days=len(entries)), \
+            tempfile.TemporaryDirectory(prefix="tagesgans-jahrbuch-") as media_root:
+        pages = PageWriter(target, f"{diary.stem} {start:%d.%m.%Y} – {end:%d.%m.%Y}")
+        try:
+            # Titelseite
+            document = pages.document()
+            document.setHtml(f"<h1 align='center'><br><br><br>{diary.stem}</h1>"
+                             f"<p align='center'>{start:%d.%m.%Y} – {end:%d.%m.%Y}</p>"
+                             f"<p align='center'>{len(entries)} {'Einträge' if de else 'entries'}</p>")
+            pages.paint(document)
+
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 2, mp_context=context) as executor:
+                jobs_args = [(chunk, media_root) for chunk in chunks]
+                for number, prepared in enumerate(executor.map(prepare_month, jobs_args), 1):
+                    if not prepared:
+                        continue
+                    first = prepared[0][0]
+                    document = pages.document()
+                    cursor = QTextCursor(document)
+                    _heading(cursor, f"{month_label(first.month, language)} {first.year}", 22)
+                    days = []
+                    for day, parsed, media_dir in prepared:
+                        _heading(cursor, f"{day:%d.%m.%Y}", 14)
+                        days.append((cursor.block().blockNumber() - 1, parsed))
+                        render_lines(cursor, parsed.lines, media_dir)
+
+                    for block_number, parsed in days:
+                        page = pages.page_of(document, document.findBlockByNumber(block_number))
+                        for label in parsed.labels:
+                            labels.setdefault(label, []).append(page)
+                        for person in parsed.people:
+                            people.setdefault(person, []).append(page)
+
+                    pages.paint(document)
+                    # Bilder dieses Monats werden nicht mehr gebraucht
+                    for _, _, media_dir in prepared:
+                        shutil.rmtree(media_dir, ignore_errors=True)
+                    if progress:
+                        progress(number, len(chunks))
+
+            # Verzeichnis
+            document = pages.document()
+            document.setHtml(_index_html("Label", labels) + _index_html("Personen" if de else "People", people))
+            if labels or people:
+                pages.paint(document)
+            pages.finish()
+        finally:
+            pages.close()
+    return len(entries)
+
+
+class YearbookDialog(QDialog):
+    """Zeitraum des Jahrbuchs: ein ganzes Jahr oder von/bis"""
+
+    def __init__(self, years, parent=None, language="Deutsch"):
+        super().__init__(parent)
+        de = language == "Deutsch"
+        self.setWindowTitle("Jahrbuch (PDF)" if de else "Year book (PDF)")
+        layout = QFormLayout(self)
+
+        self.year_combo = QComboBox()
+        for year in reversed(years):
+            self.year_combo.addItem(str(year), year)
+        self.year_combo.addItem("Zeitraum …" if de else "Date range …", None)
+        self.year_combo.currentIndexChanged.connect(self.on_year_changed)
+        layout.addRow("Jahr:" if de else "Year:", self.year_combo)
+
+        self.start_edit = QDateEdit()
+        self.start_edit.setCalendarPopup(True)
+        self.end_edit = QDateEdit()
+        self.end_edit.setCalendarPopup(True)
+        layout.addRow("Von:" if de else "From:", self.start_edit)
+        layout.addRow("Bis:" if de else "To:", self.end_edit)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+        self.on_year_changed()
+
+    def on_year_changed(self):
+        year = self.year_combo.currentData()
+        self.start_edit.setEnabled(year is None)
+        self.end_edit.setEnabled(year is None)
+        if year is not None:
+            self.start_edit.setDate(QDate(year, 1, 1))
+            self.end_edit.setDate(QDate(year, 12, 31))
+
+    def get_range(self):
+        """(start, end) als date"""
+        return self.start_edit.date().toPyDate(), self.end_edit.date().toPyDate()
+
+
+def date_range(text, to_text=None):
+    """(start, end) aus "2024" (ganzes Jahr) oder Datum [bis Datum]"""
+    if text.isdigit() and len(text) == 4:
+        start, end = date(int(text), 1, 1), date(int(text), 12, 31)
+    else:
+        start = parse_iso(text)
+        end = start
+        if start is None:
+            raise ValueError(f"Kein gültiges Datum: {text}")
+    if to_text:
+        end = parse_iso(to_text)
+        if end is None:
+            raise ValueError(f"Kein gültiges Datum: {to_text}")
+    return start, end
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Jahrbuch eines Tagebuchs als PDF")
+    parser.add_argument("diary", help="Pfad zum .duckday Ordner")
+    parser.add_argument("start", help="Jahr (2024) oder erster Tag (2024-03-01)")
+    parser.add_argument("target", help="PDF-Datei")
+    parser.add_argument("--to", help="letzter Tag (Standard: Jahresende bzw. erster Tag)")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--language", choices=("Deutsch", "English"), default="Deutsch")
+    args = parser.parse_args(argv)
+
+    diary = Path(args.diary).expanduser()
+    if not diary.is_dir():
+        print(f"Kein Tagebuch gefunden: {diary}")
+        return 2
+    try:
+        start, end = date_range(args.start, args.to)
+    except ValueError as e:
+        print(e)
+        return 2
+
+    # Schriften und Seitenlayout brauchen eine Qt-Anwendung (ohne Fenster: QT_QPA_PLATFORM=offscreen)
+    app = QGuiApplication(sys.argv[:1])
+    try:
+        # Fortschritt zeilenweise: der Reader liest "Monate" mit
+        count = export_yearbook(diary, start, end, Path(args.target).expanduser(), args.jobs, args.language,
+                                lambda done, total: print(f"{done}/{total} Monate", flush=True))
+    except OSError as e:
+        print(f"Jahrbuch fehlgeschlagen: {e}")
+        return 2
+    finally:
+        del app
+    print(f"{count} Tage nach {args.target} geschrieben.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())